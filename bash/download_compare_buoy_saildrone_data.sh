@@ -4,4 +4,6 @@ python ../scripts/download_latest_buoy_data.py
 
 python ../scripts/download_latest_saildrone_data.py
 
-python ../scripts/compare_buoy_saildrone.py
\ No newline at end of file
+python ../scripts/compare_buoy_saildrone.py
+
+python ../scripts/compare_buoys_saildrones_batch.py
\ No newline at end of file
@@ -1 +1,2 @@
-python ../scripts/download_latest_saildrone_data.py
\ No newline at end of file
+python ../scripts/download_latest_saildrone_data.py
+python ../scripts/update_saildrone_fleet_store.py
\ No newline at end of file
@@ -6,6 +6,8 @@
 
 python ../scripts/download_latest_saildrone_data.py
 
+python ../scripts/build_basemap_cache.py
+
 python ../scripts/plot_nhc_outlook_areas.py
 
 python ../scripts/create_nhc_outlook_areas_pdf_summary.py
\ No newline at end of file
@@ -0,0 +1,50 @@
+import numpy as np
+import os
+import shapely
+import time
+import warnings
+
+from atcf_processing import (
+    compute_btk_overlap,
+    split_storms_into_wind_radii,
+    subset_btks_in_regions,
+)
+from paths import read_yaml_config, repo_path
+from read_file import read_all_btks
+
+warnings.filterwarnings("ignore")
+
+config_file = f"{repo_path}{os.sep}configs{os.sep}config.yml"
+config = read_yaml_config(config_file)
+
+lon_min, lon_max, lat_min, lat_max = config["overlap_benchmark_region"]
+region = shapely.box(lon_min, lat_min, lon_max, lat_max)
+resolution = config["btk_overlap_grid_resolution"]
+
+print("     Reading best track data.")
+btks = read_all_btks(wr=34)
+btk_region = subset_btks_in_regions(btk=btks, target_regions=[region], verbose=False)
+btk_region = btk_region[0]["start"]
+storm = split_storms_into_wind_radii(storm_wr=btk_region)
+print(f"     {len(btk_region)} storms, {len(storm)} wind radii features.")
+
+timing, overlap = {}, {}
+for engine in ["polygon", "grid"]:
+    t0 = time.perf_counter()
+    overlap[engine] = compute_btk_overlap(
+        geo_dataset=storm, engine=engine, resolution=resolution
+    )
+    timing[engine] = time.perf_counter() - t0
+    print(f"     {engine:>8s}: {timing[engine]:8.3f} s")
+print(f"     speedup: {timing['polygon'] / timing['grid']:.1f}x")
+
+# compare both engines at the grid cell centers
+grid = overlap["grid"]
+lon_grid, lat_grid = np.meshgrid(grid.lon.values, grid.lat.values)
+polygon_count = np.zeros(lon_grid.shape, dtype=int)
+for geom, count in zip(overlap["polygon"].geometry, overlap["polygon"]["count"]):
+    polygon_count[shapely.contains_xy(geom, lon_grid, lat_grid)] = count
+agreement = np.mean(polygon_count == grid["count"].values) * 100
+max_difference = np.max(np.abs(polygon_count - grid["count"].values))
+print(f"     agreement at grid cell centers: {agreement:.2f}%")
+print(f"     maximum count difference: {max_difference}")
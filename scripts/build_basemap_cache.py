@@ -0,0 +1,15 @@
+import time
+
+from projection import basemap_datadir, basemap_features, get_basemap_domain_layer
+
+
+# run once (with network access if the Natural Earth data is not available
+# locally); afterwards all maps are drawn from the cached layers offline
+for name in basemap_features:
+    start = time.perf_counter()
+    geoms = get_basemap_domain_layer(name=name)
+    print(
+        f"     {name}: {len(geoms)} geometries "
+        + f"in {time.perf_counter() - start:.1f} s."
+    )
+print(f"Basemap layers are stored in {basemap_datadir}.")
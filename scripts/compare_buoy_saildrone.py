@@ -1,14 +1,12 @@
 import os
-import pandas as pd
 import sys
 
 
-from metpy.calc import relative_humidity_from_dewpoint
-from metpy.units import units
+from buoy_comparison import align_buoy_saildrone, prepare_buoy_comparison_data
 from paths import check_for_dir_create, read_yaml_config, repo_path
-from projection import get_ndbc_buoy_position, great_circle_distance
+from projection import get_ndbc_buoy_position
 from plotting import plot_saildrone_buoy_comparison
-from read_file import read_ndbc_buoy_format, read_saildrone_format
+from read_file import read_ndbc_buoy_format, read_saildrone_variables
 
 
 config_file = f"{repo_path}{os.sep}configs{os.sep}config.yml"
@@ -41,53 +39,27 @@ print(
 
 # read in and process data
 buoy_data = read_ndbc_buoy_format(filename=f"{buoy_dir}{os.sep}{fl_buoy}")
-buoy_data["air_temperature"] = buoy_data.air_temperature.apply(
-    lambda x: units.Quantity(x, units.degC)
-)
-buoy_data["dewpoint_temperature"] = buoy_data.dewpoint_temperature.apply(
-    lambda x: units.Quantity(x, units.degC)
-)
-buoy_data["relative_humidity"] = buoy_data.apply(
-    lambda x: relative_humidity_from_dewpoint(
-        x["air_temperature"], x["dewpoint_temperature"]
-    ).to("percent"),
-    axis=1,
-)
-buoy_data["relative_humidity"] = buoy_data.relative_humidity.apply(
-    lambda x: x.magnitude
-)
-buoy_data["air_temperature"] = buoy_data.air_temperature.apply(lambda x: x.magnitude)
-buoy_data["dewpoint_temperature"] = buoy_data.dewpoint_temperature.apply(
-    lambda x: x.magnitude
-)
-buoy_data = buoy_data.drop(
-    columns=[
-        "dewpoint_temperature",
-        "wind_gust",
-        "average_wave_period",
-        "dwpd_direction",
-        "visibility",
-        "pressure_tendency",
-        "tide_level",
-    ]
-)
-
-sd_data = read_saildrone_format(filename=f"{saildrone_dir}{os.sep}{fl_saildrone}")
-sd_data = sd_data.drop(columns=["sea_surface_salinity"])
+buoy_data = buoy_data[
+    (buoy_data.date >= config["comparison_start_time"])
+    & (buoy_data.date <= config["comparison_end_time"])
+].reset_index(drop=True)
+buoy_data = prepare_buoy_comparison_data(buoy_data=buoy_data)
 
-data = pd.merge(sd_data, buoy_data, on="date", how="outer", suffixes=["_sd", "_buoy"])
-data = data.sort_values(by="date")
-data["distance"] = data.apply(
-    lambda x: great_circle_distance(
-        x.longitude, x.latitude, buoy_position["lon"], buoy_position["lat"]
-    ),
-    axis=1,
+sd_data = read_saildrone_variables(
+    filename=f"{saildrone_dir}{os.sep}{fl_saildrone}",
+    start=config["comparison_start_time"],
+    end=config["comparison_end_time"],
 )
 
-data = data[
-    (data.date >= config["comparison_start_time"])
-    & (data.date <= config["comparison_end_time"])
-].reset_index(drop=True)
+# each buoy observation is matched to the nearest saildrone observation
+data, stats = align_buoy_saildrone(
+    buoy_data=buoy_data, sd_data=sd_data, buoy_position=buoy_position, config=config
+)
+print(
+    f"Matched {stats['n_matched']}/{stats['n_left']} buoy observations "
+    + f"({stats['n_right']} saildrone observations, "
+    + f"mean time difference {stats['mean_lag_seconds']:.0f} s)."
+)
 
 
 filename = (
@@ -0,0 +1,129 @@
+import os
+import sys
+
+from buoy_comparison import (
+    buoy_comparison_config_keys,
+    compare_buoy_saildrone_pair,
+    find_buoy_saildrone_encounters,
+    prepare_buoy_comparison_data,
+)
+from paths import check_for_dir_create, read_yaml_config, repo_path
+from projection import get_ndbc_buoy_position
+from read_file import read_ndbc_buoy_format, read_saildrone_variables
+from rendering import prune_figure_cache, render_figures
+from saildrone_store import get_saildrone_fleet_drones, query_saildrone_fleet
+
+if __name__ == "__main__":
+    config_file = f"{repo_path}{os.sep}configs{os.sep}config.yml"
+    config = read_yaml_config(config_file)
+
+    if not config["compare_buoy_saildrone_batch"]:
+        sys.exit()
+
+    buoys = config["buoys"].split(", ")
+    saildrones = config["all_saildrones"].split(", ")
+    start_time = config["comparison_batch_start_time"]
+    end_time = config["comparison_batch_end_time"]
+    buoy_dir = f"{repo_path}{os.sep}" + f"{config['download_buoy_data_path']}"
+    saildrone_dir = f"{repo_path}{os.sep}" + f"{config['download_saildrone_data_path']}"
+    figure_dir = (
+        f"{repo_path}{os.sep}"
+        + f"{config['figure_path']}{os.sep}"
+        + f"{config['comparison_figure_path']}"
+    )
+    check_for_dir_create(figure_dir)
+
+    print(
+        f"Comparing {len(saildrones)} saildrones and {len(buoys)} buoys "
+        + f"({start_time.strftime('%Y-%m-%d')} - {end_time.strftime('%Y-%m-%d')})."
+    )
+
+    # every buoy and saildrone is read once
+    buoy_data, buoy_positions = {}, {}
+    for buoy in buoys:
+        fl_buoy = f"{buoy_dir}{os.sep}buoy_{buoy}.txt"
+        if not os.path.isfile(fl_buoy):
+            print(f"Data for buoy {buoy} not found.")
+            continue
+        data = read_ndbc_buoy_format(filename=fl_buoy)
+        data = data[(data.date >= start_time) & (data.date <= end_time)]
+        buoy_data[buoy] = prepare_buoy_comparison_data(
+            buoy_data=data.reset_index(drop=True)
+        )
+        buoy_positions[buoy] = get_ndbc_buoy_position(config=config, buoy=buoy)
+
+    if config["use_saildrone_fleet_store"] and len(get_saildrone_fleet_drones()) > 0:
+        fleet = query_saildrone_fleet(sds=saildrones, start=start_time, end=end_time)
+        sd_data = {
+            sd: sd_fleet.drop(columns=["sd"]).reset_index(drop=True)
+            for sd, sd_fleet in fleet.groupby("sd", sort=True)
+        }
+    else:
+        sd_data = {}
+        for sd in saildrones:
+            fl_saildrone = f"{saildrone_dir}{os.sep}sd{sd}_hurricane_2023.nc"
+            if not os.path.isfile(fl_saildrone):
+                print(f"Data for saildrone {sd} not found.")
+                continue
+            sd_data[sd] = read_saildrone_variables(
+                filename=fl_saildrone, start=start_time, end=end_time
+            )
+
+    encounters = find_buoy_saildrone_encounters(
+        sd_data=sd_data,
+        buoy_positions=buoy_positions,
+        max_distance=config["comparison_batch_distance_km"],
+        max_gap_hours=config["comparison_batch_max_gap_hours"],
+    )
+    print(
+        f"Found {len(encounters)} saildrone/buoy encounters within "
+        + f"{config['comparison_batch_distance_km']} km."
+    )
+
+    jobs = []
+    for encounter in encounters:
+        buoy, sd = encounter["buoy"], encounter["sd"]
+        pair_start = encounter["start"].floor("D")
+        pair_end = encounter["end"].ceil("D")
+        print(
+            f"     SD-{sd} and buoy {buoy}: {encounter['min_distance']:.1f} km "
+            + f"({pair_start.strftime('%Y-%m-%d')} - {pair_end.strftime('%Y-%m-%d')})"
+        )
+        # only the settings the comparison uses, so that the figure cache key
+        # does not change with unrelated config keys
+        pair_config = {
+            **{key: config[key] for key in buoy_comparison_config_keys},
+            "comparison_buoy": buoy,
+            "comparison_saildrone": sd,
+            "comparison_start_time": pair_start,
+            "comparison_end_time": pair_end,
+        }
+        filename = (
+            f"{figure_dir}{os.sep}"
+            + f"Comparison_SD{sd}_B{buoy}_"
+            + f"{pair_start.strftime('%Y-%m-%d')}_{pair_end.strftime('%Y-%m-%d')}.png"
+        )
+        pair_buoy = buoy_data[buoy]
+        pair_sd = sd_data[sd]
+        jobs.append(
+            (
+                compare_buoy_saildrone_pair,
+                {
+                    "buoy_data": pair_buoy[
+                        (pair_buoy.date >= pair_start) & (pair_buoy.date <= pair_end)
+                    ].reset_index(drop=True),
+                    "sd_data": pair_sd[
+                        (pair_sd.date >= pair_start) & (pair_sd.date <= pair_end)
+                    ].reset_index(drop=True),
+                    "buoy_position": buoy_positions[buoy],
+                    "config": pair_config,
+                    "filename": filename,
+                },
+                [filename],
+            )
+        )
+
+    if not config["use_figure_cache"]:
+        jobs = [job[:2] for job in jobs]
+    render_figures(jobs=jobs, workers=config["rendering_workers"])
+    prune_figure_cache(max_age_days=config["figure_cache_max_age_days"])
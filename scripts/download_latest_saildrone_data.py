@@ -2,7 +2,12 @@ import os
 import sys
 
 from paths import check_for_dir_create, read_yaml_config, repo_path, saildrone_archive
-from read_url import retrieve_url_file
+from read_url import download_url_files
+from saildrone_store import (
+    get_saildrone_dataset_id,
+    sync_saildrone_fleet,
+    write_saildrone_store_netcdf,
+)
 
 
 config_file = f"{repo_path}{os.sep}configs{os.sep}config.yml"
@@ -20,12 +25,31 @@ saildrone_dir = f"{repo_path}{os.sep}" + f"{config['download_saildrone_data_path
 
 check_for_dir_create(saildrone_dir)
 
+if config["saildrone_download_mode"] == "incremental":
+    print()
+    print(f"Syncing the latest observations for {len(update_saildrones)} saildrones.")
+    status = sync_saildrone_fleet(
+        sds=update_saildrones, workers=config["saildrone_download_workers"]
+    )
+    for sd in status:
+        print(f"SD-{sd}: {status[sd]['new']} new observations.")
+        # the netCDF readers (positions, plots, comparisons) read the local files
+        filename = f"{saildrone_dir}{os.sep}{get_saildrone_dataset_id(sd=sd)}.nc"
+        if status[sd]["new"] > 0 or not os.path.isfile(filename):
+            write_saildrone_store_netcdf(sd=sd, filename=filename)
+    print()
+    sys.exit()
+
 print()
+files = {}
 for sd in update_saildrones:
-    print(f"Downloading the latest file for SD-{sd}.")
     filename = f"sd{sd}_hurricane_2023.ncCF"
-    retrieve_url_file(
-        url=f"{saildrone_archive}{filename}",
-        destination=f"{saildrone_dir}{os.sep}{filename[:-2]}",
-    )
-print()
\ No newline at end of file
+    files[f"{saildrone_archive}{filename}"] = f"{saildrone_dir}{os.sep}{filename[:-2]}"
+print(f"Downloading the latest files for {len(files)} saildrones.")
+status = download_url_files(
+    files=files,
+    workers=config["saildrone_download_workers"],
+    retries=config["saildrone_download_retries"],
+)
+print(f"Downloaded {sum(status.values())}/{len(files)} saildrone files.")
+print()
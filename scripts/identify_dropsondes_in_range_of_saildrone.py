@@ -10,7 +10,7 @@ from paths import (
     repo_path,
 )
 from projection import great_circle_distance
-from read_file import read_dropsonde_data, read_saildrone_format
+from read_file import read_dropsonde_data, read_saildrone_variables
 
 
 warnings.filterwarnings("ignore")
@@ -41,8 +41,9 @@ relevant_drops = [key for key in drop_time if drop_time[key]]
 
 sd_fls = os.listdir(saildrone_dir)
 sd_filename = [fl for fl in sd_fls if f"{saildrone}" in fl][0]
-sd = read_saildrone_format(filename=f"{saildrone_dir}{os.sep}{sd_filename}").round(2)
-sd = sd[(start_date <= sd.date) & (sd.date <= end_date)].reset_index(drop=True)
+sd = read_saildrone_variables(
+    filename=f"{saildrone_dir}{os.sep}{sd_filename}", start=start_date, end=end_date
+).round(2)
 
 csv_filename = f"{summary_dir}{os.sep}" + f"aircraft_recon_dropsonde_summary_" + f"{saildrone}.csv"
 fl = open(csv_filename, "w")
@@ -75,7 +76,7 @@ for drop in relevant_drops:
 
     sd_lon = sd.longitude.mean()
     sd_lat = sd.latitude.mean()
-    drop_data["distance"] = drop_data.apply(lambda x: great_circle_distance(x.lon, x.lat, sd_lon, sd_lat), axis=1,)
+    drop_data["distance"] = great_circle_distance(drop_data.lon.to_numpy(), drop_data.lat.to_numpy(), sd_lon, sd_lat)
     min_distance = drop_data.distance.min()
     max_distance = drop_data.distance.max()
     add_text += f"{min_distance:.2f},{max_distance:.2f},\n"
@@ -11,7 +11,8 @@ from paths import (
     repo_path,
 )
 from plotting import plot_aircraft_recon_mission_with_saildrones
-from read_file import read_saildrone_format
+from read_file import read_saildrone_variables
+from saildrone_store import get_saildrone_fleet_drones, query_saildrone_fleet
 
 config_file = f"{repo_path}{os.sep}configs{os.sep}config.yml"
 config = read_yaml_config(config_file)
@@ -39,7 +40,11 @@ check_for_dir_create(saildrone_dir)
 
 recon_fls = sorted([fl for fl in os.listdir(recon_aircraft_dir) if ".csv" in fl])
 
-sd_fls = sorted(os.listdir(saildrone_dir))
+sd_fls = sorted([fl for fl in os.listdir(saildrone_dir) if fl.endswith(".nc")])
+# the .nc files are read while the fleet store is empty
+use_fleet_store = (
+    config["use_saildrone_fleet_store"] and len(get_saildrone_fleet_drones()) > 0
+)
 
 
 for fl in recon_fls:
@@ -62,14 +67,27 @@ for fl in recon_fls:
     if len(hour_times) > 0:
         first_hour_time = hour_times.iloc[0]
 
+        if use_fleet_store:
+            fleet = query_saildrone_fleet(
+                variables=["latitude", "longitude"],
+                start=flight_data.time.min(),
+                end=flight_data.time.max(),
+            )
+            sd_sources = [sd_fleet for _, sd_fleet in fleet.groupby("sd", sort=True)]
+        else:
+            sd_sources = [
+                read_saildrone_variables(
+                    filename=f"{saildrone_dir}{os.sep}{sd}",
+                    variables=["latitude", "longitude"],
+                    start=flight_data.time.min(),
+                    end=flight_data.time.max(),
+                )
+                for sd in sd_fls
+            ]
+
         sd_data = []
-        for sd in sd_fls:
-            tmp = read_saildrone_format(filename=f"{saildrone_dir}{os.sep}{sd}")
-            tmp = tmp[["latitude", "longitude", "date"]]
-            tmp = tmp[
-                (tmp.date >= flight_data.time.min())
-                & (tmp.date <= flight_data.time.max())
-            ].reset_index(drop=True)
+        for tmp in sd_sources:
+            tmp = tmp[["latitude", "longitude", "date"]].reset_index(drop=True)
             tmp["hour"] = tmp.date - first_hour_time
             tmp["hr"] = tmp.hour.dt.days * 24 + tmp.hour.dt.seconds / 60 / 60
 
@@ -44,9 +44,8 @@ data = pd.concat(data, axis=0).reset_index(drop=True)
 data["dt_days"] = (
     (data.time - data.time.iloc[0]).dt.total_seconds() / 60 / 60 / 24
 ).astype(int)
-data["dist_point"] = data.apply(
-    lambda x: great_circle_distance(x.longitude, x.latitude, point_lon, point_lat),
-    axis=1,
+data["dist_point"] = great_circle_distance(
+    data.longitude.to_numpy(), data.latitude.to_numpy(), point_lon, point_lat
 )
 nearest_dist = data.dist_point.min()
 nearest_time = data[data.dist_point == nearest_dist].time.iloc[0]
@@ -2,10 +2,14 @@ import os
 import pytz
 import sys
 
+from atcf_preprocessing import (
+    get_storm_name_from_raw_filename,
+    update_current_system_file,
+)
 from conversions import convert_time_to_utc
 from datetime import datetime, timedelta
+from manifest import read_manifest, write_manifest
 from paths import check_for_dir_create, read_yaml_config, repo_path
-from read_file import read_raw_atcf
 
 config_file = f"{repo_path}{os.sep}configs{os.sep}config.yml"
 config = read_yaml_config(config_file)
@@ -38,12 +42,22 @@ fcst_time_last = current_time.replace(
 fcst_time_plast = fcst_time_last - timedelta(hours=6)
 
 
+# raw files are downloaded every cycle; only the ones whose content changed
+# since the last run are re-parsed. The parsed files are cached outside the
+# output directories, which are removed by the clean-up after each cycle.
+atcf_dir = f"{repo_path}{os.sep}{config['download_nhc_atcf_data_path']}"
+manifest_file = f"{atcf_dir}{os.sep}manifest_current_systems.json"
+cache_dir = f"{atcf_dir}{os.sep}current_systems"
+manifest = read_manifest(filename=manifest_file)
+
 for fl in btk_fls:
-    new_name = f"{fl[1:3]}_{fl[5:9]}-{fl[3:5]}.dat"
-    df = read_raw_atcf(filename=f"{btk_dir}{os.sep}{fl}")
-    df["Valid"] = df.Date
-    df = df[
-        [
+    manifest = update_current_system_file(
+        manifest,
+        filename=f"{btk_dir}{os.sep}{fl}",
+        key=f"best_track/{fl}",
+        output_dir=btk_dir,
+        cache_dir=f"{cache_dir}{os.sep}best_track",
+        columns=[
             "StormName",
             "StormNumber",
             "Valid",
@@ -53,53 +67,40 @@ for fl in btk_fls:
             "MaxSustainedWind",
             "MinSLP",
             "StormType",
-        ]
-    ]
-    if df.Valid.iloc[-1] in [fcst_time_plast, fcst_time_last]:
-        df.to_csv(f"{btk_dir}{os.sep}{new_name}", index=False)
+        ],
+        rename={"Date": "Valid"},
+        valid_times=[fcst_time_plast, fcst_time_last],
+    )
     os.remove(f"{btk_dir}{os.sep}{fl}")
 
 relevant_btk_fls = sorted(os.listdir(btk_dir))
 
-for fl in storm_fls:
-    new_name = f"{fl[1:3]}_{fl[5:9]}-{fl[3:5]}.dat"
-    if new_name in relevant_btk_fls:
-        df = read_raw_atcf(filename=f"{storm_dir}{os.sep}{fl}")
-        df = df[
-            [
-                "StormName",
-                "StormNumber",
-                "Date",
-                "FcstCenter",
-                "FcstHour",
-                "Latitude",
-                "Longitude",
-                "MaxSustainedWind",
-                "MinSLP",
-                "StormType",
-            ]
-        ]
-        df.to_csv(f"{storm_dir}{os.sep}{new_name}", index=False)
-    os.remove(f"{storm_dir}{os.sep}{fl}")
-
+for fls, fls_dir, manifest_dir in [
+    (storm_fls, storm_dir, "storm"),
+    (invest_fls, invest_dir, "invest"),
+]:
+    for fl in fls:
+        new_name = f"{get_storm_name_from_raw_filename(filename=fl)}.dat"
+        if new_name in relevant_btk_fls:
+            manifest = update_current_system_file(
+                manifest,
+                filename=f"{fls_dir}{os.sep}{fl}",
+                key=f"{manifest_dir}/{fl}",
+                output_dir=fls_dir,
+                cache_dir=f"{cache_dir}{os.sep}{manifest_dir}",
+                columns=[
+                    "StormName",
+                    "StormNumber",
+                    "Date",
+                    "FcstCenter",
+                    "FcstHour",
+                    "Latitude",
+                    "Longitude",
+                    "MaxSustainedWind",
+                    "MinSLP",
+                    "StormType",
+                ],
+            )
+        os.remove(f"{fls_dir}{os.sep}{fl}")
 
-for fl in invest_fls:
-    new_name = f"{fl[1:3]}_{fl[5:9]}-{fl[3:5]}.dat"
-    if new_name in relevant_btk_fls:
-        df = read_raw_atcf(filename=f"{invest_dir}{os.sep}{fl}")
-        df = df[
-            [
-                "StormName",
-                "StormNumber",
-                "Date",
-                "FcstCenter",
-                "FcstHour",
-                "Latitude",
-                "Longitude",
-                "MaxSustainedWind",
-                "MinSLP",
-                "StormType",
-            ]
-        ]
-        df.to_csv(f"{invest_dir}{os.sep}{new_name}", index=False)
-    os.remove(f"{invest_dir}{os.sep}{fl}")
+write_manifest(manifest=manifest, filename=manifest_file)
@@ -1,9 +1,10 @@
 import os
-import pandas as pd
+import time
 
-from atcf_processing import get_atcf_files
+from atcf_preprocessing import preprocess_atcf_files
+from atcf_store import atcf_store_datadir, atcf_store_manifest
+from manifest import is_up_to_date, read_manifest, update_manifest, write_manifest
 from paths import check_for_dir_create, read_yaml_config, repo_path
-from read_file import read_raw_atcf
 
 config_file = f"{repo_path}{os.sep}configs{os.sep}config.yml"
 config = read_yaml_config(config_file)
@@ -24,136 +25,46 @@ check_for_dir_create(adecks_dir)
 check_for_dir_create(bdecks_dir)
 
 
-preprocess_wind_radii = config["preprocess_atcf_wind_radii"]
-
-
-if config["download_nhc_atcf_data"]:
-    for fl in os.listdir(adecks_dir):
-        if "aal" in fl:
-            df = read_raw_atcf(filename=f"{adecks_dir}{os.sep}{fl}")
-            df.to_csv(
-                f"{adecks_dir}{os.sep}{fl[1:3]}_{fl[5:9]}-{fl[3:5]}.dat", index=False
-            )
-            os.remove(f"{adecks_dir}{os.sep}{fl}")
-
-    for fl in os.listdir(bdecks_dir):
-        if "bal" in fl:
-            df = read_raw_atcf(filename=f"{bdecks_dir}{os.sep}{fl}")
-            df.to_csv(
-                f"{bdecks_dir}{os.sep}{fl[1:3]}_{fl[5:9]}-{fl[3:5]}.dat", index=False
-            )
-            os.remove(f"{bdecks_dir}{os.sep}{fl}")
-
-
-if preprocess_wind_radii:
-    adecks_dir_windradii = (
-        f"{f'{os.sep}'.join(adecks_dir.split(os.sep)[:-1])}{os.sep}" + f"wind_radii"
-    )
-    bdecks_dir_windradii = (
-        f"{f'{os.sep}'.join(bdecks_dir.split(os.sep)[:-1])}{os.sep}" + f"wind_radii"
-    )
-    check_for_dir_create(adecks_dir_windradii)
-    check_for_dir_create(bdecks_dir_windradii)
-    fls = get_atcf_files()
-    for fl in fls:
-        df = pd.read_csv(f"{adecks_dir}{os.sep}{fl}", low_memory=False)
-        df.Date = pd.to_datetime(df.Date)
-        df = df.drop(
-            columns=[
-                "Technum",
-                "MinSLP",
-                "StormType",
-                "WindCode",
-                "PressureOfLastClosedIsobar",
-                "RadiusOfLastClosedIsobar",
-                "RMW",
-                "Gust",
-                "EyeDiameter",
-                "SubregionCode",
-                "MaxSeas",
-                "ForecasterInitials",
-                "StormDirection",
-                "StormSpeed",
-                "StormDepth",
-                "WaveHeightForRadius",
-                "RadiusQuadrantCode",
-                "SeasRadius1",
-                "SeasRadius2",
-                "SeasRadius3",
-                "SeasRadius4",
-                "x",
-                "xx",
-                "xxx",
-                "xxxx",
-                "xxxxx",
-                "xxxxxx",
-                "xxxxxxx",
-                "xxxxxxxx",
-                "xxxxxxxxx",
-                "y",
-                "yy",
-            ]
+# raw decks are parsed once and written to the parquet store,
+# partitioned by year / storm / wind radii (guarded for spawned workers);
+# decks whose content has not changed since the last run are skipped
+if __name__ == "__main__" and config["download_nhc_atcf_data"]:
+    workers = config["atcf_preprocessing_workers"]
+    check_for_dir_create(atcf_store_datadir)
+    manifest = read_manifest(filename=atcf_store_manifest)
+    failed = []
+    for deck, deck_dir, prefix in [
+        ("adecks", adecks_dir, "aal"),
+        ("bdecks", bdecks_dir, "bal"),
+    ]:
+        fls = sorted(
+            [f"{deck_dir}{os.sep}{fl}" for fl in os.listdir(deck_dir) if prefix in fl]
         )
+        fls_unchanged = [fl for fl in fls if is_up_to_date(manifest, filename=fl)]
+        fls = [fl for fl in fls if fl not in fls_unchanged]
+        print(f"Skipping {len(fls_unchanged)} unchanged {deck} files.")
+        for fl in fls_unchanged:
+            os.remove(fl)
 
-        wrs = sorted(df.WindIntensityForRadii.unique())
-        for wr in wrs:
-            if (not pd.isna(wr)) and (wr > 0):
-                df_sub = df[df.WindIntensityForRadii == wr]
-                df_sub = df_sub.reset_index(drop=True)
-                df_sub = df_sub.drop(columns=["WindIntensityForRadii"])
-                if len(df_sub) > 0:
-                    df_sub.to_csv(
-                        f"{adecks_dir_windradii}{os.sep}{fl[:-4]}_{wr}kt.dat",
-                        index=False,
-                    )
-
-        df = pd.read_csv(f"{bdecks_dir}{os.sep}{fl}")
-        df.Date = pd.to_datetime(df.Date)
-        df = df.drop(
-            columns=[
-                "Technum",
-                "MinSLP",
-                "StormType",
-                "WindCode",
-                "PressureOfLastClosedIsobar",
-                "RadiusOfLastClosedIsobar",
-                "RMW",
-                "Gust",
-                "EyeDiameter",
-                "SubregionCode",
-                "MaxSeas",
-                "ForecasterInitials",
-                "StormDirection",
-                "StormSpeed",
-                "StormDepth",
-                "WaveHeightForRadius",
-                "RadiusQuadrantCode",
-                "SeasRadius1",
-                "SeasRadius2",
-                "SeasRadius3",
-                "SeasRadius4",
-                "x",
-                "xx",
-                "xxx",
-                "xxxx",
-                "xxxxx",
-                "xxxxxx",
-                "xxxxxxx",
-                "xxxxxxxx",
-                "xxxxxxxxx",
-                "y",
-                "yy",
-            ]
+        print(
+            f"Processing {len(fls)} {deck} files on {workers or os.cpu_count()} cores."
+        )
+        start = time.perf_counter()
+        processed, failed_deck = preprocess_atcf_files(
+            fls=fls, deck=deck, workers=workers
         )
+        print(f"Processed {deck} in {time.perf_counter() - start:.1f} s.")
+        # decks that could not be parsed stay in place for the next run
+        for result in processed:
+            manifest = update_manifest(
+                manifest, filename=result["filename"], outputs=result["outputs"]
+            )
+            os.remove(result["filename"])
+        write_manifest(manifest=manifest, filename=atcf_store_manifest)
+        failed += failed_deck
 
-        wrs = sorted(df.WindIntensityForRadii.unique())
-        for wr in wrs:
-            if (not pd.isna(wr)) and (wr > 0):
-                df_sub = df[df.WindIntensityForRadii == wr]
-                df_sub = df_sub.reset_index(drop=True)
-                df_sub = df_sub.drop(columns=["WindIntensityForRadii"])
-                if len(df_sub) > 0:
-                    df_sub.to_csv(
-                        f"{bdecks_dir_windradii}{os.sep}{fl[:-4]}_{wr}kt.dat",
-                        index=False,
-                    )
+    if len(failed) > 0:
+        raise RuntimeError(
+            f"Could not process {len(failed)} atcf files: "
+            + ", ".join([os.path.basename(fl) for fl in failed])
+        )
@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+
+from manifest import is_up_to_date, read_manifest, update_manifest, write_manifest
+from paths import read_yaml_config, repo_path
+from read_file import read_saildrone_format, read_saildrone_store_format
+from saildrone_store import (
+    get_saildrone_fleet_source,
+    saildrone_fleet_datadir,
+    saildrone_fleet_manifest,
+    saildrone_store_datadir,
+    write_saildrone_fleet_store,
+)
+
+config_file = f"{repo_path}{os.sep}configs{os.sep}config.yml"
+config = read_yaml_config(config_file)
+all_saildrones = config["all_saildrones"].split(", ")
+
+if not config["update_saildrone_fleet_store"]:
+    sys.exit()
+
+saildrone_dir = f"{repo_path}{os.sep}" + f"{config['download_saildrone_data_path']}"
+os.makedirs(saildrone_store_datadir, exist_ok=True)
+manifest = read_manifest(filename=saildrone_fleet_manifest)
+
+print()
+start = time.perf_counter()
+n_updated = 0
+for sd in all_saildrones:
+    source = get_saildrone_fleet_source(
+        sd=sd, saildrone_dir=saildrone_dir, mode=config["saildrone_download_mode"]
+    )
+    if source is None:
+        continue
+    if is_up_to_date(manifest, filename=source, key=sd):
+        continue
+
+    if source.endswith(".parquet"):
+        data = read_saildrone_store_format(sd=sd)
+    else:
+        data = read_saildrone_format(filename=source)
+    fls = write_saildrone_fleet_store(sd=sd, data=data)
+    manifest = update_manifest(manifest, filename=source, outputs=fls, key=sd)
+    n_updated += 1
+    print(f"Updated SD-{sd} in the fleet store ({len(data)} observations).")
+
+write_manifest(manifest=manifest, filename=saildrone_fleet_manifest)
+print(
+    f"Updated {n_updated}/{len(all_saildrones)} saildrones in {saildrone_fleet_datadir} "
+    + f"in {time.perf_counter() - start:.1f} s."
+)
+print()
@@ -0,0 +1,150 @@
+import numpy as np
+import os
+import pandas as pd
+import pytest
+import shapely
+import sys
+import xarray as xr
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "util")
+)
+
+# best track of a short storm: 34 kt radii at every time, 50/64 kt at the last
+atcf_btk_lines = [
+    "AL, 05, 2023082000,   , BEST,   0, 155N,  405W,  30, 1008, TD,  34, NEQ,    0,    0,    0,    0, 1012,  180,  40,   0,   0,   L,   0,    ,   0,   0,     FIVE, D,",
+    "AL, 05, 2023082006,   , BEST,   0, 160N,  415W,  40, 1004, TS,  34, NEQ,   60,   40,    0,   50, 1012,  180,  40,   0,   0,   L,   0,    ,   0,   0,     FRANKLIN, D,",
+    "AL, 05, 2023082012,   , BEST,   0, 165N,  425W,  70,  990, HU,  34, NEQ,   90,   80,   60,   70, 1012,  180,  20,   0,   0,   L,   0,    ,   0,   0,     FRANKLIN, D,",
+    "AL, 05, 2023082012,   , BEST,   0, 165N,  425W,  70,  990, HU,  50, NEQ,   40,   30,   20,   30, 1012,  180,  20,   0,   0,   L,   0,    ,   0,   0,     FRANKLIN, D,",
+    "AL, 05, 2023082012,   , BEST,   0, 165N,  425W,  70,  990, HU,  64, NEQ,   20,   10,   10,   15, 1012,  180,  20,   0,   0,   L,   0,    ,   0,   0,     FRANKLIN, D,",
+]
+
+
+@pytest.fixture
+def atcf_decks(tmp_path):
+    """
+    Writes a forecast (aal) and best track (bal) deck of one storm.
+    """
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    fls = {}
+    for deck, prefix, tech in [("adecks", "aal", "OFCL"), ("bdecks", "bal", "BEST")]:
+        lines = [line.replace("BEST", tech) for line in atcf_btk_lines]
+        if deck == "adecks":
+            lines = [line.replace(",   0, 1", ",  12, 1", 1) for line in lines]
+        fls[deck] = str(raw_dir / f"{prefix}052023.dat")
+        with open(fls[deck], "w") as file:
+            file.write("\n".join(lines) + "\n")
+
+    return fls
+
+
+@pytest.fixture
+def atcf_store_dir(tmp_path, monkeypatch):
+    """
+    Points the ATCF store (and its geometry cache) to a temporary directory.
+    """
+    import atcf_store
+
+    store_dir = f"{tmp_path}{os.sep}atcf_store{os.sep}"
+    monkeypatch.setattr(atcf_store, "atcf_store_datadir", store_dir)
+    monkeypatch.setattr(
+        atcf_store, "atcf_geometry_cache_datadir", f"{store_dir}geometry_cache{os.sep}"
+    )
+
+    return store_dir
+
+
+class FakeFeature:
+    """
+    Stands in for a Natural Earth feature.
+    """
+
+    def __init__(self, geoms):
+        self.geoms = geoms
+        self.n_reads = 0
+
+    def geometries(self):
+        self.n_reads += 1
+        return iter(self.geoms)
+
+
+@pytest.fixture
+def basemap(tmp_path, monkeypatch):
+    """
+    Replaces the Natural Earth features by two land boxes and a coastline, with
+    the basemap layers stored in a temporary directory.
+    """
+    import projection
+
+    features = {
+        "land": FakeFeature(
+            [shapely.box(-80, 10, -60, 30), shapely.box(100, 10, 120, 30)]
+        ),
+        "coastline": FakeFeature([shapely.LineString([(-150, 20), (-50, 20)])]),
+    }
+    monkeypatch.setattr(
+        projection, "basemap_datadir", f"{tmp_path}{os.sep}basemap{os.sep}"
+    )
+    monkeypatch.setattr(projection, "basemap_features", features)
+    monkeypatch.setattr(projection, "basemap_layers", {})
+
+    return features
+
+
+@pytest.fixture
+def buoy_file(tmp_path):
+    """
+    Writes an NDBC realtime2 file with 10-minute observations (newest first).
+    """
+    times = pd.date_range("2023-09-01 00:00", "2023-09-01 06:00", freq="10min")
+    lines = [
+        "#YY  MM DD hh mm WDIR WSPD GST  WVHT   DPD   APD MWD   PRES  ATMP  WTMP  DEWP  VIS PTDY  TIDE",
+        "#yr  mo dy hr mn degT m/s  m/s     m   sec   sec degT   hPa  degC  degC  degC  nmi  hPa    ft",
+    ]
+    for i, time in enumerate(times[::-1]):
+        wave = "MM" if i % 3 else "1.2"
+        lines.append(
+            f"{time:%Y %m %d %H %M} {(350 + i) % 360:3d} {5 + 0.1 * i:4.1f}  7.0  "
+            f"{wave}  MM    MM  MM 1012.{i % 10}  27.0  29.0  23.0   MM   MM    MM"
+        )
+    filename = tmp_path / "41044.txt"
+    filename.write_text("\n".join(lines) + "\n")
+
+    return str(filename)
+
+
+@pytest.fixture
+def saildrone_file(tmp_path):
+    """
+    Writes a saildrone file in the ERDDAP ragged-array layout with 1-minute
+    observations, slightly offset from the buoy times.
+    """
+    times = pd.date_range("2023-08-31 23:00:30", "2023-09-01 07:00", freq="1min")
+    n = len(times)
+    data = xr.Dataset(
+        {
+            "trajectory": (("trajectory",), np.array([1031], dtype=np.int32)),
+            "rowSize": (("trajectory",), np.array([n], dtype=np.int32)),
+            "time": (("obs",), times.to_numpy()),
+            "latitude": (("obs",), np.linspace(15.0, 15.1, n)),
+            "longitude": (("obs",), np.linspace(-60.1, -60.0, n)),
+            "WIND_FROM_MEAN": (("obs",), (np.arange(n) * 7.0) % 360),
+            "WIND_SPEED_MEAN": (("obs",), np.full(n, 6.0)),
+            "TEMP_AIR_MEAN": (("obs",), np.full(n, 27.5)),
+            "RH_MEAN": (("obs",), np.full(n, 75.0)),
+            "BARO_PRES_MEAN": (("obs",), np.full(n, 1011.0)),
+            "WAVE_DOMINANT_PERIOD": (("obs",), np.full(n, 8.0)),
+            "WAVE_SIGNIFICANT_HEIGHT": (("obs",), np.full(n, 1.5)),
+            "TEMP_SBE37_MEAN": (("obs",), np.full(n, 29.2)),
+            "SAL_SBE37_MEAN": (("obs",), np.full(n, 36.0)),
+        }
+    )
+    filename = tmp_path / "sd1031.nc"
+    data.to_netcdf(
+        filename,
+        engine="netcdf4",
+        encoding={"time": {"units": "seconds since 1970-01-01", "dtype": "float64"}},
+    )
+
+    return str(filename)
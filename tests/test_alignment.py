@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from alignment import align_time_series, resample_time_series
+from read_file import read_ndbc_buoy_format, read_saildrone_variables
+
+
+def test_align_time_series():
+    left = pd.DataFrame(
+        {
+            "date": pd.to_datetime(
+                ["2023-09-01 00:00", "2023-09-01 00:10", "2023-09-01 00:20"]
+            ),
+            "wind_speed": [5.0, 6.0, 7.0],
+        }
+    )
+    right = pd.DataFrame(
+        {
+            "date": pd.to_datetime(
+                ["2023-09-01 00:21", "2023-09-01 00:02", "2023-09-01 00:14"]
+            ),
+            "wind_speed": [7.5, 5.5, 6.5],
+        }
+    )
+
+    aligned, stats = align_time_series(
+        left=left, right=right, tolerance="3min", suffixes=("_buoy", "_sd")
+    )
+    assert aligned.wind_speed_sd.tolist() == [5.5, 7.5]
+    assert aligned.date_sd.tolist() == list(right.date.iloc[[1, 0]])
+    assert stats["n_matched"] == 2
+    assert np.isclose(stats["matched_fraction"], 2 / 3)
+    assert stats["mean_lag_seconds"] == 90
+    assert stats["max_lag_seconds"] == 120
+
+    aligned, stats = align_time_series(
+        left=left, right=right, tolerance="3min", keep_unmatched=True
+    )
+    assert len(aligned) == 3
+    assert np.isnan(aligned.wind_speed_right.iloc[1])
+
+
+def test_resample_time_series():
+    data = pd.DataFrame(
+        {
+            "date": pd.date_range("2023-09-01 00:00", periods=4, freq="5min"),
+            "wind_direction": [350.0, 10.0, 80.0, 100.0],
+            "wind_speed": [4.0, 6.0, 8.0, 10.0],
+        }
+    )
+
+    resampled = resample_time_series(data=data, cadence="10min", method="mean")
+    assert resampled.wind_speed.tolist() == [5.0, 9.0]
+    # directions are averaged as angles
+    difference = (resampled.wind_direction - np.array([0, 90]) + 180) % 360 - 180
+    assert np.allclose(difference, 0)
+
+    resampled = resample_time_series(data=data, cadence="10min", method="nearest")
+    assert resampled.date.tolist() == list(
+        pd.date_range("2023-09-01 00:00", periods=3, freq="10min")
+    )
+    assert resampled.wind_speed.tolist() == [4.0, 8.0, 10.0]
+
+    with pytest.raises(ValueError):
+        resample_time_series(data=data, cadence="10min", method="median")
+
+
+def test_reader_time_resolutions_align(buoy_file, saildrone_file):
+    buoy_data = read_ndbc_buoy_format(filename=buoy_file)
+    sd_data = read_saildrone_variables(filename=saildrone_file)
+    # the readers may return different resolutions; the join must not care
+    buoy_data["date"] = buoy_data.date.astype("datetime64[us]")
+
+    aligned, stats = align_time_series(
+        left=buoy_data, right=sd_data, tolerance="1min", suffixes=("_buoy", "_sd")
+    )
+
+    assert stats["n_left"] == 37
+    assert stats["n_matched"] == 37
+    assert stats["max_lag_seconds"] == 30
+    assert aligned.date.dtype == "datetime64[ns]"
+    assert aligned.date_sd.dtype == "datetime64[ns]"
@@ -0,0 +1,84 @@
+import atcf_preprocessing
+import os
+import pandas as pd
+import shutil
+
+from atcf_preprocessing import (
+    get_storm_name_from_raw_filename,
+    preprocess_atcf_files,
+    update_current_system_file,
+)
+from atcf_store import read_atcf_store
+
+
+def test_storm_name_from_raw_filename():
+    assert get_storm_name_from_raw_filename(filename="/a/aal052023.dat") == (
+        "al_2023-05"
+    )
+
+
+def test_preprocess_atcf_files(atcf_decks, atcf_store_dir):
+    processed, failed = preprocess_atcf_files(
+        fls=[atcf_decks["bdecks"]], deck="bdecks", workers=2, verbose=False
+    )
+
+    assert failed == []
+    assert len(processed) == 1
+    assert processed[0]["storm"] == "al_2023-05"
+    assert processed[0]["rows"] == 5
+    assert processed[0]["partitions"] == len(processed[0]["outputs"]) == 3
+    stored = read_atcf_store(storm="al_2023-05", deck="bdecks")
+    assert stored.WindIntensityForRadii.tolist() == [34, 34, 34, 50, 64]
+
+
+def test_preprocess_atcf_files_with_unparseable_deck(atcf_decks, atcf_store_dir):
+    broken = atcf_decks["bdecks"].replace("bal05", "bal06")
+    with open(broken, "w") as file:
+        file.write("AL, 06, not a date,   , BEST, 0, xxxN, yyyW\n")
+
+    processed, failed = preprocess_atcf_files(
+        fls=[broken, atcf_decks["bdecks"]], deck="bdecks", workers=2, verbose=False
+    )
+
+    # the other decks are still processed and returned
+    assert failed == [broken]
+    assert [result["filename"] for result in processed] == [atcf_decks["bdecks"]]
+    assert len(read_atcf_store(storm="al_2023-05", deck="bdecks")) == 5
+
+
+def test_current_system_file_survives_clean_up(atcf_decks, tmp_path, monkeypatch):
+    filename = atcf_decks["bdecks"]
+    output_dir = tmp_path / "best_track"
+    cache_dir = f"{tmp_path}/current_systems/best_track"
+    kwargs = {
+        "filename": filename,
+        "key": "best_track/bal052023.dat",
+        "output_dir": str(output_dir),
+        "cache_dir": cache_dir,
+        "columns": ["StormName", "Valid", "MaxSustainedWind"],
+        "rename": {"Date": "Valid"},
+        "valid_times": [pd.Timestamp("2023-08-20 12:00")],
+    }
+    with open(filename, "r") as file:
+        raw = file.read()
+
+    manifest = {}
+    for run in range(2):
+        # every cycle downloads the raw deck again and cleans up afterwards
+        with open(filename, "w") as file:
+            file.write(raw)
+        output_dir.mkdir()
+        manifest = update_current_system_file(manifest, **kwargs)
+        data = pd.read_csv(output_dir / "al_2023-05.dat")
+        assert data.columns.tolist() == kwargs["columns"]
+        assert data.MaxSustainedWind.tolist() == [30, 40, 70, 70, 70]
+        shutil.rmtree(output_dir)
+        # the second run must not parse the unchanged deck
+        monkeypatch.setattr(atcf_preprocessing, "read_raw_atcf", None)
+
+    # storms that are no longer current are not written
+    output_dir.mkdir()
+    (output_dir / "al_2023-05.dat").write_text("")
+    kwargs["valid_times"] = [pd.Timestamp("2023-08-21 00:00")]
+    manifest = update_current_system_file(manifest, **kwargs)
+    assert os.listdir(output_dir) == []
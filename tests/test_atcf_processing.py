@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+import pytest
+import shapely
+import xarray as xr
+
+from atcf_processing import (
+    compute_btk_overlap,
+    compute_btk_overlap_by_day,
+    decode_atcf_coordinate,
+    decode_atcf_date,
+    fix_atcf_latitude,
+    fix_atcf_longitude,
+    split_storms_into_wind_radii,
+    subset_btk_in_region,
+    subset_btks_in_regions,
+)
+from read_file import read_raw_atcf
+
+
+def test_decode_atcf_coordinate():
+    latitude = pd.Series(["155N", "12S", "0N", "905N", None])
+    longitude = pd.Series(["405W", "5E", "1800W", "1799E", None])
+
+    decoded_latitude = decode_atcf_coordinate(values=latitude, negative="S")
+    decoded_longitude = decode_atcf_coordinate(values=longitude, negative="W")
+
+    np.testing.assert_array_equal(
+        decoded_latitude[:-1], [fix_atcf_latitude(val) for val in latitude[:-1]]
+    )
+    np.testing.assert_array_equal(
+        decoded_longitude[:-1], [fix_atcf_longitude(val) for val in longitude[:-1]]
+    )
+    assert np.isnan(decoded_latitude[-1]) and np.isnan(decoded_longitude[-1])
+
+
+def test_decode_atcf_date():
+    dates = decode_atcf_date(values=np.array([2023082000, 2023123118]))
+
+    assert dates.tolist() == [
+        pd.Timestamp("2023-08-20 00:00"),
+        pd.Timestamp("2023-12-31 18:00"),
+    ]
+
+
+def test_read_raw_atcf_types(atcf_decks):
+    df = read_raw_atcf(filename=atcf_decks["bdecks"])
+
+    assert df.Latitude.tolist() == [15.5, 16.0, 16.5, 16.5, 16.5]
+    assert df.Longitude.tolist() == [-40.5, -41.5, -42.5, -42.5, -42.5]
+    assert df.Date.iloc[1] == pd.Timestamp("2023-08-20 06:00")
+    assert df.MinSLP.dtype == "Int64"
+    assert df.WindIntensityForRadii.tolist() == [34, 34, 34, 50, 64]
+    assert df.SeasRadius1.isna().all()
+
+
+def get_btk(lon, lat, start="2023-08-20", radius=1.0):
+    """
+    Builds a best track with 6-hourly fixes and circular wind radii.
+    """
+    centers = shapely.points(lon, lat)
+    return pd.DataFrame(
+        {
+            "Date": pd.date_range(start, periods=len(lon), freq="6h"),
+            "Center": centers,
+            "WindRadii": shapely.buffer(centers, radius),
+        }
+    )
+
+
+def test_subset_btks_in_regions():
+    btk = [
+        get_btk(lon=[-50, -55, -60], lat=[15, 17, 19]),
+        get_btk(lon=[-70, -64, -58], lat=[25, 27, 29]),
+        get_btk(lon=[-30, -31], lat=[10, 11]),
+    ]
+    regions = [shapely.box(-62, 14, -48, 20), shapely.box(-72, 24, -66, 26)]
+
+    subsets = subset_btks_in_regions(btk=btk, target_regions=regions, verbose=False)
+
+    for region, subset in zip(regions, subsets):
+        start = [storm for storm in btk if region.contains(storm.Center.iloc[0])]
+        track = [storm for storm in btk if region.contains(storm.Center).any()]
+        assert [id(storm) for storm in subset["start"]] == [id(s) for s in start]
+        assert [id(storm) for storm in subset["track"]] == [id(s) for s in track]
+    assert len(subsets[0]["start"]) == len(subsets[1]["start"]) == 1
+    subset = subset_btk_in_region(btk=btk, target_region=regions[1], verbose=False)
+    assert subset["start"][0] is btk[1]
+
+
+def test_grid_engine_matches_polygon_engine():
+    btk = [
+        get_btk(lon=[-50, -51, -52], lat=[15, 15.5, 16], radius=2),
+        get_btk(lon=[-51, -51], lat=[14, 17], radius=1.5),
+    ]
+    storm = split_storms_into_wind_radii(storm_wr=btk)
+
+    grid = compute_btk_overlap(geo_dataset=storm, engine="grid", resolution=0.25)
+    polygon = compute_btk_overlap(geo_dataset=storm, engine="polygon")
+
+    lon, lat = np.meshgrid(grid.lon, grid.lat)
+    points = shapely.points(lon.ravel(), lat.ravel())
+    expected = sum(shapely.contains(feature, points) for feature in storm.Storms)
+    np.testing.assert_array_equal(grid["count"].to_numpy().ravel(), expected)
+
+    # cells inside a polygon piece get that piece's count
+    piece_idx, point_idx = shapely.STRtree(polygon.geometry).query(
+        points, predicate="within"
+    )
+    np.testing.assert_array_equal(
+        grid["count"].to_numpy().ravel()[piece_idx],
+        polygon["count"].to_numpy()[point_idx],
+    )
+    assert grid["count"].max() == polygon["count"].max() == 2
+
+    with pytest.raises(ValueError):
+        compute_btk_overlap(geo_dataset=storm, engine="raster")
+
+
+@pytest.mark.parametrize("engine", ["grid", "polygon"])
+def test_overlap_by_day_matches_per_day_loop(engine):
+    btk = [
+        get_btk(lon=np.linspace(-50, -58, 9), lat=np.linspace(15, 20, 9), radius=2),
+        get_btk(lon=np.linspace(-52, -54, 5), lat=np.full(5, 16.0), radius=1),
+    ]
+
+    overlap = compute_btk_overlap_by_day(btk=btk, n_days=3, engine=engine)
+
+    assert list(overlap) == [1, 2, 3]
+    assert [overlap[day]["n_storms"] for day in overlap] == [2, 2, 1]
+    for day in overlap:
+        # storm days counted from the first fix, split and counted one day at a time
+        btk_day = [
+            storm[(storm.Date - storm.Date.iloc[0]) // pd.Timedelta(days=1) + 1 == day]
+            for storm in btk
+        ]
+        expected = compute_btk_overlap(
+            geo_dataset=split_storms_into_wind_radii(storm_wr=btk_day), engine=engine
+        )
+        if engine == "grid":
+            xr.testing.assert_equal(overlap[day]["overlap"], expected)
+        else:
+            assert sorted(overlap[day]["overlap"]["count"]) == sorted(expected["count"])
+            assert np.isclose(
+                overlap[day]["overlap"].area.sum(), expected.area.sum(), rtol=1e-9
+            )
@@ -0,0 +1,90 @@
+import os
+import pandas as pd
+import read_file
+import shapely
+
+from atcf_store import (
+    get_atcf_store_path,
+    get_atcf_store_storms,
+    get_wind_radii_cache_path,
+    read_atcf_store,
+    read_wind_radii_cache,
+    write_atcf_store,
+)
+from read_file import read_all_btks, read_atcf_modified_wind_radii, read_raw_atcf
+
+storm = "al_2023-05"
+
+
+def write_decks(atcf_decks):
+    return {
+        deck: write_atcf_store(
+            data=read_raw_atcf(filename=atcf_decks[deck]), storm=storm, deck=deck
+        )
+        for deck in atcf_decks
+    }
+
+
+def test_store_round_trip(atcf_decks, atcf_store_dir):
+    fls = write_decks(atcf_decks)
+
+    assert [fl.split("wind_radii=")[1][:2] for fl in fls["bdecks"]] == [
+        "34",
+        "50",
+        "64",
+    ]
+    assert get_atcf_store_storms(deck="bdecks") == [storm]
+
+    raw = read_raw_atcf(filename=atcf_decks["bdecks"])
+    stored = read_atcf_store(storm=storm, deck="bdecks")
+    assert len(stored) == len(raw)
+    assert stored.WindIntensityForRadii.tolist() == [34, 34, 34, 50, 64]
+    pd.testing.assert_series_equal(stored.Latitude, raw.Latitude)
+    assert stored.Date.is_monotonic_increasing
+    assert read_atcf_store(storm="al_2023-06", deck="bdecks") is None
+
+
+def test_read_single_wind_radii(atcf_decks, atcf_store_dir):
+    write_decks(atcf_decks)
+
+    storm_info, df_fcst, df_btk = read_atcf_modified_wind_radii(filename=storm, wr=50)
+
+    assert len(df_fcst) == len(df_btk) == 1
+    assert df_btk.WSPRadius1.iloc[0] == 40
+    assert df_fcst.Valid.iloc[0] == pd.Timestamp("2023-08-21 00:00")
+    assert df_btk.Valid.iloc[0] == pd.Timestamp("2023-08-20 12:00")
+
+
+def test_read_all_btks(atcf_decks, atcf_store_dir):
+    write_decks(atcf_decks)
+
+    btks = read_all_btks(wr=34)
+
+    assert len(btks) == 1
+    assert len(btks[0]) == 3
+    assert btks[0].StormName.iloc[-1] == "FRANKLIN"
+    assert btks[0].WindRadii.iloc[0].is_empty or btks[0].WindRadii.iloc[0].area == 0
+    assert btks[0].WindRadii.iloc[-1].area > btks[0].WindRadii.iloc[1].area
+
+
+def test_wind_radii_geometry_cache(atcf_decks, atcf_store_dir, monkeypatch):
+    write_decks(atcf_decks)
+    btks = read_all_btks(wr=34, use_cache=True)
+    cache_fl = get_wind_radii_cache_path(storm=storm, wr=34, n_samples=1000)
+    assert os.path.isfile(cache_fl)
+
+    # the second read takes the geometries from the cache
+    def fail(**kwargs):
+        raise AssertionError("geometries were rebuilt")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(read_file, "convert_wind_radii_to_polygons", fail)
+        cached = read_all_btks(wr=34, use_cache=True)
+    assert all(
+        shapely.equals_exact(cached[0].WindRadii, btks[0].WindRadii, tolerance=0)
+    )
+
+    # a rewritten storm gets a new cache key
+    os.utime(get_atcf_store_path(deck="bdecks", storm=storm, wr=34), (0, 0))
+    assert get_wind_radii_cache_path(storm=storm, wr=34, n_samples=1000) != cache_fl
+    assert read_wind_radii_cache(storm=storm, wr=34, n_samples=1000) is None
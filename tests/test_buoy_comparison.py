@@ -0,0 +1,151 @@
+import buoy_comparison
+import numpy as np
+import pandas as pd
+import pytest
+
+from buoy_comparison import (
+    align_buoy_saildrone,
+    buoy_comparison_config_keys,
+    compare_buoy_saildrone_pair,
+    find_buoy_saildrone_encounters,
+    prepare_buoy_comparison_data,
+)
+from read_file import read_ndbc_buoy_format, read_saildrone_variables
+
+buoy_position = {"lon": -60.0, "lat": 15.0}
+
+
+@pytest.mark.parametrize("cadence", [None, "10min", "30min", "1h"])
+@pytest.mark.parametrize("method", ["mean", "nearest"])
+def test_align_buoy_saildrone(buoy_file, saildrone_file, cadence, method):
+    buoy_data = prepare_buoy_comparison_data(
+        buoy_data=read_ndbc_buoy_format(filename=buoy_file)
+    )
+    sd_data = read_saildrone_variables(filename=saildrone_file)
+    config = {
+        "comparison_alignment_tolerance_minutes": 5,
+        "comparison_alignment_cadence_minutes": (
+            0 if cadence is None else pd.Timedelta(cadence).total_seconds() // 60
+        ),
+        "comparison_alignment_method": method,
+    }
+
+    data, stats = align_buoy_saildrone(
+        buoy_data=buoy_data,
+        sd_data=sd_data,
+        buoy_position=buoy_position,
+        config=config,
+    )
+
+    assert stats["n_matched"] > 0
+    assert stats["n_matched"] == len(data)
+    assert stats["max_lag_seconds"] <= 5 * 60
+    assert {"wind_speed_buoy", "wind_speed_sd", "distance"} <= set(data.columns)
+    assert data.date.is_monotonic_increasing
+    assert np.all((data.wind_direction_buoy >= 0) & (data.wind_direction_buoy < 360))
+    assert np.all(data.distance < 20)
+
+
+def test_find_buoy_saildrone_encounters():
+    times = pd.date_range("2023-09-01 00:00", periods=25, freq="1h")
+    sd_data = {
+        # passes the buoy at 41044 from west to east (closest at 12 UTC)
+        "1031": pd.DataFrame(
+            {
+                "date": times,
+                "longitude": np.linspace(-61.2, -58.8, len(times)),
+                "latitude": np.full(len(times), 15.0),
+            }
+        ),
+        # stays far from both buoys
+        "1040": pd.DataFrame(
+            {
+                "date": times,
+                "longitude": np.full(len(times), -40.0),
+                "latitude": np.full(len(times), 25.0),
+            }
+        ),
+    }
+    buoy_positions = {"41044": buoy_position, "41043": {"lon": -65.0, "lat": 21.0}}
+
+    encounters = find_buoy_saildrone_encounters(
+        sd_data=sd_data, buoy_positions=buoy_positions, max_distance=50
+    )
+
+    assert len(encounters) == 1
+    assert encounters[0]["buoy"] == "41044"
+    assert encounters[0]["sd"] == "1031"
+    # 0.1 degrees per hour, so within 50 km from 08 to 16 UTC
+    assert encounters[0]["start"] == pd.Timestamp("2023-09-01 08:00")
+    assert encounters[0]["end"] == pd.Timestamp("2023-09-01 16:00")
+    assert encounters[0]["min_distance"] < 1e-6
+
+
+def test_encounters_split_at_gaps():
+    times = pd.date_range("2023-09-01 00:00", periods=10 * 24, freq="1h")
+    # near the buoy on the first and the last day, far away in between
+    near = (times < pd.Timestamp("2023-09-02")) | (times >= pd.Timestamp("2023-09-10"))
+    sd_data = {
+        "1031": pd.DataFrame(
+            {
+                "date": times,
+                "longitude": np.where(near, -60.1, -50.0),
+                "latitude": np.full(len(times), 15.0),
+            }
+        )
+    }
+    buoy_positions = {"41044": buoy_position}
+
+    encounters = find_buoy_saildrone_encounters(
+        sd_data=sd_data, buoy_positions=buoy_positions, max_distance=50
+    )
+    assert [(encounter["start"], encounter["end"]) for encounter in encounters] == [
+        (pd.Timestamp("2023-09-01 00:00"), pd.Timestamp("2023-09-01 23:00")),
+        (pd.Timestamp("2023-09-10 00:00"), pd.Timestamp("2023-09-10 23:00")),
+    ]
+
+    encounters = find_buoy_saildrone_encounters(
+        sd_data=sd_data,
+        buoy_positions=buoy_positions,
+        max_distance=50,
+        max_gap_hours=10 * 24,
+    )
+    assert len(encounters) == 1
+    assert encounters[0]["end"] == pd.Timestamp("2023-09-10 23:00")
+
+
+def test_compare_pair_uses_only_the_comparison_config(
+    buoy_file, saildrone_file, monkeypatch
+):
+    config = {
+        "comparison_buoy": "41044",
+        "comparison_saildrone": "1031",
+        "comparison_start_time": pd.Timestamp("2023-09-01 00:00"),
+        "comparison_end_time": pd.Timestamp("2023-09-01 06:00"),
+        "comparison_alignment_tolerance_minutes": 5,
+        "comparison_alignment_cadence_minutes": 0,
+        "comparison_alignment_method": "mean",
+    }
+    assert sorted(config) == sorted(buoy_comparison_config_keys)
+    # the figure itself needs a LaTeX installation
+    plots = []
+    monkeypatch.setattr(
+        buoy_comparison,
+        "plot_saildrone_buoy_comparison",
+        lambda data, config, filename: plots.append((data, config, filename)),
+    )
+
+    stats = compare_buoy_saildrone_pair(
+        buoy_data=prepare_buoy_comparison_data(
+            buoy_data=read_ndbc_buoy_format(filename=buoy_file)
+        ),
+        sd_data=read_saildrone_variables(filename=saildrone_file),
+        buoy_position=buoy_position,
+        config=config,
+        filename="comparison.png",
+    )
+
+    assert stats["n_matched"] == 37
+    assert len(plots) == 1
+    assert len(plots[0][0]) == 37
+    assert plots[0][1] is config
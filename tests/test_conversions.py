@@ -0,0 +1,47 @@
+import numpy as np
+import shapely
+
+from cartopy.geodesic import Geodesic
+from conversions import convert_wind_radii_to_polygons
+
+
+def test_full_circle_matches_geodesic_circle():
+    polygon = convert_wind_radii_to_polygons(
+        lon=[-60.0], lat=[20.0], radii=[[50, 50, 50, 50]], n_samples=400
+    )[0]
+    circle = shapely.Polygon(
+        Geodesic().circle(lon=-60.0, lat=20.0, radius=50 * 1852.0, n_samples=400)
+    )
+
+    assert polygon.is_valid
+    assert abs(polygon.area - circle.area) / circle.area < 1e-3
+    assert polygon.symmetric_difference(circle).area / circle.area < 1e-3
+
+
+def test_quadrants():
+    radii = np.array([[60, 0, 0, 0], [60, 60, 0, 0], [0, 0, 0, 0]])
+    polygons = convert_wind_radii_to_polygons(
+        lon=[-60.0, -60.0, -60.0], lat=[20.0, 20.0, 20.0], radii=radii
+    )
+
+    # the NE quadrant only covers points north-east of the center
+    assert polygons[0].contains(shapely.Point(-59.6, 20.4))
+    assert not polygons[0].contains(shapely.Point(-60.4, 20.4))
+    assert not polygons[0].contains(shapely.Point(-59.6, 19.6))
+    assert np.isclose(polygons[1].area, 2 * polygons[0].area, rtol=1e-2)
+    assert polygons[2].area == 0
+
+
+def test_chunks_give_the_same_polygons():
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-90, -20, 25)
+    lat = rng.uniform(5, 40, 25)
+    radii = rng.choice([0, 30, 90, 150], size=(25, 4))
+
+    polygons = convert_wind_radii_to_polygons(lon=lon, lat=lat, radii=radii)
+    chunked = convert_wind_radii_to_polygons(
+        lon=lon, lat=lat, radii=radii, chunk_size=7
+    )
+
+    assert len(polygons) == 25
+    assert all(shapely.equals_exact(polygons, chunked, tolerance=0))
@@ -0,0 +1,52 @@
+import os
+
+from manifest import is_up_to_date, read_manifest, update_manifest, write_manifest
+
+
+def write_file(filename, text):
+    with open(filename, "w") as file:
+        file.write(text)
+
+
+def test_is_up_to_date(tmp_path):
+    raw = f"{tmp_path}{os.sep}aal052023.dat"
+    output = f"{tmp_path}{os.sep}al_2023-05.dat"
+    write_file(raw, "deck")
+    write_file(output, "parsed deck")
+    assert not is_up_to_date({}, filename=raw)
+
+    manifest = update_manifest({}, filename=raw, outputs=[output])
+    assert is_up_to_date(manifest, filename=raw)
+
+    # a new download with the same content only changes the modification time
+    write_file(raw, "deck")
+    os.utime(raw, (0, 0))
+    assert is_up_to_date(manifest, filename=raw)
+
+    write_file(raw, "deck 2")
+    assert not is_up_to_date(manifest, filename=raw)
+
+
+def test_missing_output_is_stale(tmp_path):
+    raw = f"{tmp_path}{os.sep}bal052023.dat"
+    output = f"{tmp_path}{os.sep}al_2023-05.dat"
+    write_file(raw, "deck")
+    write_file(output, "parsed deck")
+    manifest = update_manifest({}, filename=raw, outputs=[output], key="btk")
+
+    os.remove(output)
+
+    assert not is_up_to_date(manifest, filename=raw, key="btk")
+
+
+def test_manifest_round_trip(tmp_path):
+    raw = f"{tmp_path}{os.sep}aal052023.dat"
+    filename = f"{tmp_path}{os.sep}manifest.json"
+    write_file(raw, "deck")
+    manifest = update_manifest({}, filename=raw, outputs=[], last_valid="2023")
+
+    write_manifest(manifest=manifest, filename=filename)
+
+    assert read_manifest(filename=filename) == manifest
+    assert read_manifest(filename=f"{tmp_path}{os.sep}missing.json") == {}
+    assert not os.path.isfile(f"{filename}.tmp")
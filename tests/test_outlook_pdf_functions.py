@@ -0,0 +1,99 @@
+import numpy as np
+import os
+import outlook_pdf_functions
+
+from outlook_pdf_functions import (
+    check_figure_dimensions,
+    compile_latex_file,
+    create_outlook_animation,
+    prepare_outlook_image,
+)
+from PIL import Image
+
+
+def write_image(filename, size, color):
+    Image.new("RGBA", size, color).save(filename)
+
+
+def test_prepare_outlook_image(tmp_path):
+    fig_dir = str(tmp_path)
+    colorbar = f"{fig_dir}{os.sep}colorbar.png"
+    write_image(f"{fig_dir}{os.sep}outlook_area1.png", (300, 200), "red")
+    write_image(colorbar, (40, 260), "blue")
+
+    prepare_outlook_image(
+        filename="outlook_area1.png",
+        fig_dir=fig_dir,
+        colorbar=colorbar,
+        dims=(320, 240),
+    )
+
+    assert check_figure_dimensions(filename="outlook_area1.png", fig_dir=fig_dir) == (
+        360,
+        260,
+    )
+    with Image.open(f"{fig_dir}{os.sep}outlook_area1.png") as image:
+        pixels = np.asarray(image.convert("RGB"))
+    # the figure is padded with white on the right and below/above it
+    assert tuple(pixels[120, 10]) == (255, 0, 0)
+    assert tuple(pixels[120, 310]) == (255, 255, 255)
+    assert tuple(pixels[5, 10]) == (255, 255, 255)
+    # the colorbar is appended on the right
+    assert tuple(pixels[250, 350]) == (0, 0, 255)
+
+
+def test_create_outlook_animation(tmp_path):
+    fig_dir = str(tmp_path)
+    area_base = "outlook_areas_btks_area1"
+    for day, color in enumerate(["red", "green", "blue"], start=1):
+        write_image(f"{fig_dir}{os.sep}{area_base}_day{day:02d}.png", (50, 40), color)
+
+    create_outlook_animation(area_base=area_base, fig_dir=fig_dir)
+
+    with Image.open(f"{fig_dir}{os.sep}{area_base}_anim.gif") as animation:
+        assert animation.n_frames == 3
+        assert animation.size == (50, 40)
+    create_outlook_animation(area_base="outlook_areas_btks_area2", fig_dir=fig_dir)
+    assert not os.path.isfile(f"{fig_dir}{os.sep}outlook_areas_btks_area2_anim.gif")
+
+
+def test_compile_latex_file_skips_unchanged_documents(tmp_path, monkeypatch):
+    save_dir = f"{tmp_path}{os.sep}pdf"
+    os.makedirs(save_dir)
+    figure = f"{tmp_path}{os.sep}outlook_areas.png"
+    write_image(figure, (20, 20), "red")
+    calls = []
+
+    def pdflatex(command, stdout=None):
+        calls.append(command)
+        tex = command[-1]
+        with open(f"{tex[:-4]}.pdf", "w") as file:
+            file.write("pdf")
+        with open(f"{tex[:-4]}.log", "w") as file:
+            file.write("done")
+
+    def write_tex(positions_time):
+        with open(f"{save_dir}{os.sep}20230820_1200.tex", "w") as file:
+            file.write(
+                f"SD positions at {positions_time} UTC\n"
+                + r"\includegraphics[width={0.5\textwidth}]{"
+                + figure
+                + "}\n"
+            )
+
+    monkeypatch.setattr(outlook_pdf_functions.subprocess, "check_call", pdflatex)
+
+    write_tex("12:05")
+    assert compile_latex_file(filename="20230820_1200.tex", save_dir=save_dir)
+    assert len(calls) == 1
+    assert sorted(os.listdir(save_dir)) == ["20230820_1200.pdf", "build_manifest.json"]
+
+    # only the time the saildrone positions were read at changed
+    write_tex("12:35")
+    assert not compile_latex_file(filename="20230820_1200.tex", save_dir=save_dir)
+    assert len(calls) == 1
+
+    write_tex("12:35")
+    write_image(figure, (20, 20), "blue")
+    assert compile_latex_file(filename="20230820_1200.tex", save_dir=save_dir)
+    assert len(calls) == 2
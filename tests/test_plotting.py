@@ -0,0 +1,161 @@
+import geopandas as gpd
+import matplotlib
+import numpy as np
+import os
+import pandas as pd
+import pytest
+import shapely
+import xarray as xr
+
+matplotlib.use("Agg")
+
+from datetime import datetime
+from PIL import Image
+from plotting import (
+    outlook_overview_maps,
+    plot_shapefile,
+    plot_shapefile_btkstart,
+    plot_shapefile_btkstart_animation,
+    plot_shapefile_overview_maps,
+    plot_shapefile_with_btks,
+    plot_shapefile_with_btks_and_fcsts,
+    plot_shapefile_with_fcsts,
+)
+
+outlook_time = datetime(2023, 8, 20, 12)
+
+
+@pytest.fixture
+def outlook_data():
+    shapes = gpd.GeoDataFrame(
+        {
+            "AREA": ["1", "2"],
+            "RISK7DAY": ["Low", "High"],
+            "PROB2DAY": ["10%", "50%"],
+            "PROB7DAY": ["20%", "70%"],
+        },
+        geometry=[shapely.box(-50, 10, -40, 20), shapely.box(-70, 20, -60, 30)],
+    )
+    btk = pd.DataFrame(
+        {
+            "Longitude": [-45.0, -47.0, -49.0],
+            "Latitude": [15.0, 16.0, 17.0],
+            "StormName": ["FRANKLIN"] * 3,
+            "StormNumber": [5] * 3,
+            "StormType": ["TS"] * 3,
+        }
+    )
+    fcst = pd.DataFrame(
+        {
+            "FcstCenter": ["CARQ", "OFCL", "OFCL", "AVNO", "AVNO"],
+            "FcstHour": [0, 0, 24, 0, 24],
+            "Longitude": [-49.0, -49.0, -52.0, -49.0, -53.0],
+            "Latitude": [17.0, 17.0, 19.0, 17.0, 20.0],
+            "StormName": ["FRANKLIN"] * 5,
+            "StormNumber": [5] * 5,
+            "StormType": ["TS"] * 5,
+        }
+    )
+    sd_data = {"1031": {"lon": -55.0, "lat": 18.0, "dir": 45.0}}
+
+    return {
+        "shapefile_data": shapes,
+        "btk_data": {"al_2023-05": btk},
+        "fcst_data": {"al_2023-05": fcst},
+        "sd_data": sd_data,
+    }
+
+
+def read_image(filename):
+    return np.asarray(Image.open(filename).convert("RGB"), dtype=int)
+
+
+def test_overview_maps_match_individual_maps(outlook_data, basemap, tmp_path):
+    composite_dir = f"{tmp_path}{os.sep}composite"
+    single_dir = f"{tmp_path}{os.sep}single"
+    os.makedirs(composite_dir)
+    os.makedirs(single_dir)
+
+    plot_shapefile_overview_maps(
+        time=outlook_time, savedir=composite_dir, **outlook_data
+    )
+    plot_shapefile(
+        shapefile_data=outlook_data["shapefile_data"],
+        time=outlook_time,
+        savedir=single_dir,
+        sd_data=outlook_data["sd_data"],
+    )
+    plot_shapefile_with_btks(
+        shapefile_data=outlook_data["shapefile_data"],
+        btk_data=outlook_data["btk_data"],
+        time=outlook_time,
+        savedir=single_dir,
+        sd_data=outlook_data["sd_data"],
+    )
+    plot_shapefile_with_fcsts(
+        shapefile_data=outlook_data["shapefile_data"],
+        fcst_data=outlook_data["fcst_data"],
+        time=outlook_time,
+        savedir=single_dir,
+        sd_data=outlook_data["sd_data"],
+    )
+    plot_shapefile_with_btks_and_fcsts(
+        time=outlook_time, savedir=single_dir, **outlook_data
+    )
+
+    for mp in outlook_overview_maps:
+        composite = read_image(f"{composite_dir}{os.sep}{mp}.png")
+        single = read_image(f"{single_dir}{os.sep}{mp}.png")
+        assert composite.shape == single.shape
+        assert np.mean(np.abs(composite - single) > 32) < 1e-3
+
+    # the layers differ between the maps
+    assert not np.array_equal(
+        read_image(f"{composite_dir}{os.sep}outlook_areas.png"),
+        read_image(f"{composite_dir}{os.sep}outlook_areas_with_btks.png"),
+    )
+
+
+def test_animation_frames_match_daily_maps(outlook_data, basemap, tmp_path):
+    animation_dir = f"{tmp_path}{os.sep}animation"
+    daily_dir = f"{tmp_path}{os.sep}daily"
+    os.makedirs(animation_dir)
+    os.makedirs(daily_dir)
+    lon = np.arange(-60, -40, 0.5)
+    lat = np.arange(10, 20, 0.5)
+    wind_overlap_days = {
+        day: {
+            "overlap": xr.Dataset(
+                {"count": (("lat", "lon"), np.full((len(lat), len(lon)), day))},
+                coords={"lat": lat, "lon": lon},
+            ),
+            "n_storms": 3 - day,
+        }
+        for day in [1, 2]
+    }
+    shapefile_data = outlook_data["shapefile_data"].iloc[1]
+
+    plot_shapefile_btkstart_animation(
+        shapefile_data=shapefile_data,
+        wind_overlap_days=wind_overlap_days,
+        n=2,
+        savedir=animation_dir,
+    )
+    for day in wind_overlap_days:
+        plot_shapefile_btkstart(
+            shapefile_data=shapefile_data,
+            wind_overlap=wind_overlap_days[day]["overlap"],
+            n=2,
+            n_storms=wind_overlap_days[day]["n_storms"],
+            savedir=daily_dir,
+            title_save_add=f"_day{day:02d}",
+        )
+
+    with Image.open(f"{animation_dir}{os.sep}outlook_areas_btks_area2_anim.gif") as gif:
+        assert gif.n_frames == 2
+    for day in wind_overlap_days:
+        fl = f"outlook_areas_btks_area2_day{day:02d}.png"
+        np.testing.assert_array_equal(
+            read_image(f"{animation_dir}{os.sep}{fl}"),
+            read_image(f"{daily_dir}{os.sep}{fl}"),
+        )
@@ -0,0 +1,65 @@
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import os
+import projection
+import shapely
+
+matplotlib.use("Agg")
+
+from projection import (
+    get_basemap_domain_layer,
+    get_basemap_layer,
+    great_circle_distance,
+    set_cartopy_projection_atlantic,
+)
+
+
+def test_basemap_domain_layer_is_built_once(basemap, monkeypatch):
+    land = get_basemap_domain_layer(name="land")
+
+    # geometries outside the domain are dropped, the others clipped to it
+    assert len(land) == 1
+    assert os.path.isfile(f"{projection.basemap_datadir}land_10m.parquet")
+    coastline = get_basemap_domain_layer(name="coastline")
+    assert shapely.bounds(coastline)[0][[0, 2]].tolist() == [-140, -50]
+
+    # a new process reads the stored layer
+    monkeypatch.setattr(projection, "basemap_layers", {})
+    assert shapely.equals(get_basemap_domain_layer(name="land"), land).all()
+    assert basemap["land"].n_reads == 1
+
+
+def test_basemap_layer_clipped_to_extent(basemap):
+    land = get_basemap_layer(name="land", extent=[-75, -70, 15, 20])
+
+    np.testing.assert_array_equal(shapely.bounds(land)[0], [-77, 13, -68, 22])
+    assert get_basemap_layer(name="land", extent=[-75, -70, 15, 20]) is land
+    assert len(get_basemap_layer(name="land", extent=[-40, -35, 15, 20])) == 0
+
+
+def test_great_circle_distance_on_arrays():
+    lon = np.array([-60.0, -61.0, np.nan, -60.0, 120.0])
+    lat = np.array([15.0, 15.0, 15.0, 16.0, -15.0])
+
+    distance = great_circle_distance(lon, lat, -60.0, 15.0)
+    assert distance[0] == 0
+    assert np.isnan(distance[2])
+    assert np.isclose(distance[3], 6371.0 * np.pi / 180)
+    assert np.isclose(distance[4], 6371.0 * np.pi)
+    for idx in [0, 1, 3, 4]:
+        assert great_circle_distance(lon[idx], lat[idx], -60.0, 15.0) == distance[idx]
+
+
+def test_land_edges_drawn_in_land_color(basemap):
+    fig = plt.figure()
+    ax = fig.add_subplot(projection=projection.proj)
+    set_cartopy_projection_atlantic(ax=ax)
+    fig.canvas.draw()
+
+    land = [artist for artist in ax.collections if artist.get_zorder() == -1]
+    # edges in the face color close the seams between clipped land polygons
+    assert len(land) == 1
+    assert np.allclose(land[0].get_facecolor()[:, :3], 0.8)
+    np.testing.assert_array_equal(land[0].get_edgecolor(), land[0].get_facecolor())
+    plt.close(fig)
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+import read_file
+
+from read_file import (
+    read_ndbc_buoy_format,
+    read_netcdf_last_valid,
+    read_saildrone_format,
+    read_saildrone_latest_position,
+    read_saildrone_variables,
+)
+
+
+def write_saildrone_file(filename: str, n: int = 1200) -> pd.DataFrame:
+    """
+    Writes a saildrone-like file with one observation per minute heading east;
+    the last records have no valid position.
+    """
+    time = pd.date_range("2023-08-01", periods=n, freq="1min")
+    data = pd.DataFrame(
+        {
+            "time": time,
+            "latitude": np.full(n, 15.0),
+            "longitude": np.linspace(-60, -59, n),
+            "WIND_SPEED_MEAN": np.linspace(0, 10, n),
+        }
+    )
+    data.loc[n - 3 :, "latitude"] = np.nan
+    data.loc[n - 2 :, "longitude"] = np.nan
+    data.to_xarray().rename(index="obs").to_netcdf(filename)
+
+    return data
+
+
+def test_read_netcdf_last_valid(tmp_path):
+    filename = f"{tmp_path}/sd1031_hurricane_2023.nc"
+    data = write_saildrone_file(filename=filename)
+
+    # both variables come from the same (last fully valid) records
+    last = read_netcdf_last_valid(
+        filename=filename, variables=["latitude", "longitude"], n=2, chunk_size=2
+    )
+    assert np.array_equal(last["latitude"], [15.0, 15.0])
+    assert np.array_equal(last["longitude"], data.longitude.iloc[-5:-3])
+
+    last = read_netcdf_last_valid(
+        filename=filename, variables=["latitude"], n=2000, chunk_size=512
+    )
+    assert len(last["latitude"]) == len(data) - 3
+
+
+def test_read_saildrone_latest_position(tmp_path, monkeypatch):
+    monkeypatch.setattr(read_file, "repo_path", str(tmp_path))
+    monkeypatch.setattr(
+        read_file, "saildrone_position_cache", f"{tmp_path}/saildrone_positions.json"
+    )
+    (tmp_path / "saildrone").mkdir()
+    filename = f"{tmp_path}/saildrone/sd1031_hurricane_2023.nc"
+    data = write_saildrone_file(filename=filename)
+    (tmp_path / "saildrone" / "sd1032_hurricane_2023.nc.part").write_text("")
+    config = {"download_saildrone_data_path": "saildrone"}
+
+    position = read_saildrone_latest_position(config=config)
+    assert list(position) == ["1031"]
+    assert position["1031"]["lon"] == data.longitude.iloc[-4]
+    assert position["1031"]["lat"] == 15.0
+    assert np.isclose(position["1031"]["dir"], 90)
+
+    # unchanged files are answered from the cache without opening them
+    monkeypatch.setattr(read_file, "read_netcdf_last_valid", None)
+    assert read_saildrone_latest_position(config=config) == position
+
+
+def test_read_saildrone_variables_matches_full_read(tmp_path):
+    filename = f"{tmp_path}/sd1031_hurricane_2023.nc"
+    write_saildrone_file(filename=filename)
+    start, end = pd.Timestamp("2023-08-01 03:00"), pd.Timestamp("2023-08-01 04:30")
+
+    full = read_saildrone_format(filename=filename)
+    expected = full[(full.date >= start) & (full.date <= end)].reset_index(drop=True)
+    window = read_saildrone_variables(
+        filename=filename, variables=["latitude", "wind_speed"], start=start, end=end
+    )
+    assert list(window.columns) == ["date", "latitude", "wind_speed"]
+    pd.testing.assert_frame_equal(window, expected[list(window.columns)])
+
+    # memoized results are copies, so callers cannot change the cache
+    window["wind_speed"] = 0.0
+    again = read_saildrone_variables(
+        filename=filename, variables=["latitude", "wind_speed"], start=start, end=end
+    )
+    pd.testing.assert_frame_equal(again, expected[list(window.columns)])
+
+    pd.testing.assert_frame_equal(
+        read_saildrone_variables(filename=filename)[full.columns], full
+    )
+
+
+def test_read_ndbc_buoy_format(tmp_path):
+    filename = f"{tmp_path}/41043.txt"
+    with open(filename, "w") as file:
+        file.write(
+            "#YY  MM DD hh mm WDIR WSPD GST  WVHT   DPD   APD MWD   PRES  ATMP  WTMP  DEWP  VIS PTDY  TIDE\n"
+            "#yr  mo dy hr mn degT m/s  m/s     m   sec   sec degT   hPa  degC  degC  degC  nmi  hPa    ft\n"
+            "2023 08 21 18 50  90  7.0  9.0    MM    MM    MM  MM 1012.3  28.1  29.4  24.0   MM -0.6    MM\n"
+            "2023 08 21 18 40 100  6.0  8.0   1.2     7   5.1 110 1012.5  28.2  29.4  24.1   MM   MM    MM\n"
+        )
+
+    data = read_ndbc_buoy_format(filename=filename)
+    assert list(data.columns) == ["date"] + read_file.ndbc_buoy_column_names
+    assert list(data.date) == [
+        pd.Timestamp("2023-08-21 18:50"),
+        pd.Timestamp("2023-08-21 18:40"),
+    ]
+    assert data.wind_direction.tolist() == [90.0, 100.0]
+    assert data.sea_level_pressure.tolist() == [1012.3, 1012.5]
+    assert data.dominant_wave_period.iloc[1] == 7.0
+    assert data.significant_wave_height.isna().tolist() == [True, False]
+    assert data.tide_level.isna().all()
+    assert (data.dtypes.iloc[1:] == float).all()
+
+
+def test_saildrone_read_cache_is_bounded(tmp_path):
+    read_file.read_saildrone_variables_version.cache_clear()
+    fls = [f"{tmp_path}/sd{idx}_hurricane_2023.nc" for idx in range(3)]
+    for fl in fls:
+        write_saildrone_file(filename=fl, n=60)
+
+    for fl in fls * 2:
+        read_saildrone_variables(filename=fl, variables=["wind_speed"])
+    info = read_file.read_saildrone_variables_version.cache_info()
+    assert info.maxsize == read_file.saildrone_read_cache_size
+    assert (info.hits, info.misses) == (3, 3)
+
+    # a rewritten file is a new version and is read again
+    write_saildrone_file(filename=fls[0], n=30)
+    assert (
+        len(read_saildrone_variables(filename=fls[0], variables=["wind_speed"])) == 30
+    )
+
+    for idx in range(read_file.saildrone_read_cache_size + 5):
+        read_saildrone_variables(
+            filename=fls[1],
+            start=pd.Timestamp("2023-08-01") + pd.Timedelta(minutes=idx),
+        )
+    info = read_file.read_saildrone_variables_version.cache_info()
+    assert info.currsize == read_file.saildrone_read_cache_size
@@ -0,0 +1,101 @@
+import http.server
+import os
+import pytest
+import threading
+
+from read_url import download_url_file, download_url_files
+
+
+class FileServer(http.server.BaseHTTPRequestHandler):
+    """
+    Serves /fileN, fails /flaky twice with 503 before serving it, and answers
+    404 for anything else.
+    """
+
+    hits = {}
+
+    def do_GET(self):
+        type(self).hits[self.path] = type(self).hits.get(self.path, 0) + 1
+        if self.path == "/flaky" and type(self).hits[self.path] < 3:
+            self.send_error(503)
+            return
+        if not (self.path.startswith("/file") or self.path == "/flaky"):
+            self.send_error(404)
+            return
+
+        body = f"content of {self.path}".encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    FileServer.hits = {}
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FileServer)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_url_files(server, tmp_path):
+    files = {
+        f"{server}/file{idx}": f"{tmp_path}{os.sep}file{idx}.nc" for idx in range(8)
+    }
+    files[f"{server}/missing"] = f"{tmp_path}{os.sep}missing.nc"
+
+    status = download_url_files(files=files, workers=4, retries=1, backoff=0.01)
+
+    assert status.pop(f"{server}/missing") is False
+    assert all(status.values())
+    for url in status:
+        with open(files[url]) as file:
+            assert file.read() == f"content of {url[len(server):]}"
+    assert sorted(os.listdir(tmp_path)) == [f"file{idx}.nc" for idx in range(8)]
+
+
+def test_download_url_file_retries(server, tmp_path):
+    destination = f"{tmp_path}{os.sep}flaky.nc"
+    with open(destination, "w") as file:
+        file.write("previous version")
+
+    assert not download_url_file(
+        url=f"{server}/flaky", destination=destination, retries=1, backoff=0.01
+    )
+    # a failed download keeps the previous file
+    with open(destination) as file:
+        assert file.read() == "previous version"
+
+    assert download_url_file(
+        url=f"{server}/flaky", destination=destination, retries=1, backoff=0.01
+    )
+    with open(destination) as file:
+        assert file.read() == "content of /flaky"
+    assert FileServer.hits["/flaky"] == 3
+    assert os.listdir(tmp_path) == ["flaky.nc"]
+
+
+def test_download_url_files_with_write_errors(server, tmp_path):
+    # a directory in place of the file makes the final rename fail
+    os.makedirs(f"{tmp_path}{os.sep}file1.nc")
+    files = {
+        f"{server}/file0": f"{tmp_path}{os.sep}file0.nc",
+        f"{server}/file1": f"{tmp_path}{os.sep}file1.nc",
+        f"{server}/file2": f"{tmp_path}{os.sep}missing{os.sep}file2.nc",
+    }
+
+    status = download_url_files(files=files, workers=3, retries=1, backoff=0.01)
+
+    assert status == {
+        f"{server}/file0": True,
+        f"{server}/file1": False,
+        f"{server}/file2": False,
+    }
+    assert sorted(os.listdir(tmp_path)) == ["file0.nc", "file1.nc"]
+    assert os.listdir(f"{tmp_path}{os.sep}file1.nc") == []
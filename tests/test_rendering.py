@@ -0,0 +1,91 @@
+import os
+import pandas as pd
+import rendering
+
+from projection import get_basemap_domain_layer
+from rendering import get_figure_cache_key, render_figure, render_figures
+
+
+def write_figure(text: str, filename: str):
+    with open(filename, "w") as file:
+        file.write(f"{text} {os.getpid()}")
+
+
+def test_render_figures(tmp_path):
+    fls = [f"{tmp_path}{os.sep}figure_{idx}.png" for idx in range(6)]
+    jobs = [
+        (write_figure, {"text": f"figure {idx}", "filename": fl})
+        for idx, fl in enumerate(fls)
+    ]
+
+    results = render_figures(jobs=jobs, workers=3, verbose=False)
+
+    assert [result["function"] for result in results] == ["write_figure"] * 6
+    for idx, fl in enumerate(fls):
+        with open(fl) as file:
+            assert file.read().startswith(f"figure {idx} ")
+
+
+def test_render_figures_in_order_with_one_worker(tmp_path):
+    fls = [f"{tmp_path}{os.sep}figure_{idx}.png" for idx in range(3)]
+    jobs = [(write_figure, {"text": "figure", "filename": fl}) for fl in fls]
+
+    results = render_figures(jobs=jobs, workers=1, verbose=False)
+
+    assert len(results) == 3
+    pids = set()
+    for fl in fls:
+        with open(fl) as file:
+            pids.add(int(file.read().split()[-1]))
+    assert pids == {os.getpid()}
+
+
+def test_render_figure_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        rendering, "figure_cache_datadir", f"{tmp_path}{os.sep}cache{os.sep}"
+    )
+    fl = f"{tmp_path}{os.sep}figure.png"
+    data = pd.DataFrame({"lon": [-50.0, -51.0], "lat": [15.0, 16.0]})
+    kwargs = {"text": data, "filename": fl}
+
+    result = render_figure(function=write_figure, kwargs=kwargs, outputs=[fl])
+    assert not result["cached"]
+    with open(fl) as file:
+        first = file.read()
+
+    # the same inputs are served from the cache, whatever the output location
+    os.remove(fl)
+    other_fl = f"{tmp_path}{os.sep}other{os.sep}figure.png"
+    os.makedirs(os.path.dirname(other_fl))
+    kwargs_other = {"text": data.copy(), "filename": other_fl}
+    result = render_figure(function=write_figure, kwargs=kwargs_other, outputs=[fl])
+    assert result["cached"]
+    assert not os.path.isfile(other_fl)
+    with open(fl) as file:
+        assert file.read() == first
+
+    # changed inputs are drawn again
+    data.loc[0, "lat"] = 15.5
+    result = render_figure(function=write_figure, kwargs=kwargs, outputs=[fl])
+    assert not result["cached"]
+    assert len(os.listdir(rendering.figure_cache_datadir)) == 2
+
+
+def test_figure_cache_key_follows_plotting_code_and_basemap(
+    tmp_path, monkeypatch, basemap
+):
+    source = tmp_path / "plotting.py"
+    source.write_text("# version 1\n")
+    monkeypatch.setattr(rendering, "figure_source_files", [str(source)])
+    kwargs = {"text": "figure", "filename": f"{tmp_path}{os.sep}figure.png"}
+
+    key = get_figure_cache_key(function=write_figure, kwargs=kwargs)
+    assert get_figure_cache_key(function=write_figure, kwargs=kwargs) == key
+
+    source.write_text("# version 2\n")
+    key_code = get_figure_cache_key(function=write_figure, kwargs=kwargs)
+    assert key_code != key
+
+    # a (re)built basemap layer also changes the key
+    get_basemap_domain_layer(name="land")
+    assert get_figure_cache_key(function=write_figure, kwargs=kwargs) != key_code
@@ -0,0 +1,257 @@
+import http.server
+import numpy as np
+import os
+import pandas as pd
+import pytest
+import requests
+import saildrone_store
+import threading
+import urllib.parse
+
+from read_file import (
+    read_netcdf_last_valid,
+    read_saildrone_format,
+    read_saildrone_variables,
+)
+from saildrone_store import (
+    get_saildrone_fleet_source,
+    query_saildrone_fleet,
+    read_saildrone_store,
+    sync_saildrone_fleet,
+    sync_saildrone_store,
+    write_saildrone_fleet_store,
+    write_saildrone_store_netcdf,
+)
+
+sd = "1031"
+
+
+class ERDDAPStandIn(http.server.BaseHTTPRequestHandler):
+    """
+    Serves canned tabledap csv responses, honoring the time> constraint and
+    answering 404 when no observation matches (as ERDDAP does).
+    """
+
+    observations = None
+    requests = []
+    # times equal to the constraint are also returned, to exercise the dedup
+    inclusive = False
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        type(self).requests.append(urllib.parse.unquote(self.path))
+        if not path.endswith(f"{saildrone_store.get_saildrone_dataset_id(sd=sd)}.csv"):
+            self.send_error(404)
+            return
+
+        data = type(self).observations
+        since = urllib.parse.unquote(query).partition("time>")[2]
+        if since:
+            since = pd.Timestamp(since).tz_localize(None)
+            data = data[data.time >= since if self.inclusive else data.time > since]
+        if len(data) == 0:
+            self.send_error(404, "Your query produced no matching results.")
+            return
+
+        lines = [
+            "trajectory,time,latitude,longitude,WIND_SPEED_MEAN",
+            ",UTC,degrees_north,degrees_east,m s-1",
+        ] + [
+            f"{sd},{row.time:%Y-%m-%dT%H:%M:%SZ},{row.latitude},{row.longitude},"
+            + ("NaN" if np.isnan(row.wind_speed) else f"{row.wind_speed}")
+            for row in data.itertuples()
+        ]
+        body = ("\n".join(lines) + "\n").encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def get_observations(start: str, end: str) -> pd.DataFrame:
+    time = pd.date_range(start, end, freq="1min")
+    return pd.DataFrame(
+        {
+            "time": time,
+            "latitude": np.linspace(15, 16, len(time)),
+            "longitude": np.linspace(-60, -59, len(time)),
+            "wind_speed": np.where(np.arange(len(time)) % 7 == 0, np.nan, 6.0),
+        }
+    )
+
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    store_dir = f"{tmp_path}/saildrone_store/"
+    monkeypatch.setattr(saildrone_store, "saildrone_store_datadir", store_dir)
+    monkeypatch.setattr(
+        saildrone_store, "saildrone_store_manifest", f"{store_dir}manifest.json"
+    )
+    ERDDAPStandIn.observations = get_observations(
+        "2023-08-01 00:00", "2023-08-02 00:00"
+    )
+    ERDDAPStandIn.requests = []
+    ERDDAPStandIn.inclusive = False
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), ERDDAPStandIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/erddap/tabledap/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_incremental_sync(archive):
+    status = sync_saildrone_fleet(sds=[sd], archive=archive)
+    assert status[sd] == {"new": 1441, "last_time": "2023-08-02T00:00:00Z"}
+    assert ERDDAPStandIn.requests[-1].endswith("hurricane_2023.csv")
+
+    # only the observations after the last sync are requested and appended
+    ERDDAPStandIn.observations = pd.concat(
+        [
+            ERDDAPStandIn.observations,
+            get_observations("2023-08-02 00:01", "2023-08-02 00:30"),
+        ]
+    )
+    status = sync_saildrone_fleet(sds=[sd], archive=archive)
+    assert status[sd] == {"new": 30, "last_time": "2023-08-02T00:30:00Z"}
+    assert ERDDAPStandIn.requests[-1].endswith("?&time>2023-08-02T00:00:00Z")
+
+    data = read_saildrone_store(sd=sd)
+    assert len(data) == 1471
+    assert data.time.is_monotonic_increasing
+    assert data.time.is_unique
+
+
+def test_no_new_data(archive):
+    sync_saildrone_fleet(sds=[sd], archive=archive)
+    status = sync_saildrone_fleet(sds=[sd], archive=archive)
+
+    assert status[sd] == {"new": 0, "last_time": "2023-08-02T00:00:00Z"}
+    assert len(read_saildrone_store(sd=sd)) == 1441
+    manifest = saildrone_store.read_manifest(saildrone_store.saildrone_store_manifest)
+    assert manifest[sd] == {"last_time": "2023-08-02T00:00:00Z"}
+
+
+def test_sync_deduplicates_on_time(archive):
+    sync_saildrone_fleet(sds=[sd], archive=archive)
+
+    # the last synced observation is served again, with a corrected value
+    ERDDAPStandIn.inclusive = True
+    ERDDAPStandIn.observations.loc[
+        ERDDAPStandIn.observations.index[-1], "wind_speed"
+    ] = 9.0
+    status = sync_saildrone_fleet(sds=[sd], archive=archive)
+
+    data = read_saildrone_store(sd=sd)
+    assert status[sd]["new"] == 0
+    assert len(data) == 1441
+    assert data.time.is_unique
+    assert data.WIND_SPEED_MEAN.iloc[-1] == 9.0
+
+
+def test_store_netcdf_matches_download_readers(archive, tmp_path):
+    sync_saildrone_fleet(sds=[sd], archive=archive)
+    filename = f"{tmp_path}/sd{sd}_hurricane_2023.nc"
+
+    assert write_saildrone_store_netcdf(sd=sd, filename=filename)
+    assert not write_saildrone_store_netcdf(sd="9999", filename=filename)
+
+    data = read_saildrone_format(filename=filename)
+    assert len(data) == 1441
+    assert {"date", "latitude", "longitude", "wind_speed"} <= set(data.columns)
+    assert data.date.iloc[-1] == pd.Timestamp("2023-08-02 00:00")
+    assert data.wind_speed.isna().sum() == 206
+
+    last = read_netcdf_last_valid(
+        filename=filename, variables=["longitude", "latitude"], n=2
+    )
+    assert np.allclose(last["latitude"][-1], 16)
+    window = read_saildrone_variables(
+        filename=filename,
+        variables=["latitude", "wind_speed"],
+        start=pd.Timestamp("2023-08-01 12:00"),
+        end=pd.Timestamp("2023-08-01 12:59"),
+    )
+    assert len(window) == 60
+
+
+@pytest.fixture
+def fleet_dir(tmp_path, monkeypatch):
+    fleet_dir = f"{tmp_path}/saildrone_store/fleet/"
+    monkeypatch.setattr(saildrone_store, "saildrone_fleet_datadir", fleet_dir)
+
+    return fleet_dir
+
+
+def test_fleet_store_query(fleet_dir):
+    for sd_number, lon in [("1031", -60), ("1040", -40)]:
+        data = get_observations("2023-08-31 23:00", "2023-09-01 01:00").rename(
+            columns={"time": "date"}
+        )
+        data["longitude"] += lon + 60
+        # duplicated times are written once
+        data = pd.concat([data, data.iloc[[0]]])
+        fls = write_saildrone_fleet_store(sd=sd_number, data=data)
+        assert [fl.split("month=")[1][:7] for fl in fls] == ["2023-08", "2023-09"]
+
+    data = query_saildrone_fleet()
+    assert len(data) == 2 * 121
+    assert list(data.columns[:2]) == ["sd", "date"]
+    assert sorted(data.sd.unique()) == ["1031", "1040"]
+
+    data = query_saildrone_fleet(
+        sds=["1031"],
+        variables=["latitude", "wind_speed"],
+        start=pd.Timestamp("2023-08-31 23:30"),
+        end=pd.Timestamp("2023-09-01 00:30"),
+    )
+    assert list(data.columns) == ["sd", "date", "latitude", "wind_speed"]
+    assert len(data) == 61
+    assert data.date.is_monotonic_increasing
+    assert data.date.iloc[0] == pd.Timestamp("2023-08-31 23:30")
+
+    data = query_saildrone_fleet(bbox=[-45, -35, 10, 20])
+    assert set(data.sd) == {"1040"}
+    assert len(data) == 121
+
+
+def test_fleet_source_follows_download_mode(archive, tmp_path):
+    saildrone_dir = f"{tmp_path}/saildrone"
+    os.makedirs(saildrone_dir)
+    filename = f"{saildrone_dir}/{saildrone_store.get_saildrone_dataset_id(sd=sd)}.nc"
+    assert get_saildrone_fleet_source(sd, saildrone_dir, mode="full") is None
+
+    sync_saildrone_fleet(sds=[sd], archive=archive)
+    write_saildrone_store_netcdf(sd=sd, filename=filename)
+    store_path = saildrone_store.get_saildrone_store_path(sd=sd)
+
+    assert get_saildrone_fleet_source(sd, saildrone_dir, mode="incremental") == (
+        store_path
+    )
+    # back in full mode, the (possibly stale) synced store is not used
+    assert get_saildrone_fleet_source(sd, saildrone_dir, mode="full") == filename
+    os.remove(store_path)
+    assert get_saildrone_fleet_source(sd, saildrone_dir, mode="incremental") == (
+        filename
+    )
+
+
+def test_only_empty_query_404_is_no_new_data(archive):
+    sync_saildrone_fleet(sds=[sd], archive=archive)
+
+    # ERDDAP answers a query without new observations with a 404 and a message
+    status = sync_saildrone_store(sd=sd, since="2023-08-02T00:00:00Z", archive=archive)
+    assert status == {"new": 0, "last_time": "2023-08-02T00:00:00Z"}
+
+    # any other 404 (e.g., a wrong dataset) is an error, not an empty sync
+    with pytest.raises(requests.HTTPError):
+        sync_saildrone_store(sd="9999", since="2023-08-02T00:00:00Z", archive=archive)
+    status = sync_saildrone_fleet(sds=[sd, "9999"], archive=archive)
+    assert list(status) == [sd]
+    manifest = saildrone_store.read_manifest(saildrone_store.saildrone_store_manifest)
+    assert list(manifest) == [sd]
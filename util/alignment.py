@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+
+from typing import Dict, List, Tuple
+
+
+def get_direction_columns(data: pd.DataFrame) -> List[str]:
+    """
+    Finds the columns holding directions in degrees (averaged as angles).
+
+    Arguments:
+    - data: pd.DataFrame
+
+    Returns:
+    - list
+    """
+    return [col for col in data.columns if "direction" in col]
+
+
+def resample_time_series(
+    data: pd.DataFrame, cadence: str, method: str = "mean", on: str = "date"
+) -> pd.DataFrame:
+    """
+    Resamples a time series to a regular cadence. With mean, all observations
+    in a bin are averaged (directions as unit vectors); with nearest, the
+    observation closest to each bin time (within half a bin) is kept.
+
+    Arguments:
+    - data: pd.DataFrame with a time column
+    - cadence: pandas frequency (e.g., 10min)
+    - method: mean or nearest
+    - on: name of the time column
+
+    Returns:
+    - pd.DataFrame with one row per bin that has data
+    """
+    data = data.dropna(subset=[on]).sort_values(by=on, kind="stable")
+    data = data.assign(**{on: data[on].astype("datetime64[ns]")})
+    numeric = data.select_dtypes(include="number").columns.tolist()
+    data = data[[on] + [col for col in numeric if col != on]]
+
+    if method == "mean":
+        directions = get_direction_columns(data)
+        rad = np.deg2rad(data[directions])
+        data = data.assign(
+            **{f"{col}_u": np.sin(rad[col]) for col in directions},
+            **{f"{col}_v": np.cos(rad[col]) for col in directions},
+        )
+        resampled = data.resample(cadence, on=on).mean()
+        for col in directions:
+            resampled[col] = (
+                np.rad2deg(np.arctan2(resampled[f"{col}_u"], resampled[f"{col}_v"]))
+                % 360
+            )
+        resampled = resampled.drop(
+            columns=[f"{col}_{comp}" for col in directions for comp in ["u", "v"]]
+        )
+        resampled = resampled.dropna(how="all").reset_index()
+    elif method == "nearest":
+        times = pd.DataFrame(
+            {
+                on: pd.date_range(
+                    data[on].min().floor(cadence),
+                    data[on].max().ceil(cadence),
+                    freq=cadence,
+                )
+            }
+        )
+        resampled = pd.merge_asof(
+            times,
+            data,
+            on=on,
+            direction="nearest",
+            tolerance=pd.Timedelta(cadence) / 2,
+        )
+        resampled = resampled.dropna(
+            how="all", subset=[col for col in resampled.columns if col != on]
+        ).reset_index(drop=True)
+    else:
+        raise ValueError(f"Unknown resampling method {method}; use mean or nearest.")
+
+    return resampled
+
+
+def align_time_series(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    tolerance: str = "5min",
+    cadence: str = None,
+    method: str = "mean",
+    suffixes: Tuple[str, str] = ("_left", "_right"),
+    on: str = "date",
+    keep_unmatched: bool = False,
+) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Aligns two time series with a sorted as-of join: every left observation is
+    matched to the nearest right observation within the tolerance. Optionally,
+    both series are first resampled to a common cadence. Both time columns are
+    cast to nanoseconds first, since readers may return other resolutions
+    (e.g., microseconds from text files) and the join needs a common one.
+
+    Arguments:
+    - left: pd.DataFrame with a time column (defines the output times)
+    - right: pd.DataFrame with a time column
+    - tolerance: largest time difference of a match (pandas timedelta string)
+    - cadence: common cadence (pandas frequency); None keeps the original times
+    - method: resampling method (mean or nearest)
+    - suffixes: suffixes of the columns present in both series
+    - on: name of the time column
+    - keep_unmatched: keep left observations without a match
+
+    Returns:
+    - aligned pd.DataFrame (with the matched right time as {on}{suffixes[1]}),
+      dictionary of match statistics
+    """
+    left = left.assign(**{on: left[on].astype("datetime64[ns]")})
+    right = right.assign(**{on: right[on].astype("datetime64[ns]")})
+    if cadence is not None:
+        left = resample_time_series(data=left, cadence=cadence, method=method, on=on)
+        right = resample_time_series(data=right, cadence=cadence, method=method, on=on)
+    left = left.dropna(subset=[on]).sort_values(by=on, kind="stable")
+    right = right.dropna(subset=[on]).sort_values(by=on, kind="stable")
+    right_time = f"{on}{suffixes[1]}"
+    right = right.assign(**{right_time: right[on]})
+
+    aligned = pd.merge_asof(
+        left.reset_index(drop=True),
+        right.reset_index(drop=True),
+        on=on,
+        direction="nearest",
+        tolerance=pd.Timedelta(tolerance),
+        suffixes=suffixes,
+    )
+    matched = ~pd.isna(aligned[right_time])
+    lag = (aligned[right_time] - aligned[on]).dt.total_seconds().abs()[matched]
+    stats = {
+        "n_left": len(left),
+        "n_right": len(right),
+        "n_matched": int(matched.sum()),
+        "matched_fraction": float(matched.mean()) if len(aligned) > 0 else np.nan,
+        "mean_lag_seconds": float(lag.mean()) if len(lag) > 0 else np.nan,
+        "max_lag_seconds": float(lag.max()) if len(lag) > 0 else np.nan,
+    }
+    if not keep_unmatched:
+        aligned = aligned[matched].reset_index(drop=True)
+
+    return aligned, stats
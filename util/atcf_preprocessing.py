@@ -0,0 +1,169 @@
+import os
+import pandas as pd
+import shutil
+import time
+
+from atcf_store import write_atcf_store
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from manifest import is_up_to_date, update_manifest
+from read_file import read_raw_atcf
+from typing import Dict, List, Tuple
+
+
+def get_storm_name_from_raw_filename(filename: str) -> str:
+    """
+    Converts a raw ATCF filename to the storm name used in the store,
+    e.g., aal052023.dat -> al_2023-05.
+
+    Arguments:
+    - filename: string
+
+    Returns:
+    - string
+    """
+    filename = os.path.basename(filename)
+
+    return f"{filename[1:3]}_{filename[5:9]}-{filename[3:5]}"
+
+
+def preprocess_atcf_file(filename: str, deck: str) -> Dict:
+    """
+    Parses one raw ATCF deck and writes it to the store, split by wind radii.
+
+    Arguments:
+    - filename: path to the raw deck
+    - deck: adecks or bdecks
+
+    Returns:
+    - dictionary with the file, storm, number of rows, written partitions and timing
+    """
+    start = time.perf_counter()
+    storm = get_storm_name_from_raw_filename(filename=filename)
+    df = read_raw_atcf(filename=filename)
+    parse_time = time.perf_counter() - start
+    fls = write_atcf_store(data=df, storm=storm, deck=deck)
+    total_time = time.perf_counter() - start
+
+    return {
+        "filename": filename,
+        "storm": storm,
+        "deck": deck,
+        "rows": len(df),
+        "partitions": len(fls),
+        "outputs": fls,
+        "parse_time": parse_time,
+        "write_time": total_time - parse_time,
+    }
+
+
+def preprocess_atcf_files(
+    fls: List[str], deck: str, workers: int = None, verbose: bool = True
+) -> Tuple[List[Dict], List[str]]:
+    """
+    Parses and splits raw ATCF decks in a process pool. Failed decks are
+    reported and returned separately, so that the caller can still record the
+    decks that were processed.
+
+    Arguments:
+    - fls: paths to the raw decks
+    - deck: adecks or bdecks
+    - workers: number of processes; defaults to the number of cores
+    - verbose: print per-file timing
+
+    Returns:
+    - list of preprocess_atcf_file outputs of the processed decks (in the order
+      of fls), list of paths to the decks that could not be processed
+    """
+    if len(fls) == 0:
+        return [], []
+    if workers is None or workers < 1:
+        workers = os.cpu_count()
+    workers = min(workers, len(fls))
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(preprocess_atcf_file, filename=fl, deck=deck): fl
+            for fl in fls
+        }
+        for future in as_completed(futures):
+            fl = futures[future]
+            try:
+                results[fl] = future.result()
+            except Exception as err:
+                print(f"Could not process {fl}: {err}")
+                continue
+            if verbose:
+                print(
+                    f"     {os.path.basename(fl)} -> {results[fl]['storm']}: "
+                    + f"{results[fl]['rows']} rows, "
+                    + f"{results[fl]['partitions']} partitions, "
+                    + f"parse {results[fl]['parse_time']:.2f} s, "
+                    + f"write {results[fl]['write_time']:.2f} s"
+                )
+
+    processed = [results[fl] for fl in fls if fl in results]
+    failed = [fl for fl in fls if fl not in results]
+
+    return processed, failed
+
+
+def update_current_system_file(
+    manifest: Dict,
+    filename: str,
+    key: str,
+    output_dir: str,
+    cache_dir: str,
+    columns: List[str],
+    rename: Dict = None,
+    valid_times: List[datetime] = None,
+) -> Dict:
+    """
+    Converts a raw ATCF deck of a current system to the csv file used for the
+    figures. The csv file is kept in a cache directory (recorded in the
+    manifest), so a deck that has not changed since the last run is not parsed
+    again, even if the output directory was cleaned up in between.
+
+    Arguments:
+    - manifest: dictionary
+    - filename: path to the raw deck
+    - key: manifest key
+    - output_dir: directory of the csv file
+    - cache_dir: directory of the cached csv file
+    - columns: columns written to the csv file
+    - rename: columns renamed before writing
+    - valid_times: the csv file is only written if the last time of the deck
+      is one of these; None always writes it
+
+    Returns:
+    - dictionary
+    """
+    new_name = get_storm_name_from_raw_filename(filename=filename) + ".dat"
+    cached = f"{cache_dir}{os.sep}{new_name}"
+    # entries written before the cache recorded the output files instead
+    recorded = manifest.get(key, {}).get("outputs", {})
+    if (cached not in recorded) or not is_up_to_date(
+        manifest, filename=filename, key=key
+    ):
+        df = read_raw_atcf(filename=filename)
+        last_valid = df.Date.iloc[-1]
+        df = df.rename(columns=rename or {})[columns]
+        os.makedirs(cache_dir, exist_ok=True)
+        df.to_csv(cached, index=False)
+        manifest = update_manifest(
+            manifest,
+            filename=filename,
+            outputs=[cached],
+            key=key,
+            last_valid=str(last_valid),
+        )
+
+    output = f"{output_dir}{os.sep}{new_name}"
+    last_valid = pd.Timestamp(manifest[key]["last_valid"])
+    if (valid_times is None) or (last_valid in valid_times):
+        shutil.copy(cached, output)
+    elif os.path.isfile(output):
+        os.remove(output)
+
+    return manifest
@@ -3,10 +3,12 @@ import numpy as np
 import os
 import pandas as pd
 import pytz
+import shapely
 import shapely.geometry as shp
+import xarray as xr
 import zipfile
 
-from cartopy.geodesic import Geodesic
+from atcf_store import get_atcf_store_storms
 from conversions import convert_time_to_utc
 from datetime import datetime, timedelta
 from paths import nhc_outlook_archive, repo_path
@@ -14,8 +16,6 @@ from read_url import get_files_at_url, retrieve_url_file
 from shapely.ops import polygonize
 from typing import Any, Dict, List
 
-geod = Geodesic()
-
 adecks_datadir = (
     f"{repo_path}{os.sep}data{os.sep}hurricane_forecasts{os.sep}adecks{os.sep}"
 )
@@ -119,6 +119,21 @@ column_types = {
     "y": str,
     "yy": str,
 }
+wind_radii_columns = [
+    "Basin",
+    "StormNumber",
+    "Date",
+    "FcstCenter",
+    "FcstHour",
+    "Latitude",
+    "Longitude",
+    "MaxSustainedWind",
+    "WSPRadius1",
+    "WSPRadius2",
+    "WSPRadius3",
+    "WSPRadius4",
+    "StormName",
+]
 
 
 def count_overlapping_features(geo_dataset: gpd.geopandas.GeoDataFrame):
@@ -143,6 +158,88 @@ def count_overlapping_features(geo_dataset: gpd.geopandas.GeoDataFrame):
     return out_gdf
 
 
+def count_overlapping_features_grid(
+    geo_dataset: gpd.geopandas.GeoDataFrame,
+    resolution: float = 0.25,
+    extent: List[float] = [-111, 11, -5, 55],
+    by: str = None,
+    groups: List[Any] = None,
+) -> xr.Dataset:
+    """
+    Counts overlapping features on a regular lon/lat grid. Each feature is
+    rasterized (grid cell centers inside the feature) and the counts summed.
+
+    Arguments:
+    - geo_dataset: output of split_storms_into_wind_radii
+    - resolution: grid spacing (degrees)
+    - extent: grid extent [lon_min, lon_max, lat_min, lat_max]
+    - by: column of geo_dataset to count separately for each value of
+    - groups: values of by to include (defaults to all values present)
+
+    Returns:
+    - xr.Dataset with a count variable on (lat, lon), or (by, lat, lon)
+    """
+    lon = np.arange(extent[0] + resolution / 2, extent[1], resolution)
+    lat = np.arange(extent[2] + resolution / 2, extent[3], resolution)
+
+    if by is None:
+        groups = [None]
+        group_idx = np.zeros(len(geo_dataset), dtype=int)
+    else:
+        if groups is None:
+            groups = np.unique(geo_dataset[by])
+        groups = np.asarray(groups)
+        group_idx = pd.Index(groups).get_indexer(geo_dataset[by])
+    count = np.zeros((len(groups), len(lat), len(lon)), dtype=int)
+
+    geoms = geo_dataset.geometry.to_numpy()
+    shapely.prepare(geoms)
+    for geom, group, (xmin, ymin, xmax, ymax) in zip(
+        geoms, group_idx, shapely.bounds(geoms)
+    ):
+        ilon = slice(np.searchsorted(lon, xmin), np.searchsorted(lon, xmax, "right"))
+        ilat = slice(np.searchsorted(lat, ymin), np.searchsorted(lat, ymax, "right"))
+        if (group >= 0) and (ilon.stop > ilon.start) and (ilat.stop > ilat.start):
+            lon_grid, lat_grid = np.meshgrid(lon[ilon], lat[ilat])
+            count[group, ilat, ilon] += shapely.contains_xy(geom, lon_grid, lat_grid)
+
+    if by is None:
+        return xr.Dataset(
+            {"count": (("lat", "lon"), count[0])}, coords={"lat": lat, "lon": lon}
+        )
+
+    return xr.Dataset(
+        {"count": ((by, "lat", "lon"), count)},
+        coords={by: groups, "lat": lat, "lon": lon},
+    )
+
+
+def compute_btk_overlap(
+    geo_dataset: gpd.geopandas.GeoDataFrame,
+    engine: str = "polygon",
+    resolution: float = 0.25,
+):
+    """
+    Counts overlapping wind radii with the selected engine.
+
+    Arguments:
+    - geo_dataset: output of split_storms_into_wind_radii
+    - engine: polygon (polygonize + sjoin) or grid (rasterized counts)
+    - resolution: grid spacing (degrees) for the grid engine
+
+    Returns:
+    - gpd.GeoDataFrame (polygon) or xr.Dataset (grid) with a count column
+    """
+    if engine == "grid":
+        return count_overlapping_features_grid(
+            geo_dataset=geo_dataset, resolution=resolution
+        )
+    elif engine == "polygon":
+        return count_overlapping_features(geo_dataset=geo_dataset)
+    else:
+        raise ValueError(f"Unknown overlap engine: {engine}")
+
+
 def split_storms_into_wind_radii(storm_wr: gpd.geopandas.GeoDataFrame):
     storm_wr = [gpd.GeoDataFrame(bdw) for bdw in storm_wr]
     storm_wr = [bdw.set_geometry("WindRadii") for bdw in storm_wr]
@@ -162,22 +259,180 @@ def split_storms_into_wind_radii(storm_wr: gpd.geopandas.GeoDataFrame):
     return storm
 
 
+def split_storms_into_wind_radii_by_day(
+    storm_wr: List[pd.DataFrame], n_days: int = 10
+) -> gpd.geopandas.GeoDataFrame:
+    """
+    Splits the wind radii of each storm into independent features for every
+    storm day (24 h periods counted from the first best track fix), in one pass
+    over all storms.
+
+    Arguments:
+    - storm_wr: list of best tracks (with Date and WindRadii columns)
+    - n_days: number of storm days to keep
+
+    Returns:
+    - gpd.GeoDataFrame with Storms (geometry), StormIndex and StormDay columns
+    """
+    storm_days = []
+    for idx, storm in enumerate(storm_wr):
+        day = ((storm.Date - storm.Date.iloc[0]) / pd.Timedelta(hours=1)) // 24 + 1
+        keep = (day <= n_days).to_numpy()
+        storm_days.append(
+            pd.DataFrame(
+                {
+                    "StormIndex": idx,
+                    "StormDay": day[keep].astype(int).to_numpy(),
+                    "WindRadii": storm.WindRadii.to_numpy()[keep],
+                }
+            )
+        )
+    if len(storm_days) == 0:
+        storm_days = [pd.DataFrame(columns=["StormIndex", "StormDay", "WindRadii"])]
+    storm_days = pd.concat(storm_days, ignore_index=True)
+
+    unions = storm_days.groupby(["StormIndex", "StormDay"], sort=True).WindRadii.agg(
+        lambda geoms: shapely.union_all(geoms.to_numpy())
+    )
+    parts, part_idx = shapely.get_parts(unions.to_numpy(), return_index=True)
+    storm = gpd.GeoDataFrame(
+        {
+            "StormIndex": unions.index.get_level_values("StormIndex")[part_idx],
+            "StormDay": unions.index.get_level_values("StormDay")[part_idx],
+            "Storms": parts,
+        },
+        geometry="Storms",
+        crs="epsg:3857",
+    )
+
+    return storm
+
+
+def compute_btk_overlap_by_day(
+    btk: List[pd.DataFrame],
+    n_days: int = 10,
+    engine: str = "polygon",
+    resolution: float = 0.25,
+) -> Dict[int, Dict]:
+    """
+    Counts overlapping wind radii for every storm day of the storms starting in
+    a region. The wind radii are split once for all days; with the grid engine
+    all days are also rasterized in a single pass.
+
+    Arguments:
+    - btk: list of best tracks starting in the region
+    - n_days: number of storm days
+    - engine: polygon (polygonize + sjoin) or grid (rasterized counts)
+    - resolution: grid spacing (degrees) for the grid engine
+
+    Returns:
+    - dictionary of storm day: {"overlap": overlap counts, "n_storms": number of
+      storms lasting at least that many days}
+    """
+    days = list(range(1, n_days + 1))
+    storm_length = np.array(
+        [
+            ((storm.Date.max() - storm.Date.iloc[0]) / pd.Timedelta(hours=1)) // 24 + 1
+            for storm in btk
+        ]
+    )
+    storm = split_storms_into_wind_radii_by_day(storm_wr=btk, n_days=n_days)
+
+    if engine == "grid":
+        overlap = count_overlapping_features_grid(
+            geo_dataset=storm, resolution=resolution, by="StormDay", groups=days
+        )
+        overlap = {day: overlap.sel(StormDay=day, drop=True) for day in days}
+    elif engine == "polygon":
+        overlap = {
+            day: count_overlapping_features(
+                geo_dataset=storm[storm.StormDay == day].reset_index(drop=True)
+            )
+            for day in days
+        }
+    else:
+        raise ValueError(f"Unknown overlap engine: {engine}")
+
+    return {
+        day: {"overlap": overlap[day], "n_storms": int(np.sum(day <= storm_length))}
+        for day in days
+    }
+
+
+def build_btk_spatial_index(btk: List[pd.DataFrame]) -> Dict:
+    """
+    Builds a spatial index over the centers of all best track fixes.
+
+    Arguments:
+    - btk: list of best tracks (with a Center column)
+
+    Returns:
+    - dictionary with the STRtree, the storm of each fix, and whether a fix
+      is the first one of its storm
+    """
+    n_fixes = [len(storm) for storm in btk]
+    if len(btk) > 0:
+        centers = np.concatenate([storm["Center"].to_numpy() for storm in btk])
+    else:
+        centers = np.array([], dtype=object)
+    first_fix = np.zeros(len(centers), dtype=bool)
+    first_fix[np.cumsum([0] + n_fixes[:-1])[np.array(n_fixes) > 0]] = True
+
+    return {
+        "tree": shapely.STRtree(centers),
+        "storm": np.repeat(np.arange(len(btk)), n_fixes),
+        "first": first_fix,
+    }
+
+
+def subset_btks_in_regions(
+    btk: List[pd.DataFrame],
+    target_regions: List[shp.Polygon],
+    index: Dict = None,
+    verbose: bool = True,
+) -> List[Dict]:
+    """
+    Finds the storms that start in / pass through each of the given regions
+    with a single spatial index query.
+
+    Arguments:
+    - btk: list of best tracks (with a Center column)
+    - target_regions: list of polygons
+    - index: output of build_btk_spatial_index; built if not given
+    - verbose: print the number of storms that start in each region
+
+    Returns:
+    - list (one per region) of dictionaries with "start" and "track" storms
+    """
+    if index is None:
+        index = build_btk_spatial_index(btk=btk)
+
+    regions = np.array(list(target_regions), dtype=object)
+    region_idx, fix_idx = index["tree"].query(regions, predicate="contains")
+
+    subsets = []
+    for region in range(len(regions)):
+        fixes = fix_idx[region_idx == region]
+        storms_track = np.unique(index["storm"][fixes])
+        storms_start = np.unique(index["storm"][fixes[index["first"][fixes]]])
+        if verbose:
+            print(f"Storms that start in region: {len(storms_start)}")
+        subsets.append(
+            {
+                "start": [btk[storm] for storm in storms_start],
+                "track": [btk[storm] for storm in storms_track],
+            }
+        )
+
+    return subsets
+
+
 def subset_btk_in_region(
     btk: pd.DataFrame, target_region: shp.Polygon, wr: int = 0, verbose: bool = True
 ) -> dict:
-    btks_track = []
-    btks_start = []
-    for _, btk in enumerate(btk):
-        btk["InRange"] = btk["Center"].apply(target_region.contains)
-        if btk.InRange.sum() > 0:
-            btks_track.append(btk)
-            if btk.InRange.iloc[0]:
-                btks_start.append(btk)
-
-    if verbose:
-        print(f"Storms that start in region: {len(btks_start)}")
-
-    return {"start": btks_start, "track": btks_track}
+    return subset_btks_in_regions(
+        btk=btk, target_regions=[target_region], verbose=verbose
+    )[0]
 
 
 def get_info_from_filename(filename: str):
@@ -298,69 +553,54 @@ def fix_atcf_longitude(val: str) -> float:
     return x / 10.0
 
 
-def convert_wind_radii_to_polygon(forecast: pd.DataFrame) -> shp.Polygon:
+def decode_atcf_coordinate(values: pd.Series, negative: str) -> np.ndarray:
     """
-    Converts four given wind radii into a polygon.
+    Converts a column of ATCF latitudes or longitudes to floats, e.g.,
+    155N -> 15.5 and 405W -> -40.5.
 
     Arguments:
-    - forecast: pd.DataFrame
+    - values: pd.Series of strings
+    - negative: hemisphere suffix with negative values (S or W)
 
     Returns:
-    - shapely Polygon
+    - np.ndarray
     """
+    # work on the unicode code points of all values at once
+    chars = values.fillna("").to_numpy(dtype="U8").view(np.uint32)
+    chars = chars.reshape(len(values), -1)
+    is_digit = (chars >= ord("0")) & (chars <= ord("9"))
+    place = np.cumsum(is_digit[:, ::-1], axis=1)[:, ::-1] - 1
+    number = np.where(is_digit, (chars - ord("0")) * 10.0**place, 0).sum(axis=1)
+    number[~is_digit.any(axis=1)] = np.nan
 
-    if forecast.WSPRadius1 > 0:
-        cp_ne = np.asarray(
-            geod.circle(
-                lon=forecast.Center.x,
-                lat=forecast.Center.y,
-                radius=forecast.WSPRadius1 * 1852.0,
-                endpoint=True,
-                n_samples=1000,
-            )
-        )[750:]
-    else:
-        cp_ne = np.array([forecast.Center.x, forecast.Center.y])
-    if forecast.WSPRadius2 > 0:
-        cp_se = np.asarray(
-            geod.circle(
-                lon=forecast.Center.x,
-                lat=forecast.Center.y,
-                radius=forecast.WSPRadius2 * 1852.0,
-                endpoint=True,
-                n_samples=1000,
-            )
-        )[500:751]
-    else:
-        cp_se = np.array([forecast.Center.x, forecast.Center.y])
-    if forecast.WSPRadius3 > 0:
-        cp_sw = np.asarray(
-            geod.circle(
-                lon=forecast.Center.x,
-                lat=forecast.Center.y,
-                radius=forecast.WSPRadius3 * 1852.0,
-                endpoint=True,
-                n_samples=1000,
-            )
-        )[250:501]
-    else:
-        cp_sw = np.array([forecast.Center.x, forecast.Center.y])
-    if forecast.WSPRadius4 > 0:
-        cp_nw = np.asarray(
-            geod.circle(
-                lon=forecast.Center.x,
-                lat=forecast.Center.y,
-                radius=forecast.WSPRadius4 * 1852.0,
-                endpoint=True,
-                n_samples=1000,
-            )
-        )[:251]
-    else:
-        cp_nw = np.array([forecast.Center.x, forecast.Center.y])
+    last_char = np.maximum((chars > 0).sum(axis=1) - 1, 0)
+    hemisphere = chars[np.arange(len(chars)), last_char]
+    sign = np.where(hemisphere == ord(negative), -1.0, 1.0)
 
-    all_pts = np.vstack((cp_nw, cp_sw, cp_se, cp_ne))
+    return sign * number / 10.0
 
-    return shp.Polygon(all_pts)
+
+def decode_atcf_date(values: np.ndarray) -> pd.Series:
+    """
+    Converts ATCF dates (YYYYMMDDHH) to datetimes.
+
+    Arguments:
+    - values: np.ndarray of numbers
+
+    Returns:
+    - pd.Series of datetimes
+    """
+    values = np.asarray(values, dtype=float)
+    date = pd.DataFrame(
+        {
+            "year": values // 1000000,
+            "month": values // 10000 % 100,
+            "day": values // 100 % 100,
+            "hour": values % 100,
+        }
+    )
+
+    return pd.to_datetime(date)
 
 
 def get_atcf_files() -> List:
@@ -371,12 +611,8 @@ def get_atcf_files() -> List:
     - list
     """
 
-    fls_a = sorted(
-        [fl for fl in os.listdir(f"{adecks_datadir}{os.sep}downloaded") if ".dat" in fl]
-    )
-    fls_b = sorted(
-        [fl for fl in os.listdir(f"{bdecks_datadir}{os.sep}downloaded") if ".dat" in fl]
-    )
+    fls_a = get_atcf_store_storms(deck="adecks")
+    fls_b = get_atcf_store_storms(deck="bdecks")
 
     fls = [fl for fl in fls_a if fl in fls_b]
 
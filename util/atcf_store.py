@@ -0,0 +1,262 @@
+import hashlib
+import json
+import os
+import pandas as pd
+import shapely
+import shutil
+
+from paths import repo_path
+from typing import Dict, List
+
+atcf_store_datadir = (
+    f"{repo_path}{os.sep}data{os.sep}hurricane_forecasts{os.sep}atcf_store{os.sep}"
+)
+atcf_store_filename = "part-0.parquet"
+atcf_store_manifest = f"{atcf_store_datadir}manifest.json"
+atcf_geometry_cache_datadir = f"{atcf_store_datadir}geometry_cache{os.sep}"
+# bump when the way wind radii geometries are built changes
+wind_radii_geometry_version = 1
+
+
+def get_atcf_store_path(deck: str, storm: str, wr: int = None) -> str:
+    """
+    Builds the path of a storm (or one of its wind radii partitions) in the store.
+    The store is partitioned as: deck/year=YYYY/storm=bb_YYYY-NN/wind_radii=WR.
+
+    Arguments:
+    - deck: adecks or bdecks
+    - storm: storm name (e.g., al_2023-05)
+    - wr: wind radii threshold (kt); None for the storm directory
+
+    Returns:
+    - string
+    """
+    storm_dir = (
+        f"{atcf_store_datadir}{deck}{os.sep}year={storm[3:7]}{os.sep}storm={storm}"
+    )
+    if wr is None:
+        return storm_dir
+
+    return f"{storm_dir}{os.sep}wind_radii={int(wr)}{os.sep}{atcf_store_filename}"
+
+
+def get_atcf_store_storms(deck: str) -> List[str]:
+    """
+    Finds all storms written to the store for a given deck.
+
+    Arguments:
+    - deck: adecks or bdecks
+
+    Returns:
+    - list
+    """
+    deck_dir = f"{atcf_store_datadir}{deck}"
+    if not os.path.isdir(deck_dir):
+        return []
+
+    storms = []
+    for year in os.listdir(deck_dir):
+        if year.startswith("year="):
+            storms += [
+                storm.split("=")[-1]
+                for storm in os.listdir(f"{deck_dir}{os.sep}{year}")
+                if storm.startswith("storm=")
+            ]
+
+    return sorted(storms)
+
+
+def write_atcf_store(data: pd.DataFrame, storm: str, deck: str) -> List[str]:
+    """
+    Writes a parsed ATCF deck into the store, one partition per wind radii
+    threshold. Rows without wind radii end up in the wind_radii=0 partition.
+    Any previous version of the storm is replaced.
+
+    Arguments:
+    - data: output of read_raw_atcf
+    - storm: storm name (e.g., al_2023-05)
+    - deck: adecks or bdecks
+
+    Returns:
+    - list of written files
+    """
+    storm_dir = get_atcf_store_path(deck=deck, storm=storm)
+    if os.path.isdir(storm_dir):
+        shutil.rmtree(storm_dir)
+
+    data = data.copy()
+    text_columns = data.select_dtypes(include="object").columns
+    data[text_columns] = data[text_columns].astype("string")
+    wind_radii = data.WindIntensityForRadii.fillna(0).astype(int)
+    data = data.drop(columns=["WindIntensityForRadii"])
+
+    fls = []
+    for wr, wr_data in data.groupby(wind_radii, sort=True):
+        filename = get_atcf_store_path(deck=deck, storm=storm, wr=wr)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        wr_data.reset_index(drop=True).to_parquet(filename, index=False)
+        fls.append(filename)
+
+    return fls
+
+
+def read_atcf_store(
+    storm: str, deck: str, wr: int = None, columns: List[str] = None
+) -> pd.DataFrame:
+    """
+    Reads a storm from the store.
+
+    Arguments:
+    - storm: storm name (e.g., al_2023-05)
+    - deck: adecks or bdecks
+    - wr: wind radii threshold (kt); None reads all partitions
+    - columns: subset of columns to read
+
+    Returns:
+    - pd.DataFrame, or None if the storm/partition is not in the store
+    """
+    if wr is not None:
+        filename = get_atcf_store_path(deck=deck, storm=storm, wr=wr)
+        if not os.path.isfile(filename):
+            return None
+        return pd.read_parquet(filename, columns=columns)
+
+    storm_dir = get_atcf_store_path(deck=deck, storm=storm)
+    if not os.path.isdir(storm_dir):
+        return None
+    if columns is not None:
+        columns = [col for col in columns if col != "WindIntensityForRadii"]
+        columns += ["wind_radii"]
+    df = pd.read_parquet(storm_dir, columns=columns)
+    df["wind_radii"] = df.wind_radii.astype(int)
+    df = df.rename(columns={"wind_radii": "WindIntensityForRadii"})
+    if "Date" in df.columns:
+        df = df.sort_values(by="Date", kind="stable").reset_index(drop=True)
+
+    return df
+
+
+def read_atcf_store_all(
+    deck: str, wr: int, columns: List[str] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Reads one wind radii partition for every storm in the store in a single pass.
+
+    Arguments:
+    - deck: adecks or bdecks
+    - wr: wind radii threshold (kt)
+    - columns: subset of columns to read
+
+    Returns:
+    - dictionary of storm name: pd.DataFrame
+    """
+    deck_dir = f"{atcf_store_datadir}{deck}"
+    if len(get_atcf_store_storms(deck=deck)) == 0:
+        return {}
+    if columns is not None:
+        columns = columns + ["storm"]
+
+    df = pd.read_parquet(deck_dir, columns=columns, filters=[("wind_radii", "=", wr)])
+    df["storm"] = df.storm.astype(str)
+    partition_columns = [col for col in ["year", "wind_radii"] if col in df.columns]
+    df = df.drop(columns=partition_columns)
+    data = {
+        storm: storm_df.drop(columns=["storm"]).reset_index(drop=True)
+        for storm, storm_df in df.groupby("storm", sort=True)
+    }
+
+    return data
+
+
+def get_wind_radii_cache_path(storm: str, wr: int, n_samples: int) -> str:
+    """
+    Builds the path of the cached best track geometries of a storm. The key
+    includes the size and modification time of the source partition and the
+    geometry parameters, so a rewritten storm or new sampling settings never
+    match an old cache file.
+
+    Arguments:
+    - storm: storm name (e.g., al_2023-05)
+    - wr: wind radii threshold (kt)
+    - n_samples: number of samples of the full wind radii circle
+
+    Returns:
+    - string, or None if the storm/partition is not in the store
+    """
+    source = get_atcf_store_path(deck="bdecks", storm=storm, wr=wr)
+    if not os.path.isfile(source):
+        return None
+
+    source_stat = os.stat(source)
+    key = json.dumps(
+        {
+            "size": source_stat.st_size,
+            "mtime": source_stat.st_mtime,
+            "n_samples": n_samples,
+            "version": wind_radii_geometry_version,
+        },
+        sort_keys=True,
+    )
+    key_hash = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+    return f"{atcf_geometry_cache_datadir}{storm}_{int(wr)}kt_{key_hash}.parquet"
+
+
+def read_wind_radii_cache(storm: str, wr: int, n_samples: int) -> pd.DataFrame:
+    """
+    Reads the cached Center points and WindRadii polygons of a storm.
+
+    Arguments:
+    - storm: storm name (e.g., al_2023-05)
+    - wr: wind radii threshold (kt)
+    - n_samples: number of samples of the full wind radii circle
+
+    Returns:
+    - pd.DataFrame with Center and WindRadii columns, or None if not cached
+    """
+    filename = get_wind_radii_cache_path(storm=storm, wr=wr, n_samples=n_samples)
+    if (filename is None) or (not os.path.isfile(filename)):
+        return None
+
+    df = pd.read_parquet(filename)
+    df["Center"] = shapely.from_wkb(df.Center.to_numpy())
+    df["WindRadii"] = shapely.from_wkb(df.WindRadii.to_numpy())
+
+    return df
+
+
+def write_wind_radii_cache(
+    storm: str, wr: int, n_samples: int, data: pd.DataFrame
+) -> str:
+    """
+    Writes the Center points and WindRadii polygons of a storm (as WKB) to the
+    geometry cache and removes older cache files of the same storm and radius.
+
+    Arguments:
+    - storm: storm name (e.g., al_2023-05)
+    - wr: wind radii threshold (kt)
+    - n_samples: number of samples of the full wind radii circle
+    - data: pd.DataFrame with Center and WindRadii columns
+
+    Returns:
+    - string
+    """
+    filename = get_wind_radii_cache_path(storm=storm, wr=wr, n_samples=n_samples)
+    if filename is None:
+        return None
+    os.makedirs(atcf_geometry_cache_datadir, exist_ok=True)
+
+    prefix = f"{storm}_{int(wr)}kt_"
+    for fl in os.listdir(atcf_geometry_cache_datadir):
+        if fl.startswith(prefix):
+            os.remove(f"{atcf_geometry_cache_datadir}{fl}")
+
+    df = pd.DataFrame(
+        {
+            "Center": shapely.to_wkb(data.Center.to_numpy()),
+            "WindRadii": shapely.to_wkb(data.WindRadii.to_numpy()),
+        }
+    )
+    df.to_parquet(filename, index=False)
+
+    return filename
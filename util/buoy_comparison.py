@@ -0,0 +1,175 @@
+import numpy as np
+import pandas as pd
+
+from alignment import align_time_series
+from metpy.calc import relative_humidity_from_dewpoint
+from metpy.units import units
+from plotting import plot_saildrone_buoy_comparison
+from projection import great_circle_distance
+from typing import Dict, List, Tuple
+
+# settings used by compare_buoy_saildrone_pair (the figure cache key of a
+# comparison hashes only these)
+buoy_comparison_config_keys = [
+    "comparison_buoy",
+    "comparison_saildrone",
+    "comparison_start_time",
+    "comparison_end_time",
+    "comparison_alignment_tolerance_minutes",
+    "comparison_alignment_cadence_minutes",
+    "comparison_alignment_method",
+]
+# buoy columns without a saildrone counterpart
+buoy_comparison_drop_columns = [
+    "dewpoint_temperature",
+    "wind_gust",
+    "average_wave_period",
+    "dwpd_direction",
+    "visibility",
+    "pressure_tendency",
+    "tide_level",
+]
+
+
+def prepare_buoy_comparison_data(buoy_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adds the relative humidity (from air and dewpoint temperature) to buoy
+    observations and keeps the variables also measured by the saildrones.
+
+    Arguments:
+    - buoy_data: output of read_ndbc_buoy_format
+
+    Returns:
+    - pd.DataFrame
+    """
+    buoy_data = buoy_data.copy()
+    buoy_data["relative_humidity"] = (
+        relative_humidity_from_dewpoint(
+            units.Quantity(buoy_data.air_temperature.to_numpy(), units.degC),
+            units.Quantity(buoy_data.dewpoint_temperature.to_numpy(), units.degC),
+        )
+        .to("percent")
+        .magnitude
+    )
+
+    return buoy_data.drop(columns=buoy_comparison_drop_columns)
+
+
+def align_buoy_saildrone(
+    buoy_data: pd.DataFrame, sd_data: pd.DataFrame, buoy_position: Dict, config: Dict
+) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Matches each buoy observation to the nearest saildrone observation (with
+    the alignment settings in the config) and adds the saildrone distance to
+    the buoy.
+
+    Arguments:
+    - buoy_data: output of prepare_buoy_comparison_data
+    - sd_data: saildrone observations (read_saildrone_format names)
+    - buoy_position: dictionary with lon and lat
+    - config: dictionary
+
+    Returns:
+    - aligned pd.DataFrame (_buoy and _sd columns), dictionary of match statistics
+    """
+    sd_data = sd_data.drop(columns=["sea_surface_salinity", "sd"], errors="ignore")
+    cadence = config["comparison_alignment_cadence_minutes"]
+    data, stats = align_time_series(
+        left=buoy_data,
+        right=sd_data,
+        tolerance=f"{config['comparison_alignment_tolerance_minutes']}min",
+        cadence=f"{cadence}min" if cadence > 0 else None,
+        method=config["comparison_alignment_method"],
+        suffixes=("_buoy", "_sd"),
+    )
+    data["distance"] = great_circle_distance(
+        data.longitude.to_numpy(),
+        data.latitude.to_numpy(),
+        buoy_position["lon"],
+        buoy_position["lat"],
+    )
+
+    return data, stats
+
+
+def find_buoy_saildrone_encounters(
+    sd_data: Dict[str, pd.DataFrame],
+    buoy_positions: Dict[str, Dict],
+    max_distance: float,
+    max_gap_hours: float = 24,
+) -> List[Dict]:
+    """
+    Finds the times saildrones came within a distance of buoys. Close
+    approaches of the same pair more than max_gap_hours apart are separate
+    encounters, so a saildrone that returns to a buoy weeks later is not
+    compared over the whole time in between.
+
+    Arguments:
+    - sd_data: dictionary of saildrone number: observations with date,
+      longitude and latitude
+    - buoy_positions: dictionary of buoy number: dictionary with lon and lat
+    - max_distance: distance threshold (km)
+    - max_gap_hours: largest time between close observations of one encounter
+
+    Returns:
+    - list of dictionaries with the buoy, saildrone, first and last time within
+      the distance and the closest distance, sorted by buoy, saildrone and time
+    """
+    encounters = []
+    for buoy in sorted(buoy_positions):
+        for sd in sorted(sd_data):
+            distance = great_circle_distance(
+                sd_data[sd].longitude.to_numpy(),
+                sd_data[sd].latitude.to_numpy(),
+                buoy_positions[buoy]["lon"],
+                buoy_positions[buoy]["lat"],
+            )
+            close = distance <= max_distance
+            if not np.any(close):
+                continue
+            close_data = pd.DataFrame(
+                {"date": sd_data[sd].date[close], "distance": distance[close]}
+            ).sort_values(by="date", kind="stable")
+            gaps = close_data.date.diff() > pd.Timedelta(hours=max_gap_hours)
+            for _, encounter in close_data.groupby(gaps.cumsum()):
+                encounters.append(
+                    {
+                        "buoy": buoy,
+                        "sd": sd,
+                        "start": encounter.date.min(),
+                        "end": encounter.date.max(),
+                        "min_distance": float(encounter.distance.min()),
+                    }
+                )
+
+    return encounters
+
+
+def compare_buoy_saildrone_pair(
+    buoy_data: pd.DataFrame,
+    sd_data: pd.DataFrame,
+    buoy_position: Dict,
+    config: Dict,
+    filename: str,
+) -> Dict:
+    """
+    Aligns one buoy and one saildrone and plots their comparison (the buoy,
+    saildrone and time window are taken from the comparison settings in the
+    config).
+
+    Arguments:
+    - buoy_data: output of prepare_buoy_comparison_data
+    - sd_data: saildrone observations (read_saildrone_format names)
+    - buoy_position: dictionary with lon and lat
+    - config: dictionary
+    - filename: figure file
+
+    Returns:
+    - dictionary of match statistics
+    """
+    data, stats = align_buoy_saildrone(
+        buoy_data=buoy_data, sd_data=sd_data, buoy_position=buoy_position, config=config
+    )
+    plot_saildrone_buoy_comparison(data=data, config=config, filename=filename)
+
+    return stats
@@ -1,10 +1,13 @@
 import numpy as np
 import pandas as pd
 import pytz
+import shapely
 import shapely.geometry as shp
 
-from cartopy.geodesic import Geodesic
 from datetime import datetime
+from pyproj import Geod
+
+geod = Geod(ellps="WGS84")
 
 
 def get_aircraft_recon_position(value: str):
@@ -51,60 +54,100 @@ def convert_time_to_utc(
     return utc_time
 
 
+def convert_wind_radii_to_polygons(
+    lon: np.ndarray,
+    lat: np.ndarray,
+    radii: np.ndarray,
+    n_samples: int = 1000,
+    chunk_size: int = 2000,
+) -> np.ndarray:
+    """
+    Converts the four quadrant wind radii of many centers into polygons.
+    Each quadrant is an arc of the geodesic circle with that quadrant's radius
+    (sampled like a n_samples point circle); quadrants without wind radii
+    collapse to the center point.
+
+    Arguments:
+    - lon: center longitudes
+    - lat: center latitudes
+    - radii: (n, 4) array of NE, SE, SW, NW radii (nautical miles)
+    - n_samples: number of samples of the full circle
+    - chunk_size: number of centers computed at once
+
+    Returns:
+    - np.ndarray of shapely Polygons
+    """
+    lon = np.asarray(lon, dtype=float)
+    lat = np.asarray(lat, dtype=float)
+    radii = np.asarray(radii, dtype=float).reshape(-1, 4)
+
+    # polygon goes NW, SW, SE, NE with decreasing azimuth, as in Geodesic.circle
+    azimuths = np.linspace(360.0, 0.0, n_samples, endpoint=True)
+    n_quarter = n_samples // 4
+    quadrants = [
+        (3, azimuths[: n_quarter + 1]),
+        (2, azimuths[n_quarter : 2 * n_quarter + 1]),
+        (1, azimuths[2 * n_quarter : 3 * n_quarter + 1]),
+        (0, azimuths[3 * n_quarter :]),
+    ]
+
+    polygons = []
+    for start in range(0, len(lon), chunk_size):
+        chunk_lon = lon[start : start + chunk_size]
+        chunk_lat = lat[start : start + chunk_size]
+        chunk_radii = radii[start : start + chunk_size]
+        coords = []
+        keep = []
+        for quadrant, quadrant_azimuths in quadrants:
+            has_radius = chunk_radii[:, quadrant] > 0
+            arc = np.empty((len(chunk_lon), len(quadrant_azimuths), 2))
+            arc[:, :, 0] = chunk_lon[:, None]
+            arc[:, :, 1] = chunk_lat[:, None]
+            if has_radius.any():
+                shape = (has_radius.sum(), len(quadrant_azimuths))
+                arc_lon, arc_lat, _ = geod.fwd(
+                    np.broadcast_to(chunk_lon[has_radius, None], shape).ravel(),
+                    np.broadcast_to(chunk_lat[has_radius, None], shape).ravel(),
+                    np.broadcast_to(quadrant_azimuths, shape).ravel(),
+                    np.broadcast_to(
+                        chunk_radii[has_radius, quadrant, None] * 1852.0, shape
+                    ).ravel(),
+                )
+                arc[has_radius, :, 0] = arc_lon.reshape(shape)
+                arc[has_radius, :, 1] = arc_lat.reshape(shape)
+            quadrant_keep = np.zeros(arc.shape[:2], dtype=bool)
+            quadrant_keep[:, 0] = True
+            quadrant_keep[has_radius, :] = True
+            coords.append(arc)
+            keep.append(quadrant_keep)
+
+        coords = np.concatenate(coords, axis=1)
+        keep = np.concatenate(keep, axis=1)
+        rings = shapely.linearrings(
+            coords[keep],
+            indices=np.repeat(np.arange(len(chunk_lon)), keep.sum(axis=1)),
+        )
+        polygons.append(shapely.polygons(rings))
+
+    if len(polygons) == 0:
+        return np.array([], dtype=object)
+
+    return np.concatenate(polygons)
+
+
 def convert_wind_radii_to_polygon(forecast=pd.DataFrame) -> shp.Polygon:
-    geod = Geodesic()
-    if forecast.WSPRadius1 > 0:
-        cp_ne = np.asarray(
-            geod.circle(
-                lon=forecast.Center.x,
-                lat=forecast.Center.y,
-                radius=forecast.WSPRadius1 * 1852.0,
-                endpoint=True,
-                n_samples=1000,
-            )
-        )[750:]
-    else:
-        cp_ne = np.array([forecast.Center.x, forecast.Center.y])
-    if forecast.WSPRadius2 > 0:
-        cp_se = np.asarray(
-            geod.circle(
-                lon=forecast.Center.x,
-                lat=forecast.Center.y,
-                radius=forecast.WSPRadius2 * 1852.0,
-                endpoint=True,
-                n_samples=1000,
-            )
-        )[500:751]
-    else:
-        cp_se = np.array([forecast.Center.x, forecast.Center.y])
-    if forecast.WSPRadius3 > 0:
-        cp_sw = np.asarray(
-            geod.circle(
-                lon=forecast.Center.x,
-                lat=forecast.Center.y,
-                radius=forecast.WSPRadius3 * 1852.0,
-                endpoint=True,
-                n_samples=1000,
-            )
-        )[250:501]
-    else:
-        cp_sw = np.array([forecast.Center.x, forecast.Center.y])
-    if forecast.WSPRadius4 > 0:
-        cp_nw = np.asarray(
-            geod.circle(
-                lon=forecast.Center.x,
-                lat=forecast.Center.y,
-                radius=forecast.WSPRadius4 * 1852.0,
-                endpoint=True,
-                n_samples=1000,
-            )
-        )[:251]
-    else:
-        cp_nw = np.array([forecast.Center.x, forecast.Center.y])
-
-    all_pts = np.vstack((cp_nw, cp_sw, cp_se, cp_ne))
-
-    return shp.Polygon(all_pts)
+    return convert_wind_radii_to_polygons(
+        lon=[forecast.Center.x],
+        lat=[forecast.Center.y],
+        radii=[
+            [
+                forecast.WSPRadius1,
+                forecast.WSPRadius2,
+                forecast.WSPRadius3,
+                forecast.WSPRadius4,
+            ]
+        ],
+    )[0]
 
 
 def get_centroid_coordinates(shapefile_point):
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+
+from typing import Dict, List
+
+
+def get_file_hash(filename: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Computes the sha256 hash of a file.
+
+    Arguments:
+    - filename: string
+    - chunk_size: number of bytes read at a time
+
+    Returns:
+    - string
+    """
+    file_hash = hashlib.sha256()
+    with open(filename, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            file_hash.update(chunk)
+
+    return file_hash.hexdigest()
+
+
+def get_file_signature(filename: str, file_hash: bool = True) -> Dict:
+    """
+    Collects the size, modification time and (optionally) hash of a file.
+
+    Arguments:
+    - filename: string
+    - file_hash: whether to compute the sha256 hash
+
+    Returns:
+    - dictionary
+    """
+    stat = os.stat(filename)
+    signature = {"size": stat.st_size, "mtime": stat.st_mtime}
+    if file_hash:
+        signature["sha256"] = get_file_hash(filename=filename)
+
+    return signature
+
+
+def read_manifest(filename: str) -> Dict:
+    """
+    Reads a processing manifest; returns an empty one if it does not exist.
+
+    Arguments:
+    - filename: string
+
+    Returns:
+    - dictionary of input name: manifest entry
+    """
+    if not os.path.isfile(filename):
+        return {}
+
+    with open(filename, "r") as file:
+        manifest = json.load(file)
+
+    return manifest
+
+
+def write_manifest(manifest: Dict, filename: str) -> None:
+    """
+    Writes a processing manifest (through a temporary file, so an interrupted
+    run never leaves a truncated manifest behind).
+
+    Arguments:
+    - manifest: dictionary
+    - filename: string
+    """
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "w") as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+    os.replace(tmp_filename, filename)
+
+    return None
+
+
+def output_is_unchanged(signature: Dict, filename: str) -> bool:
+    """
+    Checks that a derived output still exists and matches its recorded size
+    and modification time.
+
+    Arguments:
+    - signature: recorded signature of the output
+    - filename: string
+
+    Returns:
+    - bool
+    """
+    if not os.path.isfile(filename):
+        return False
+    current = get_file_signature(filename=filename, file_hash=False)
+
+    return (current["size"] == signature["size"]) and (
+        current["mtime"] == signature["mtime"]
+    )
+
+
+def is_up_to_date(manifest: Dict, filename: str, key: str = None) -> bool:
+    """
+    Checks whether an input file has already been processed: its content
+    matches the manifest and all of its recorded outputs are still in place.
+
+    Arguments:
+    - manifest: dictionary
+    - filename: path to the input file
+    - key: manifest key; defaults to the file name
+
+    Returns:
+    - bool
+    """
+    if key is None:
+        key = os.path.basename(filename)
+    entry = manifest.get(key)
+    if entry is None:
+        return False
+
+    signature = get_file_signature(filename=filename, file_hash=False)
+    if signature["size"] != entry["input"]["size"]:
+        return False
+    if (signature["mtime"] != entry["input"]["mtime"]) and (
+        get_file_hash(filename=filename) != entry["input"]["sha256"]
+    ):
+        return False
+
+    return all(
+        output_is_unchanged(signature=entry["outputs"][fl], filename=fl)
+        for fl in entry["outputs"]
+    )
+
+
+def update_manifest(
+    manifest: Dict, filename: str, outputs: List[str], key: str = None, **extra
+) -> Dict:
+    """
+    Records an input file and the outputs derived from it.
+
+    Arguments:
+    - manifest: dictionary
+    - filename: path to the input file
+    - outputs: paths to the derived outputs
+    - key: manifest key; defaults to the file name
+    - extra: additional values stored with the entry
+
+    Returns:
+    - dictionary
+    """
+    if key is None:
+        key = os.path.basename(filename)
+
+    manifest[key] = {
+        "input": get_file_signature(filename=filename),
+        "outputs": {fl: get_file_signature(filename=fl) for fl in outputs},
+        **extra,
+    }
+
+    return manifest
@@ -1,13 +1,21 @@
+import glob
+import hashlib
 import os
 import pytz
 import re
+import shutil
 import subprocess
 
 from datetime import datetime
+from manifest import get_file_hash, read_manifest, write_manifest
 from paths import repo_path
+from PIL import Image
+from rendering import render_figures
 
 from conversions import convert_time_to_utc
 
+latex_build_manifest = "build_manifest.json"
+
 
 class LatexFile:
     text = []
@@ -193,22 +201,91 @@ def clean_up_outlook_data(time: datetime, data_dir: str):
     os.rmdir(datadir_current)
 
 
-def compile_latex_file(filename: str, save_dir: str, remove_tex: bool = True):
-    compile_pdf = [
-        "pdflatex",
-        "--shell-escape",
-        "--file-line-error",
-        f"-output-directory={save_dir}",
-        f"{save_dir}/{filename}",
-    ]
-    subprocess.check_call(compile_pdf, stdout=subprocess.DEVNULL)
-    subprocess.check_call(compile_pdf, stdout=subprocess.DEVNULL)
+def get_latex_build_key(filename: str, save_dir: str) -> str:
+    """
+    Builds the cache key of a LaTeX document: its source (without the time the
+    saildrone positions were read at) and the content hashes of every figure
+    and animation frame it includes.
+
+    Arguments:
+    - filename: tex file name
+    - save_dir: directory of the tex file
+
+    Returns:
+    - string
+    """
+    with open(f"{save_dir}/{filename}", "r") as file:
+        text = file.read()
+    text = re.sub(r"SD positions at .*? UTC", "SD positions", text)
+
+    figures = re.findall(r"\\includegraphics\[[^\]]*\]\{([^}]*)\}", text)
+    for prefix, first, last in re.findall(
+        r"\\animategraphics\[[^\]]*\]\{[^}]*\}\{([^}]*)\}\{(\d+)\}\{(\d+)\}", text
+    ):
+        for frame in range(int(first), int(last) + 1):
+            figures += sorted(glob.glob(f"{prefix}{frame:0{len(first)}d}.*"))
+
+    build_key = hashlib.sha256(text.encode("utf-8"))
+    for figure in figures:
+        figure_hash = get_file_hash(figure) if os.path.isfile(figure) else "missing"
+        build_key.update(f"{figure}:{figure_hash}".encode("utf-8"))
+
+    return build_key.hexdigest()
+
+
+def compile_latex_file(
+    filename: str, save_dir: str, remove_tex: bool = True, use_cache: bool = True
+) -> bool:
+    """
+    Compiles a LaTeX document with pdflatex, unless the same source and figures
+    were already compiled to a pdf that still exists. A second pdflatex pass is
+    only run when the first one asks for it.
+
+    Arguments:
+    - filename: tex file name
+    - save_dir: directory of the tex file and the pdf
+    - remove_tex: remove all files but the pdf (and the build manifest) afterwards
+    - use_cache: skip unchanged documents
+
+    Returns:
+    - bool: whether the document was compiled
+    """
+    pdf_filename = f"{filename[:-4]}.pdf"
+    manifest_filename = f"{save_dir}/{latex_build_manifest}"
+    manifest = read_manifest(filename=manifest_filename)
+    build_key = get_latex_build_key(filename=filename, save_dir=save_dir)
+    compiled = not (
+        use_cache
+        and (manifest.get(pdf_filename, {}).get("key") == build_key)
+        and os.path.isfile(f"{save_dir}/{pdf_filename}")
+    )
+
+    if compiled:
+        compile_pdf = [
+            "pdflatex",
+            "--shell-escape",
+            "--file-line-error",
+            f"-output-directory={save_dir}",
+            f"{save_dir}/{filename}",
+        ]
+        subprocess.check_call(compile_pdf, stdout=subprocess.DEVNULL)
+        with open(f"{save_dir}/{filename[:-4]}.log", "r", errors="ignore") as file:
+            rerun = "Rerun" in file.read()
+        if rerun:
+            subprocess.check_call(compile_pdf, stdout=subprocess.DEVNULL)
+
+        manifest[pdf_filename] = {"key": build_key}
+        write_manifest(manifest=manifest, filename=manifest_filename)
+    else:
+        print(f"     {pdf_filename} is up to date.")
 
     fls = os.listdir(save_dir)
     if remove_tex:
-        fls = [fl for fl in fls if ".pdf" not in fl]
+        fls = [fl for fl in fls if (".pdf" not in fl) and (fl != latex_build_manifest)]
         _ = [os.remove(f"{save_dir}/{fl}") for fl in fls]
 
+    return compiled
+
 
 def modify_latex_command(line: list[str], insert: list[str]) -> list[str]:
     line_text = line[0].split("{}")
@@ -230,111 +307,149 @@ def create_figure_packet_outlook(fig_dir: str, summary_dir: str, config: dict) -
     fls = sorted(os.listdir(fig_dir))
 
     for fl in fls:
-        _ = subprocess.check_call(["cp", f"{fig_dir}/{fl}", f"{summary_dir}/{fl}"])
+        shutil.copy(f"{fig_dir}/{fl}", f"{summary_dir}/{fl}")
 
     fls = [
         fl
         for fl in fls
         if (fl != "outlook_areas.png") and ("outlook_areas_with" not in fl)
     ]
-    outlook_fls = [fl for fl in fls if "outlook" in fl]
+    outlook_fls = [fl for fl in fls if ("outlook" in fl) and (fl.endswith(".png"))]
     storm_fls = [fl for fl in fls if "storm" in fl]
 
     figure_dims = [
         check_figure_dimensions(filename=fl, fig_dir=summary_dir) for fl in outlook_fls
     ]
     unique_dims = list(set(figure_dims))
-    if len(unique_dims) > 0:
-        max_xdim = max([ud[0] for ud in unique_dims])
-        max_ydim = max([ud[1] for ud in unique_dims])
-        if len(unique_dims) > 1:
-            _ = [
-                match_max_image_dimensions(
-                    filename=fl, fig_dir=summary_dir, xdim=max_xdim, ydim=max_ydim
-                )
-                for fl in outlook_fls
-            ]
-
-    # add colorbar
-    _ = [
-        append_colorbar_to_image(
-            filename=fl,
-            fig_dir=summary_dir,
-            colorbar=f"{repo_path}{os.sep}{config['summary_figure_colorbar']}",
+    dims = None
+    if len(unique_dims) > 1:
+        dims = (
+            max([ud[0] for ud in unique_dims]),
+            max([ud[1] for ud in unique_dims]),
+        )
+
+    # match dimensions and add colorbar (in parallel, one job per image)
+    colorbar = f"{repo_path}{os.sep}{config['summary_figure_colorbar']}"
+    jobs = [
+        (
+            prepare_outlook_image,
+            dict(filename=fl, fig_dir=summary_dir, colorbar=colorbar, dims=dims),
         )
         for fl in outlook_fls
     ]
+    render_figures(jobs=jobs, workers=config["image_processing_workers"])
 
-    # create animation
+    # create animation from the frames with the colorbar (when there are no
+    # frames, the animation written directly when plotting is kept)
     fl_areas = [fl for fl in fls if len(fl) == 28]
-    for _, area in enumerate(fl_areas):
-        area_base = area[:-4]
-        try:
-            _ = subprocess.check_call(
-                [
-                    "convert",
-                    "-delay",
-                    "50",
-                    "-loop",
-                    "0",
-                    f"{summary_dir}/{area_base}_day*",
-                    f"{summary_dir}/{area_base}_anim.gif",
-                ]
-            )
-        except:
-            pass
+    jobs = [
+        (create_outlook_animation, dict(area_base=area[:-4], fig_dir=summary_dir))
+        for area in fl_areas
+    ]
+    render_figures(jobs=jobs, workers=config["image_processing_workers"])
 
 
-def append_colorbar_to_image(filename: str, fig_dir: str, colorbar: str) -> None:
-    tmp_filename = f"{filename.split('.')[0]}_tmp.png"
+def pad_image(image: Image.Image, xdim: int, ydim: int) -> Image.Image:
+    """
+    Shrinks an image to fit (xdim, ydim) if it is larger, and pads it with
+    white to exactly (xdim, ydim), keeping it on the left and centered
+    vertically.
 
-    subprocess.check_call(
-        [
-            "convert",
-            "+append",
-            f"{fig_dir}/{filename}",
-            colorbar,
-            f"{fig_dir}/{tmp_filename}",
-        ]
+    Arguments:
+    - image: PIL image
+    - xdim: target width (pixels)
+    - ydim: target height (pixels)
+
+    Returns:
+    - PIL image
+    """
+    if image.size == (xdim, ydim):
+        return image
+
+    image.thumbnail((xdim, ydim))
+    padded = Image.new(image.mode, (xdim, ydim), "white")
+    padded.paste(image, (0, (ydim - image.height) // 2))
+
+    return padded
+
+
+def append_image(image: Image.Image, other: Image.Image) -> Image.Image:
+    """
+    Appends an image to the right of another one (top aligned, padded with white).
+
+    Arguments:
+    - image: PIL image
+    - other: PIL image to append
+
+    Returns:
+    - PIL image
+    """
+    other = other.convert(image.mode)
+    appended = Image.new(
+        image.mode,
+        (image.width + other.width, max(image.height, other.height)),
+        "white",
     )
+    appended.paste(image, (0, 0))
+    appended.paste(other, (image.width, 0))
 
-    os.rename(f"{fig_dir}/{tmp_filename}", f"{fig_dir}/{filename}")
-    return None
+    return appended
 
 
-def match_max_image_dimensions(
-    filename: str, fig_dir: str, xdim: int, ydim: int
+def prepare_outlook_image(
+    filename: str, fig_dir: str, colorbar: str, dims: tuple = None
 ) -> None:
-    tmp_filename = f"{filename.split('.')[0]}_tmp.png"
-
-    subprocess.check_call(
-        [
-            "magick",
-            "-define",
-            f"png:size={xdim}x{ydim}",
-            f"{fig_dir}/{filename}",
-            "-thumbnail",
-            f"{xdim}x{ydim}>",
-            "-background",
-            "white",
-            "-gravity",
-            "west",
-            "-extent",
-            f"{xdim}x{ydim}",
-            f"{fig_dir}/{tmp_filename}",
-        ]
-    )
+    """
+    Pads an outlook figure to common dimensions (optional) and appends the
+    colorbar, reading and writing the file only once.
+
+    Arguments:
+    - filename: figure file name
+    - fig_dir: figure directory
+    - colorbar: path to the colorbar image
+    - dims: common (width, height) of all outlook figures
+    """
+    with Image.open(f"{fig_dir}/{filename}") as image:
+        image.load()
+    if dims is not None:
+        image = pad_image(image=image, xdim=dims[0], ydim=dims[1])
+    with Image.open(colorbar) as colorbar_image:
+        image = append_image(image=image, other=colorbar_image)
+    image.save(f"{fig_dir}/{filename}")
+
+    return None
+
 
-    os.rename(f"{fig_dir}/{tmp_filename}", f"{fig_dir}/{filename}")
+def create_outlook_animation(area_base: str, fig_dir: str) -> None:
+    """
+    Writes the per-day figures of an outlook area as an animated GIF.
+
+    Arguments:
+    - area_base: figure name of the area without extension
+    - fig_dir: figure directory
+    """
+    fls = sorted(glob.glob(f"{fig_dir}/{area_base}_day*"))
+    if len(fls) == 0:
+        return None
+
+    frames = []
+    for fl in fls:
+        with Image.open(fl) as frame:
+            frames.append(frame.convert("RGB"))
+    frames[0].save(
+        f"{fig_dir}/{area_base}_anim.gif",
+        save_all=True,
+        append_images=frames[1:],
+        duration=500,
+        loop=0,
+    )
 
     return None
 
 
 def check_figure_dimensions(filename: str, fig_dir: str) -> tuple:
-    tmp = subprocess.check_output(["identify", f"{fig_dir}/{filename}"]).decode("utf-8")
-    tmp = tmp.rstrip().split(" ")
-    figsize = tmp[2].split("x")
-    figsize_x = int(figsize[0])
-    figsize_y = int(figsize[1])
+    # only reads the image header
+    with Image.open(f"{fig_dir}/{filename}") as image:
+        figsize_x, figsize_y = image.size
 
     return (figsize_x, figsize_y)
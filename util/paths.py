@@ -29,12 +29,16 @@ url_glider_unit1091 = (
 
 def repository_path() -> str:
     """
-    Retrieves the path to the git repository
+    Retrieves the path to the git repository (the checkout containing this
+    file when working outside a directory named after the repository, e.g.,
+    when running the tests)
 
     Returns:
     - string
     """
     dir = os.getcwd().split(os.sep)
+    if repo_name not in dir:
+        return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     repo_idx = dir.index(repo_name) + 1
     repo_path = f"{os.sep}".join(dir[:repo_idx])
 
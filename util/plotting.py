@@ -1,15 +1,18 @@
 import geopandas as gpd
+import matplotlib.animation as animation
 import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
 import numpy as np
 import os
 import pandas as pd
+import xarray as xr
 
 from conversions import get_centroid_coordinates
 from datetime import datetime, timedelta
 from matplotlib import rc
 from matplotlib.colors import ListedColormap
 from matplotlib.gridspec import GridSpec
+from matplotlib.lines import Line2D
 from projection import proj, set_cartopy_projection_atlantic
 from typing import List
 
@@ -62,7 +65,7 @@ def plot_aircraft_recon_mission_with_saildrones(
     drop_data: pd.DataFrame,
     storm: str,
     fig_dir: str,
-    aircraft: str
+    aircraft: str,
 ):
     hour_times = recon_data[
         (recon_data.time.dt.minute == 0) & (recon_data.time.dt.second == 0)
@@ -349,40 +352,99 @@ def plot_system_track(
     plt.close("all")
 
 
-def plot_shapefile_btkstart(
+def get_btkstart_style(percentage: bool = False) -> dict:
+    if percentage:
+        cmap = plt.cm.tab20b(np.linspace(0, 1, 20))
+        return {
+            "label_title": "%",
+            "save_add": "perc_",
+            "vmin": 0,
+            "vmax": 20,
+            "cmap": ListedColormap(cmap),
+            "overlap_column": "percentage",
+            "title_add": "\n% of storms starting in area",
+        }
+    else:
+        cmap = plt.cm.turbo(np.linspace(0, 1, 10))
+        return {
+            "label_title": "#",
+            "save_add": "",
+            "vmin": 0,
+            "vmax": 10,
+            "cmap": ListedColormap(cmap),
+            "overlap_column": "count",
+            "title_add": "\n# of storms starting in area",
+        }
+
+
+def plot_btk_overlap(
+    ax: plt.Axes, wind_overlap: gpd.GeoDataFrame | xr.Dataset, style: dict
+) -> List:
+    """
+    Plots the best track overlap counts (polygons or a gridded field).
+
+    Arguments:
+    - ax: map axes
+    - wind_overlap: output of compute_btk_overlap
+    - style: output of get_btkstart_style
+
+    Returns:
+    - list of the plotted artists
+    """
+    children = ax.get_children()
+    legend_kwds = {
+        "pad": 0.015,
+        "shrink": 0.99,
+        "label": f"storm {style['label_title']}",
+    }
+    if isinstance(wind_overlap, xr.Dataset):
+        ax.pcolormesh(
+            wind_overlap.lon,
+            wind_overlap.lat,
+            np.ma.masked_equal(wind_overlap[style["overlap_column"]].values, 0),
+            alpha=0.8,
+            vmin=style["vmin"],
+            vmax=style["vmax"],
+            cmap=style["cmap"],
+            transform=proj,
+        )
+    elif len(wind_overlap) > 0:
+        wind_overlap.plot(
+            column=style["overlap_column"],
+            ax=ax,
+            legend=False,
+            alpha=0.8,
+            vmin=style["vmin"],
+            vmax=style["vmax"],
+            legend_kwds=legend_kwds,
+            cmap=style["cmap"],
+        )
+
+    return [artist for artist in ax.get_children() if artist not in children]
+
+
+def plot_shapefile_btkstart_base(
     shapefile_data: pd.DataFrame,
-    wind_overlap: dict,
-    n: int,
-    n_storms: int,
-    time: datetime,
-    savedir: str,
+    wind_overlap: gpd.GeoDataFrame | xr.Dataset,
+    style: dict,
     sd_data: dict = None,
-    percentage: bool = False,
-    title_save_add: str = "",
-) -> plt.figure:
+) -> tuple:
+    """
+    Draws a best track overlap map (without title).
+
+    Arguments:
+    - shapefile_data: outlook area
+    - wind_overlap: output of compute_btk_overlap
+    - style: output of get_btkstart_style
+    - sd_data: dictionary of saildrone positions
+
+    Returns:
+    - figure, map axes, and the artists of the overlap layer
+    """
     if not isinstance(shapefile_data, gpd.geodataframe.GeoDataFrame):
         shapefile_data = gpd.GeoDataFrame(shapefile_data).T
         shapefile_data = shapefile_data.set_geometry("geometry")
 
-    if percentage:
-        label_title = "%"
-        save_add = "perc_"
-        vmin = 0
-        vmax = 20
-        cmap = plt.cm.tab20b(np.linspace(0, 1, 20))
-        cmap = ListedColormap(cmap)
-        overlap_column = "percentage"
-        title_add = f"\n% of storms starting in area (n={n_storms})"
-    else:
-        label_title = "#"
-        save_add = ""
-        vmin = 0
-        vmax = 10
-        cmap = plt.cm.turbo(np.linspace(0, 1, 10))
-        cmap = ListedColormap(cmap)
-        overlap_column = "count"
-        title_add = f"\n# of storms starting in area (n={n_storms})"
-
     area_colors = find_outlook_area_color(shapefile_data=shapefile_data)
     shapefile_data["coords"] = shapefile_data["geometry"].apply(
         get_centroid_coordinates
@@ -415,18 +477,7 @@ def plot_shapefile_btkstart(
             fontsize=10,
         )
 
-    legend_kwds = {"pad": 0.015, "shrink": 0.99, "label": f"storm {label_title}"}
-    if len(wind_overlap) > 0:
-        wind_overlap.plot(
-            column=overlap_column,
-            ax=ax,
-            legend=False,
-            alpha=0.8,
-            vmin=vmin,
-            vmax=vmax,
-            legend_kwds=legend_kwds,
-            cmap=cmap,
-        )
+    overlap_artists = plot_btk_overlap(ax=ax, wind_overlap=wind_overlap, style=style)
 
     ax.plot([130, 140], [0, 1], c="yellow", alpha=0.5, lw=10, label="Low (<40%)")
     ax.plot([130, 140], [0, 1], c="orange", alpha=0.5, lw=10, label="Medium (40-60%)")
@@ -454,18 +505,101 @@ def plot_shapefile_btkstart(
 
     ax.legend(loc=1)
     set_cartopy_projection_atlantic(ax=ax, ylabel="bottom")
+
+    return fig, ax, overlap_artists
+
+
+def plot_shapefile_btkstart(
+    shapefile_data: pd.DataFrame,
+    wind_overlap: gpd.GeoDataFrame | xr.Dataset,
+    n: int,
+    n_storms: int,
+    savedir: str,
+    sd_data: dict = None,
+    percentage: bool = False,
+    title_save_add: str = "",
+) -> plt.figure:
+    style = get_btkstart_style(percentage=percentage)
+    _, ax, _ = plot_shapefile_btkstart_base(
+        shapefile_data=shapefile_data,
+        wind_overlap=wind_overlap,
+        style=style,
+        sd_data=sd_data,
+    )
     ax.set_title(
-        f"7-day outlook areas: {time.strftime('%Y-%m-%d %H:%M')} UTC{title_add} ({title_save_add[1:]})"
+        f"7-day outlook areas{style['title_add']} (n={n_storms}) ({title_save_add[1:]})"
     )
 
     plt.savefig(
-        f"{savedir}{os.sep}outlook_areas_btks_{save_add}area{n}{title_save_add}.png",
+        f"{savedir}{os.sep}outlook_areas_btks_{style['save_add']}area{n}{title_save_add}.png",
         dpi=200,
         bbox_inches="tight",
     )
     plt.close("all")
 
 
+def plot_shapefile_btkstart_animation(
+    shapefile_data: pd.DataFrame,
+    wind_overlap_days: dict,
+    n: int,
+    savedir: str,
+    sd_data: dict = None,
+    percentage: bool = False,
+    animation_format: str = "gif",
+    save_frames: bool = True,
+):
+    """
+    Animates the best track overlap of an outlook area one storm day at a time.
+    A single figure is drawn; only the overlap layer and the title change
+    between frames, which are streamed to the animation writer.
+
+    Arguments:
+    - shapefile_data: outlook area
+    - wind_overlap_days: output of compute_btk_overlap_by_day
+    - n: outlook area number
+    - savedir: figure directory
+    - sd_data: dictionary of saildrone positions
+    - percentage: plot percentages instead of counts
+    - animation_format: gif or mp4
+    - save_frames: also save every frame as a png (as plot_shapefile_btkstart);
+      the summary packet rebuilds its animation from these frames after the
+      colorbar is appended to them
+    """
+    style = get_btkstart_style(percentage=percentage)
+    days = sorted(wind_overlap_days)
+    filename = f"{savedir}{os.sep}outlook_areas_btks_{style['save_add']}area{n}"
+
+    if animation_format == "mp4":
+        writer = animation.FFMpegWriter(fps=2)
+    else:
+        writer = animation.PillowWriter(fps=2)
+
+    fig, ax, overlap_artists = plot_shapefile_btkstart_base(
+        shapefile_data=shapefile_data,
+        wind_overlap=wind_overlap_days[days[0]]["overlap"],
+        style=style,
+        sd_data=sd_data,
+    )
+    with writer.saving(fig, f"{filename}_anim.{animation_format}", dpi=200):
+        for day in days:
+            if day != days[0]:
+                for artist in overlap_artists:
+                    artist.remove()
+                overlap_artists = plot_btk_overlap(
+                    ax=ax, wind_overlap=wind_overlap_days[day]["overlap"], style=style
+                )
+            ax.set_title(
+                f"7-day outlook areas{style['title_add']} (n={wind_overlap_days[day]['n_storms']}) (day{day:02d})"
+            )
+
+            writer.grab_frame()
+            if save_frames:
+                fig.savefig(
+                    f"{filename}_day{day:02d}.png", dpi=200, bbox_inches="tight"
+                )
+    plt.close("all")
+
+
 def find_outlook_area_color(shapefile_data: gpd.GeoDataFrame) -> List:
     colors = []
     for n in range(len(shapefile_data)):
@@ -480,23 +614,31 @@ def find_outlook_area_color(shapefile_data: gpd.GeoDataFrame) -> List:
     return colors
 
 
-def plot_shapefile_with_btks_and_fcsts(
-    shapefile_data: gpd.GeoDataFrame,
-    btk_data: dict,
-    fcst_data: dict,
-    time: datetime,
-    savedir: str,
-    sd_data: dict = None,
-):
+# legend entries and layers of each outlook overview map
+outlook_overview_maps = {
+    "outlook_areas": {"layers": [], "legend": ["areas", "sd"]},
+    "outlook_areas_with_btks": {
+        "layers": ["btk"],
+        "legend": ["areas", "sd", "btk"],
+    },
+    "outlook_areas_with_fcsts": {
+        "layers": ["fcst", "fcst_labels"],
+        "legend": ["areas", "sd", "fcst"],
+    },
+    "outlook_areas_with_btks_and_fcsts": {
+        "layers": ["btk", "fcst"],
+        "legend": ["areas", "sd", "btk", "fcst"],
+    },
+}
+
+
+def plot_outlook_areas(ax: plt.Axes, shapefile_data: gpd.GeoDataFrame):
     area_colors = find_outlook_area_color(shapefile_data=shapefile_data)
 
     shapefile_data["coords"] = shapefile_data["geometry"].apply(
         get_centroid_coordinates
     )
 
-    fig = plt.figure(figsize=(12, 12))
-    ax = fig.add_subplot(111, projection=proj)
-
     if len(shapefile_data) > 0:
         shapefile_data.plot(ax=ax, color=area_colors, alpha=0.5, edgecolor="k")
         for _, row in shapefile_data.iterrows():
@@ -520,11 +662,24 @@ def plot_shapefile_with_btks_and_fcsts(
                 backgroundcolor=(1, 1, 1, 0.5),
             )
 
+
+def plot_btk_layer(ax: plt.Axes, btk_data: dict) -> List:
+    """
+    Plots the best tracks of current systems.
+
+    Arguments:
+    - ax: map axes
+    - btk_data: dictionary of best tracks
+
+    Returns:
+    - list of the plotted artists
+    """
+    artists = []
     for btk in btk_data:
-        ax.plot(
+        artists += ax.plot(
             btk_data[btk].Longitude, btk_data[btk].Latitude, c="k", lw=1, linestyle="--"
         )
-        ax.plot(
+        artists += ax.plot(
             btk_data[btk].Longitude.iloc[-1],
             btk_data[btk].Latitude.iloc[-1],
             "ok",
@@ -535,107 +690,34 @@ def plot_shapefile_with_btks_and_fcsts(
             name = f"{btk_data[btk].StormNumber.iloc[-1]}L"
         else:
             name = f"{btk_data[btk].StormType.iloc[-1]} " + name
-        ax.text(
-            btk_data[btk].Longitude.iloc[0],
-            btk_data[btk].Latitude.iloc[0],
-            name,
-            ha="left",
-            va="top",
-            bbox=dict(
-                facecolor="w", edgecolor="black", boxstyle="round,pad=.1", alpha=0.5
-            ),
-        )
-
-    for fcst in fcst_data:
-        tmp = fcst_data[fcst]
-        tmp = tmp[tmp.FcstCenter.isin(track_aids_to_use)]
-        prods = list(tmp.FcstCenter.unique())
-        if ("OFCI" in prods) and ("OFCL" in prods):
-            prods.pop(prods.index("OFCI"))
-        for prod in prods:
-            fcst_prod = tmp[(tmp.FcstCenter == prod) & (tmp.FcstHour >= 0)]
-            if prod in ["OFCI", "OFCL"]:
-                ax.plot(fcst_prod.Longitude, fcst_prod.Latitude, c="b", lw=2)
-            else:
-                ax.plot(fcst_prod.Longitude, fcst_prod.Latitude, c="b", lw=0.3)
-
-    if sd_data is not None:
-        for sd in sd_data:
-            ax.plot(
-                sd_data[sd]["lon"], sd_data[sd]["lat"], "om", markersize=2, zorder=10
-            )
-            ax.arrow(
-                sd_data[sd]["lon"],
-                sd_data[sd]["lat"],
-                np.cos(np.deg2rad(90 - sd_data[sd]["dir"])),
-                np.sin(np.deg2rad(90 - sd_data[sd]["dir"])),
-                length_includes_head=True,
-                head_width=0.5,
-                color="m",
-                head_length=0.5,
-                zorder=10,
+        artists.append(
+            ax.text(
+                btk_data[btk].Longitude.iloc[0],
+                btk_data[btk].Latitude.iloc[0],
+                name,
+                ha="left",
+                va="top",
+                bbox=dict(
+                    facecolor="w", edgecolor="black", boxstyle="round,pad=.1", alpha=0.5
+                ),
             )
+        )
 
-    ax.plot([130, 140], [0, 1], c="yellow", alpha=0.5, lw=10, label="Low (<40%)")
-    ax.plot([130, 140], [0, 1], c="orange", alpha=0.5, lw=10, label="Medium (40-60%)")
-    ax.plot([130, 140], [0, 1], c="red", alpha=0.5, lw=10, label="High (>60%)")
-    ax.plot(130, 0, "om", markersize=2, label="SD")
-    ax.plot([130, 130], [140, 140], c="k", lw=1, linestyle="--", label="Best Track")
-    ax.plot([130, 130], [140, 140], c="b", lw=0.3, label="Forecast")
-    ax.plot([130, 130], [140, 140], c="b", lw=2, label="OFCL Forecast")
-
-    ax.legend()
-    plot_saildrone_mission_domains(ax=ax)
-    set_cartopy_projection_atlantic(ax=ax, ylabel="bottom")
-    ax.set_title(f"7-day outlook areas: {time.strftime('%Y-%m-%d %H:%M')} UTC")
-
-    plt.savefig(
-        f"{savedir}{os.sep}outlook_areas_with_btks_and_fcsts.png",
-        dpi=200,
-        bbox_inches="tight",
-    )
-    plt.close("all")
-
-
-def plot_shapefile_with_fcsts(
-    shapefile_data: gpd.GeoDataFrame,
-    fcst_data: dict,
-    time: datetime,
-    savedir: str,
-    sd_data: dict = None,
-):
-    area_colors = find_outlook_area_color(shapefile_data=shapefile_data)
+    return artists
 
-    shapefile_data["coords"] = shapefile_data["geometry"].apply(
-        get_centroid_coordinates
-    )
 
-    fig = plt.figure(figsize=(12, 12))
-    ax = fig.add_subplot(111, projection=proj)
+def plot_fcst_layer(ax: plt.Axes, fcst_data: dict) -> dict:
+    """
+    Plots the latest track forecasts of current systems.
 
-    if len(shapefile_data) > 0:
-        shapefile_data.plot(ax=ax, color=area_colors, alpha=0.5, edgecolor="k")
-        for _, row in shapefile_data.iterrows():
-            ax.annotate(
-                text=row["AREA"],
-                xy=row["coords"],
-                ha="center",
-                va="center",
-                fontweight="bold",
-            )
-        for idx, row in shapefile_data.iterrows():
-            annotate_text = (
-                f"Area {row['AREA']}\n2 day: {row['PROB2DAY']}\n7 day: {row['PROB7DAY']}"
-            )
-            ax.annotate(
-                text=annotate_text,
-                xy=(-110 + idx * 20, 1.5),
-                ha="left",
-                va="top",
-                fontweight="semibold",
-                backgroundcolor=(1, 1, 1, 0.5),
-            )
+    Arguments:
+    - ax: map axes
+    - fcst_data: dictionary of forecasts
 
+    Returns:
+    - dictionary with the plotted forecast tracks (fcst) and their initial
+      positions and system names (fcst_labels)
+    """
     name = {}
     for fcst in fcst_data:
         tmp = fcst_data[fcst]
@@ -647,6 +729,7 @@ def plot_shapefile_with_fcsts(
             ntmp = f"{tmp .StormType.iloc[0]} " + ntmp
         name[fcst] = ntmp
 
+    artists = {"fcst": [], "fcst_labels": []}
     for fcst in fcst_data:
         tmp = fcst_data[fcst]
         tmp = tmp[tmp.FcstCenter.isin(track_aids_to_use)]
@@ -655,237 +738,228 @@ def plot_shapefile_with_fcsts(
             prods.pop(prods.index("OFCI"))
         for prod in prods:
             fcst_prod = tmp[(tmp.FcstCenter == prod) & (tmp.FcstHour >= 0)]
-            if prod in ["OFCI", "OFCL"]:
-                ax.plot(
-                    fcst_prod.Longitude.iloc[0],
-                    fcst_prod.Latitude.iloc[0],
-                    "ob",
-                    markersize=4,
-                )
-                ax.plot(fcst_prod.Longitude, fcst_prod.Latitude, c="b", lw=2)
-            elif prod == "CARQ":
-                ax.plot(
+            if prod in ["OFCI", "OFCL", "CARQ"]:
+                artists["fcst_labels"] += ax.plot(
                     fcst_prod.Longitude.iloc[0],
                     fcst_prod.Latitude.iloc[0],
                     "ob",
                     markersize=4,
                 )
-                ax.plot(fcst_prod.Longitude, fcst_prod.Latitude, c="b", lw=0.3)
-                ax.text(
-                    fcst_prod.Longitude.iloc[0],
-                    fcst_prod.Latitude.iloc[0],
-                    name[fcst],
-                    ha="left",
-                    va="top",
-                    bbox=dict(
-                        facecolor="w",
-                        edgecolor="black",
-                        boxstyle="round,pad=.1",
-                        alpha=0.5,
-                    ),
+            if prod in ["OFCI", "OFCL"]:
+                artists["fcst"] += ax.plot(
+                    fcst_prod.Longitude, fcst_prod.Latitude, c="b", lw=2
                 )
             else:
-                ax.plot(fcst_prod.Longitude, fcst_prod.Latitude, c="b", lw=0.3)
+                artists["fcst"] += ax.plot(
+                    fcst_prod.Longitude, fcst_prod.Latitude, c="b", lw=0.3
+                )
+            if prod == "CARQ":
+                artists["fcst_labels"].append(
+                    ax.text(
+                        fcst_prod.Longitude.iloc[0],
+                        fcst_prod.Latitude.iloc[0],
+                        name[fcst],
+                        ha="left",
+                        va="top",
+                        bbox=dict(
+                            facecolor="w",
+                            edgecolor="black",
+                            boxstyle="round,pad=.1",
+                            alpha=0.5,
+                        ),
+                    )
+                )
 
-    if sd_data is not None:
-        for sd in sd_data:
-            ax.plot(
-                sd_data[sd]["lon"], sd_data[sd]["lat"], "om", markersize=2, zorder=10
-            )
-            ax.arrow(
-                sd_data[sd]["lon"],
-                sd_data[sd]["lat"],
-                np.cos(np.deg2rad(90 - sd_data[sd]["dir"])),
-                np.sin(np.deg2rad(90 - sd_data[sd]["dir"])),
-                length_includes_head=True,
-                head_width=0.5,
-                color="m",
-                head_length=0.5,
-                zorder=10,
-            )
+    return artists
 
-    ax.plot([130, 140], [0, 1], c="yellow", alpha=0.5, lw=10, label="Low (<40%)")
-    ax.plot([130, 140], [0, 1], c="orange", alpha=0.5, lw=10, label="Medium (40-60%)")
-    ax.plot([130, 140], [0, 1], c="red", alpha=0.5, lw=10, label="High (>60%)")
-    ax.plot(130, 0, "om", markersize=2, label="SD")
-    ax.plot([130, 130], [140, 140], c="b", lw=0.3, label="Forecast")
-    ax.plot([130, 130], [140, 140], c="b", lw=2, label="OFCL Forecast")
 
-    ax.legend()
-    plot_saildrone_mission_domains(ax=ax)
-    set_cartopy_projection_atlantic(ax=ax, ylabel="bottom")
-    ax.set_title(f"7-day outlook areas: {time.strftime('%Y-%m-%d %H:%M')} UTC")
+def plot_saildrone_positions(ax: plt.Axes, sd_data: dict):
+    for sd in sd_data:
+        ax.plot(sd_data[sd]["lon"], sd_data[sd]["lat"], "om", markersize=2, zorder=10)
+        ax.arrow(
+            sd_data[sd]["lon"],
+            sd_data[sd]["lat"],
+            np.cos(np.deg2rad(90 - sd_data[sd]["dir"])),
+            np.sin(np.deg2rad(90 - sd_data[sd]["dir"])),
+            length_includes_head=True,
+            head_width=0.5,
+            color="m",
+            head_length=0.5,
+            zorder=10,
+        )
 
-    plt.savefig(
-        f"{savedir}{os.sep}outlook_areas_with_fcsts.png", dpi=200, bbox_inches="tight"
-    )
-    plt.close("all")
 
+def set_layer_visible(layer: List, visible: bool, layer_data: dict):
+    """
+    Shows or hides a layer of the outlook overview maps. Hidden lines are also
+    emptied, as the "best" legend location accounts for every line on the axes.
+
+    Arguments:
+    - layer: list of artists
+    - visible: whether to show the layer
+    - layer_data: dictionary of line: original line data
+    """
+    for artist in layer:
+        artist.set_visible(visible)
+        if artist in layer_data:
+            if visible:
+                artist.set_data(*layer_data[artist])
+            else:
+                artist.set_data([], [])
 
-def plot_shapefile_with_btks(
+
+def plot_shapefile_overview_maps(
     shapefile_data: gpd.GeoDataFrame,
-    btk_data: dict,
     time: datetime,
     savedir: str,
+    btk_data: dict = None,
+    fcst_data: dict = None,
     sd_data: dict = None,
+    maps: List[str] = None,
 ):
-    area_colors = find_outlook_area_color(shapefile_data=shapefile_data)
-
-    shapefile_data["coords"] = shapefile_data["geometry"].apply(
-        get_centroid_coordinates
+    """
+    Plots the outlook overview maps (outlook areas, and optionally best tracks
+    and forecasts of current systems). The shared base (outlook areas,
+    saildrones, mission domains, basemap) is drawn once; the best track and
+    forecast layers are all drawn in the same order as on the individual maps,
+    and only the layers of each map are shown when it is saved.
+
+    Arguments:
+    - shapefile_data: outlook areas
+    - time: outlook time
+    - savedir: figure directory
+    - btk_data: dictionary of best tracks
+    - fcst_data: dictionary of forecasts
+    - sd_data: dictionary of saildrone positions
+    - maps: maps to save (keys of outlook_overview_maps); defaults to all maps
+    """
+    if btk_data is None:
+        btk_data = {}
+    if fcst_data is None:
+        fcst_data = {}
+    if maps is None:
+        maps = list(outlook_overview_maps)
+    layers_needed = set(
+        [lr for mp in maps for lr in outlook_overview_maps[mp]["layers"]]
     )
 
     fig = plt.figure(figsize=(12, 12))
     ax = fig.add_subplot(111, projection=proj)
 
-    if len(shapefile_data) > 0:
-        shapefile_data.plot(ax=ax, color=area_colors, alpha=0.5, edgecolor="k")
-        for _, row in shapefile_data.iterrows():
-            ax.annotate(
-                text=row["AREA"],
-                xy=row["coords"],
-                ha="center",
-                va="center",
-                fontweight="bold",
-            )
-        for idx, row in shapefile_data.iterrows():
-            annotate_text = (
-                f"Area {row['AREA']}\n2 day: {row['PROB2DAY']}\n7 day: {row['PROB7DAY']}"
-            )
-            ax.annotate(
-                text=annotate_text,
-                xy=(-110 + idx * 20, 1.5),
-                ha="left",
-                va="top",
-                fontweight="semibold",
-                backgroundcolor=(1, 1, 1, 0.5),
-            )
+    plot_outlook_areas(ax=ax, shapefile_data=shapefile_data)
+    layers = {"btk": [], "fcst": [], "fcst_labels": []}
+    if "btk" in layers_needed:
+        layers["btk"] = plot_btk_layer(ax=ax, btk_data=btk_data)
+    if ("fcst" in layers_needed) or ("fcst_labels" in layers_needed):
+        layers.update(plot_fcst_layer(ax=ax, fcst_data=fcst_data))
+    layer_data = {
+        artist: artist.get_data()
+        for layer in layers.values()
+        for artist in layer
+        if isinstance(artist, Line2D)
+    }
+    if sd_data is not None:
+        plot_saildrone_positions(ax=ax, sd_data=sd_data)
 
-    for btk in btk_data:
-        ax.plot(
-            btk_data[btk].Longitude, btk_data[btk].Latitude, c="k", lw=1, linestyle="--"
-        )
-        ax.plot(
-            btk_data[btk].Longitude.iloc[-1],
-            btk_data[btk].Latitude.iloc[-1],
-            "ok",
-            markersize=4,
+    legend = {
+        "areas": ax.plot(
+            [130, 140], [0, 1], c="yellow", alpha=0.5, lw=10, label="Low (<40%)"
         )
-        name = btk_data[btk].StormName.iloc[-1]
-        if name == "INVEST":
-            name = f"{btk_data[btk].StormNumber.iloc[-1]}L"
-        else:
-            name = f"{btk_data[btk].StormType.iloc[-1]} " + name
-        ax.text(
-            btk_data[btk].Longitude.iloc[0],
-            btk_data[btk].Latitude.iloc[0],
-            name,
-            ha="left",
-            va="top",
-            bbox=dict(
-                facecolor="w", edgecolor="black", boxstyle="round,pad=.1", alpha=0.5
-            ),
+        + ax.plot(
+            [130, 140], [0, 1], c="orange", alpha=0.5, lw=10, label="Medium (40-60%)"
         )
+        + ax.plot([130, 140], [0, 1], c="red", alpha=0.5, lw=10, label="High (>60%)"),
+        "sd": ax.plot(130, 0, "om", markersize=2, label="SD"),
+        "btk": ax.plot(
+            [130, 130], [140, 140], c="k", lw=1, linestyle="--", label="Best Track"
+        ),
+        "fcst": ax.plot([130, 130], [140, 140], c="b", lw=0.3, label="Forecast")
+        + ax.plot([130, 130], [140, 140], c="b", lw=2, label="OFCL Forecast"),
+    }
 
-    if sd_data is not None:
-        for sd in sd_data:
-            ax.plot(
-                sd_data[sd]["lon"], sd_data[sd]["lat"], "om", markersize=2, zorder=10
-            )
-            ax.arrow(
-                sd_data[sd]["lon"],
-                sd_data[sd]["lat"],
-                np.cos(np.deg2rad(90 - sd_data[sd]["dir"])),
-                np.sin(np.deg2rad(90 - sd_data[sd]["dir"])),
-                length_includes_head=True,
-                head_width=0.5,
-                color="m",
-                head_length=0.5,
-                zorder=10,
-            )
-    ax.plot([130, 140], [0, 1], c="yellow", alpha=0.5, lw=10, label="Low (<40%)")
-    ax.plot([130, 140], [0, 1], c="orange", alpha=0.5, lw=10, label="Medium (40-60%)")
-    ax.plot([130, 140], [0, 1], c="red", alpha=0.5, lw=10, label="High (>60%)")
-    ax.plot(130, 0, "om", markersize=2, label="SD")
-    ax.plot([130, 140], [0, 1], c="k", lw=1, linestyle="--", label="Best Track")
-    ax.legend()
     plot_saildrone_mission_domains(ax=ax)
     set_cartopy_projection_atlantic(ax=ax, ylabel="bottom")
     ax.set_title(f"7-day outlook areas: {time.strftime('%Y-%m-%d %H:%M')} UTC")
 
-    plt.savefig(
-        f"{savedir}{os.sep}outlook_areas_with_btks.png", dpi=200, bbox_inches="tight"
-    )
+    for mp in maps:
+        for layer in layers:
+            set_layer_visible(
+                layer=layers[layer],
+                visible=layer in outlook_overview_maps[mp]["layers"],
+                layer_data=layer_data,
+            )
+        legend_entries = outlook_overview_maps[mp]["legend"]
+        if (mp == "outlook_areas") and (sd_data is None):
+            legend_entries = ["areas"]
+        ax.legend(handles=[line for entry in legend_entries for line in legend[entry]])
+
+        plt.savefig(f"{savedir}{os.sep}{mp}.png", dpi=200, bbox_inches="tight")
     plt.close("all")
 
 
-def plot_shapefile(
-    shapefile_data: gpd.GeoDataFrame, time: datetime, savedir: str, sd_data: dict = None
+def plot_shapefile_with_btks_and_fcsts(
+    shapefile_data: gpd.GeoDataFrame,
+    btk_data: dict,
+    fcst_data: dict,
+    time: datetime,
+    savedir: str,
+    sd_data: dict = None,
 ):
-    area_colors = find_outlook_area_color(shapefile_data=shapefile_data)
-
-    shapefile_data["coords"] = shapefile_data["geometry"].apply(
-        get_centroid_coordinates
+    plot_shapefile_overview_maps(
+        shapefile_data=shapefile_data,
+        time=time,
+        savedir=savedir,
+        btk_data=btk_data,
+        fcst_data=fcst_data,
+        sd_data=sd_data,
+        maps=["outlook_areas_with_btks_and_fcsts"],
     )
 
-    fig = plt.figure(figsize=(12, 12))
-    ax = fig.add_subplot(111, projection=proj)
-
-    if len(shapefile_data) > 0:
-        shapefile_data.plot(ax=ax, color=area_colors, alpha=0.5, edgecolor="k")
-        for _, row in shapefile_data.iterrows():
-            ax.annotate(
-                text=row["AREA"],
-                xy=row["coords"],
-                ha="center",
-                va="center",
-                fontweight="bold",
-            )
-
-        for idx, row in shapefile_data.iterrows():
-            annotate_text = (
-                f"Area {row['AREA']}\n2 day: {row['PROB2DAY']}\n7 day: {row['PROB7DAY']}"
-            )
-            ax.annotate(
-                text=annotate_text,
-                xy=(-110 + idx * 20, 1.5),
-                ha="left",
-                va="top",
-                fontweight="semibold",
-                backgroundcolor=(1, 1, 1, 0.5),
-            )
-
-    ax.plot([130, 140], [0, 1], c="yellow", alpha=0.5, lw=10, label="Low (<40%)")
-    ax.plot([130, 140], [0, 1], c="orange", alpha=0.5, lw=10, label="Medium (40-60%)")
-    ax.plot([130, 140], [0, 1], c="red", alpha=0.5, lw=10, label="High (>60%)")
 
-    if sd_data is not None:
-        for sd in sd_data:
-            ax.plot(
-                sd_data[sd]["lon"], sd_data[sd]["lat"], "om", markersize=2, zorder=10
-            )
-            ax.arrow(
-                sd_data[sd]["lon"],
-                sd_data[sd]["lat"],
-                np.cos(np.deg2rad(90 - sd_data[sd]["dir"])),
-                np.sin(np.deg2rad(90 - sd_data[sd]["dir"])),
-                length_includes_head=True,
-                head_width=0.5,
-                color="m",
-                head_length=0.5,
-                zorder=10,
-            )
-        ax.plot(130, 0, "om", markersize=2, label="SD")
+def plot_shapefile_with_fcsts(
+    shapefile_data: gpd.GeoDataFrame,
+    fcst_data: dict,
+    time: datetime,
+    savedir: str,
+    sd_data: dict = None,
+):
+    plot_shapefile_overview_maps(
+        shapefile_data=shapefile_data,
+        time=time,
+        savedir=savedir,
+        fcst_data=fcst_data,
+        sd_data=sd_data,
+        maps=["outlook_areas_with_fcsts"],
+    )
 
-    ax.legend()
 
-    plot_saildrone_mission_domains(ax=ax)
+def plot_shapefile_with_btks(
+    shapefile_data: gpd.GeoDataFrame,
+    btk_data: dict,
+    time: datetime,
+    savedir: str,
+    sd_data: dict = None,
+):
+    plot_shapefile_overview_maps(
+        shapefile_data=shapefile_data,
+        time=time,
+        savedir=savedir,
+        btk_data=btk_data,
+        sd_data=sd_data,
+        maps=["outlook_areas_with_btks"],
+    )
 
-    set_cartopy_projection_atlantic(ax=ax, ylabel="bottom")
-    ax.set_title(f"7-day outlook areas: {time.strftime('%Y-%m-%d %H:%M')} UTC")
 
-    plt.savefig(f"{savedir}{os.sep}outlook_areas.png", dpi=200, bbox_inches="tight")
-    plt.close("all")
+def plot_shapefile(
+    shapefile_data: gpd.GeoDataFrame, time: datetime, savedir: str, sd_data: dict = None
+):
+    plot_shapefile_overview_maps(
+        shapefile_data=shapefile_data,
+        time=time,
+        savedir=savedir,
+        sd_data=sd_data,
+        maps=["outlook_areas"],
+    )
 
 
 def plot_saildrone_mission_domains(ax: plt.axis):
@@ -2,37 +2,87 @@ import cartopy.crs as ccrs
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
 import numpy as np
+import os
+import pandas as pd
 import requests
+import shapely
 
 from bs4 import BeautifulSoup
 from cartopy.feature import COASTLINE, LAND
 from cartopy.mpl.gridliner import LONGITUDE_FORMATTER, LATITUDE_FORMATTER
-from math import radians, sin, cos, acos
-from paths import url_buoy_info
-from typing import List
+from paths import repo_path, url_buoy_info
+from typing import List, Union
 
 proj = ccrs.PlateCarree(central_longitude=0)
 
+basemap_datadir = f"{repo_path}{os.sep}data{os.sep}basemap{os.sep}"
+basemap_features = {
+    "coastline": COASTLINE.with_scale("10m"),
+    "land": LAND.with_scale("10m"),
+}
+# the Natural Earth features are clipped once to this domain (covering every map
+# made by the repository) and stored on disk; maps only read the clipped layers
+basemap_domain = [-140, 40, -30, 80]
+# margin (degrees) kept around a map extent so that clipped edges stay off the map
+basemap_margin = 2
+# in-memory cache of clipped basemap layers
+basemap_layers = {}
+buoy_positions = {}
+
 
 def great_circle_distance(
-    lon: float, lat: float, lon_point: float, lat_point: float
-) -> float:
-    lon1, lat1, lon2, lat2 = map(radians, [lon_point, lat_point, lon, lat])
+    lon: Union[float, np.ndarray],
+    lat: Union[float, np.ndarray],
+    lon_point: float,
+    lat_point: float,
+) -> Union[float, np.ndarray]:
+    """
+    Computes the great circle distance (km) between positions and a point.
+    Works on scalars and on whole arrays (NaN positions give NaN).
+
+    Arguments:
+    - lon: longitude(s)
+    - lat: latitude(s)
+    - lon_point: longitude of the point
+    - lat_point: latitude of the point
+
+    Returns:
+    - float or np.ndarray
+    """
+    lon, lat = np.asarray(lon, dtype=float), np.asarray(lat, dtype=float)
+    lon1, lat1, lon2, lat2 = map(np.radians, [lon_point, lat_point, lon, lat])
     r_earth = 6371.0
-    gc = r_earth * (
-        acos(sin(lat1) * sin(lat2) + cos(lat1) * cos(lat2) * cos(lon1 - lon2))
+    cos_angle = np.sin(lat1) * np.sin(lat2) + np.cos(lat1) * np.cos(lat2) * np.cos(
+        lon1 - lon2
     )
+    gc = r_earth * np.arccos(np.clip(cos_angle, -1, 1))
 
     return gc
 
 
-def get_ndbc_buoy_position(config: dict) -> dict:
-    page = requests.get(f"{url_buoy_info}{config['comparison_buoy']}").text
+def get_ndbc_buoy_position(config: dict, buoy: str = None) -> dict:
+    """
+    Reads the position of an NDBC buoy from its station page (once per buoy
+    and process).
+
+    Arguments:
+    - config: dictionary
+    - buoy: buoy number; defaults to the comparison_buoy in the config
+
+    Returns:
+    - dictionary with lon and lat
+    """
+    if buoy is None:
+        buoy = config["comparison_buoy"]
+    if buoy in buoy_positions:
+        return buoy_positions[buoy]
+
+    page = requests.get(f"{url_buoy_info}{buoy}").text
     soup = BeautifulSoup(page, "html.parser")
     record = [
         node.get("content")
         for node in soup.find_all("meta")
-        if f"buoy {config['comparison_buoy']}" in node.get("content")
+        if f"buoy {buoy}" in node.get("content")
     ][0]
     buoy_loc = record.split(" - ")[1]
     buoy_loc = buoy_loc[buoy_loc.index("(") + 1 : buoy_loc.index(")")].split(" ")
@@ -42,8 +92,89 @@ def get_ndbc_buoy_position(config: dict) -> dict:
         buoy_latitude *= -1
     if buoy_loc[1][-1] == "W":
         buoy_longitude *= -1
+    buoy_positions[buoy] = {"lon": buoy_longitude, "lat": buoy_latitude}
 
-    return {"lon": buoy_longitude, "lat": buoy_latitude}
+    return buoy_positions[buoy]
+
+
+def get_basemap_domain_layer(name: str) -> np.ndarray:
+    """
+    Reads a Natural Earth feature (10m) clipped to the basemap domain. The
+    clipped layer is kept in memory and on disk; Natural Earth is only read
+    (and downloaded, if needed) when the layer is not on disk yet.
+
+    Arguments:
+    - name: coastline or land
+
+    Returns:
+    - np.ndarray of shapely geometries
+    """
+    if name in basemap_layers:
+        return basemap_layers[name]
+
+    filename = f"{basemap_datadir}{name}_10m.parquet"
+    if os.path.isfile(filename):
+        geoms = shapely.from_wkb(pd.read_parquet(filename).geometry.to_numpy())
+    else:
+        print(f"Building the {name} basemap layer from Natural Earth.")
+        geoms = np.array(list(basemap_features[name].geometries()), dtype=object)
+        geoms = shapely.clip_by_rect(
+            geoms,
+            basemap_domain[0],
+            basemap_domain[2],
+            basemap_domain[1],
+            basemap_domain[3],
+        )
+        geoms = geoms[~shapely.is_empty(geoms)]
+
+        # written through a temporary file, as rendering workers may build the
+        # same layer at the same time
+        os.makedirs(basemap_datadir, exist_ok=True)
+        tmp_filename = f"{filename}.{os.getpid()}.tmp"
+        pd.DataFrame({"geometry": shapely.to_wkb(geoms)}).to_parquet(
+            tmp_filename, index=False
+        )
+        os.replace(tmp_filename, filename)
+    basemap_layers[name] = geoms
+
+    return geoms
+
+
+def get_basemap_layer(
+    name: str, extent: List[float], simplify: bool = False
+) -> np.ndarray:
+    """
+    Clips a basemap layer to a map extent (with a margin), optionally
+    simplifying it with a tolerance well below the size of a pixel at that
+    extent. Clipped layers are kept in memory.
+
+    Arguments:
+    - name: coastline or land
+    - extent: map extent [lon_min, lon_max, lat_min, lat_max]
+    - simplify: whether to simplify the clipped geometries (slightly changes
+      the drawn coastline)
+
+    Returns:
+    - np.ndarray of shapely geometries
+    """
+    key = (name, tuple(extent), simplify)
+    if key in basemap_layers:
+        return basemap_layers[key]
+
+    geoms = shapely.clip_by_rect(
+        get_basemap_domain_layer(name=name),
+        extent[0] - basemap_margin,
+        extent[2] - basemap_margin,
+        extent[1] + basemap_margin,
+        extent[3] + basemap_margin,
+    )
+    if simplify:
+        tolerance = (extent[1] - extent[0]) / 5000
+        geoms = shapely.simplify(geoms, tolerance=tolerance, preserve_topology=True)
+    geoms = geoms[~shapely.is_empty(geoms)]
+    basemap_layers[key] = geoms
+
+    return geoms
 
 
 def set_cartopy_projection_atlantic(
@@ -52,10 +183,22 @@ def set_cartopy_projection_atlantic(
     xticks: np.ndarray = np.arange(-120, 30, 10),
     yticks: np.ndarray = np.arange(-10, 61, 10),
     ylabel: str = "top",
+    simplify: bool = False,
 ):
     # ax.coastlines(color="k", zorder=1)
-    ax.add_feature(COASTLINE.with_scale("10m"), edgecolor="k")
-    ax.add_feature(LAND.with_scale("10m"), facecolor=".8")
+    ax.add_geometries(
+        get_basemap_layer(name="coastline", extent=extent, simplify=simplify),
+        crs=proj,
+        facecolor="none",
+        edgecolor="k",
+    )
+    ax.add_geometries(
+        get_basemap_layer(name="land", extent=extent, simplify=simplify),
+        crs=proj,
+        facecolor=".8",
+        edgecolor="face",
+        zorder=-1,
+    )
     gl = ax.gridlines(
         crs=proj, draw_labels=True, linewidth=1, color="gray", alpha=1, linestyle="--"
     )
@@ -1,29 +1,42 @@
+import functools
 import numpy as np
 import os
 import pandas as pd
-import shapely.geometry as shp
+import shapely
 import xarray as xr
 
 from atcf_processing import (
-    adecks_datadir,
-    bdecks_datadir,
     column_names,
     column_types,
-    fix_atcf_latitude,
-    fix_atcf_longitude,
+    decode_atcf_coordinate,
+    decode_atcf_date,
     get_atcf_files,
     get_info_from_filename,
+    wind_radii_columns,
+)
+from atcf_store import (
+    read_atcf_store,
+    read_atcf_store_all,
+    read_wind_radii_cache,
+    write_wind_radii_cache,
 )
 from conversions import (
-    convert_wind_radii_to_polygon,
+    convert_wind_radii_to_polygons,
     get_aircraft_recon_position,
     get_aircraft_recon_pressure,
 )
 from datetime import datetime, timedelta
+from manifest import get_file_signature, read_manifest, write_manifest
 from netCDF4 import Dataset
-from typing import Any, List
+from saildrone_store import read_saildrone_store
+from typing import Any, Dict, List, Tuple
 from paths import repo_path
 
+saildrone_position_cache = f"{repo_path}{os.sep}data{os.sep}saildrone_positions.json"
+# number of file versions (time axes) and reads memoized per process
+saildrone_time_cache_size = 32
+saildrone_read_cache_size = 32
+
 
 def read_dropsonde_data(filename: str):
     data = xr.open_dataset(filename, drop_variables=["trajectory", "obs"], engine='netcdf4').to_dataframe().reset_index()
@@ -652,34 +665,81 @@ def remove_atcf_duplicates(data: dict):
 
 
 def read_raw_atcf(filename: str) -> pd.DataFrame:
+    # integer columns are parsed as floats and cast once at the end;
+    # building nullable Int64 columns while parsing is much slower
+    int_columns = [col for col in column_names if column_types[col] == "Int64"]
+    read_types = {
+        col: (float if column_types[col] == "Int64" else column_types[col])
+        for col in column_names
+    }
+    read_types["Date"] = float
     df = pd.read_csv(
         filename,
         header=None,
         names=column_names,
-        dtype=column_types,
+        dtype=read_types,
         delimiter=",",
         index_col=False,
         skipinitialspace=True,
         na_values=["Q"],
     )
-    df.Date = pd.to_datetime(df.Date, format="%Y%m%d%H")
-    df.Latitude = df.Latitude.apply(fix_atcf_latitude)
-    df.Longitude = df.Longitude.apply(fix_atcf_longitude)
+    df.Date = decode_atcf_date(values=df.Date.to_numpy())
+    df.Latitude = decode_atcf_coordinate(values=df.Latitude, negative="S")
+    df.Longitude = decode_atcf_coordinate(values=df.Longitude, negative="W")
+    for col in int_columns:
+        values = df[col].to_numpy()
+        missing = np.isnan(values)
+        df[col] = pd.arrays.IntegerArray(
+            np.where(missing, 0, values).astype("int64"), missing
+        )
 
     return df
 
 
-def read_all_btks(wr: int = 0) -> list[pd.DataFrame]:
+def read_all_btks(
+    wr: int = 0, n_samples: int = 1000, use_cache: bool = True
+) -> list[pd.DataFrame]:
     fls = get_atcf_files()
-    btks = []
-    for fl in fls:
-        _, _, btk = read_atcf_modified_wind_radii(
-            filename=fl, wr=wr, fcst=False, btk=True
+    btk_data = read_atcf_store_all(deck="bdecks", wr=wr, columns=wind_radii_columns)
+    fls = [fl for fl in fls if fl in btk_data]
+    btks = [btk_data[fl] for fl in fls]
+    for btk in btks:
+        btk["Valid"] = btk.Date + pd.to_timedelta(btk.FcstHour.astype(float), unit="hr")
+
+    # historical best tracks do not change, so their geometries are cached
+    geometry = {}
+    if use_cache:
+        for fl, btk in zip(fls, btks):
+            cached = read_wind_radii_cache(storm=fl, wr=wr, n_samples=n_samples)
+            if (cached is not None) and (len(cached) == len(btk)):
+                geometry[fl] = cached
+    missing = [fl for fl in fls if fl not in geometry]
+
+    # build the geometries of all remaining storms in one call
+    if len(missing) > 0:
+        btk_missing = pd.concat([btk_data[fl] for fl in missing], ignore_index=True)
+        centers = shapely.points(btk_missing.Longitude, btk_missing.Latitude)
+        wind_radii = convert_wind_radii_to_polygons(
+            lon=btk_missing.Longitude,
+            lat=btk_missing.Latitude,
+            radii=btk_missing[["WSPRadius1", "WSPRadius2", "WSPRadius3", "WSPRadius4"]],
+            n_samples=n_samples,
         )
-        if btk is not None:
-            btk["Center"] = btk[["Longitude", "Latitude"]].apply(shp.Point, axis=1)
-            btk["WindRadii"] = btk.apply(convert_wind_radii_to_polygon, axis=1)
-            btks.append(btk)
+        split_idx = np.cumsum([len(btk_data[fl]) for fl in missing])[:-1]
+        for fl, fl_centers, fl_wind_radii in zip(
+            missing, np.split(centers, split_idx), np.split(wind_radii, split_idx)
+        ):
+            geometry[fl] = pd.DataFrame(
+                {"Center": fl_centers, "WindRadii": fl_wind_radii}
+            )
+            if use_cache:
+                write_wind_radii_cache(
+                    storm=fl, wr=wr, n_samples=n_samples, data=geometry[fl]
+                )
+
+    for fl, btk in zip(fls, btks):
+        btk["Center"] = geometry[fl].Center.to_numpy()
+        btk["WindRadii"] = geometry[fl].WindRadii.to_numpy()
 
     return btks
 
@@ -687,108 +747,175 @@ def read_all_btks(wr: int = 0) -> list[pd.DataFrame]:
 def read_atcf_modified_wind_radii(
     filename: str, wr: int, fcst: bool = True, btk: bool = True
 ) -> List[Any]:
-    storm_info = get_info_from_filename(filename=f"{adecks_datadir}{filename}")
+    storm_info = get_info_from_filename(filename=filename)
 
     if fcst:
-        current_filename = (
-            f"{adecks_datadir}wind_radii/{filename[:-4]}_{wr}kt{filename[-4:]}"
+        df_fcst = read_atcf_store(
+            storm=filename, deck="adecks", wr=wr, columns=wind_radii_columns
         )
-        if os.path.isfile(current_filename):
-            df_fcst = pd.read_csv(current_filename, header=0, delimiter=",")
-            df_fcst.Date = pd.to_datetime(df_fcst.Date)
+        if df_fcst is not None:
             df_fcst["Valid"] = df_fcst.Date + pd.to_timedelta(
-                df_fcst.FcstHour, unit="hr"
+                df_fcst.FcstHour.astype(float), unit="hr"
             )
-        else:
-            df_fcst = None
     else:
         df_fcst = None
 
     if btk:
-        current_filename = (
-            f"{bdecks_datadir}wind_radii/{filename[:-4]}_{wr}kt{filename[-4:]}"
+        df_btk = read_atcf_store(
+            storm=filename, deck="bdecks", wr=wr, columns=wind_radii_columns
         )
-        if os.path.isfile(current_filename):
-            df_btk = pd.read_csv(current_filename, header=0, delimiter=",")
-            df_btk.Date = pd.to_datetime(df_btk.Date)
-            df_btk["Valid"] = df_btk.Date + pd.to_timedelta(df_btk.FcstHour, unit="hr")
-        else:
-            df_btk = None
+        if df_btk is not None:
+            df_btk["Valid"] = df_btk.Date + pd.to_timedelta(
+                df_btk.FcstHour.astype(float), unit="hr"
+            )
     else:
         df_btk = None
 
     return storm_info, df_fcst, df_btk
 
 
-def read_saildrone_latest_position(config: dict):
+saildrone_column_names = {
+    "time": "date",
+    "WIND_FROM_MEAN": "wind_direction",
+    "WIND_SPEED_MEAN": "wind_speed",
+    "TEMP_AIR_MEAN": "air_temperature",
+    "RH_MEAN": "relative_humidity",
+    "BARO_PRES_MEAN": "sea_level_pressure",
+    "WAVE_DOMINANT_PERIOD": "dominant_wave_period",
+    "WAVE_SIGNIFICANT_HEIGHT": "significant_wave_height",
+    "TEMP_SBE37_MEAN": "sea_surface_temperature",
+    "SAL_SBE37_MEAN": "sea_surface_salinity",
+}
+
+
+def read_netcdf_last_valid(
+    filename: str, variables: List[str], n: int = 2, chunk_size: int = 512
+) -> Dict[str, np.ndarray]:
+    """
+    Reads the last n records of a netCDF file where all given variables are
+    valid. The variables are read backwards from the end in chunks, so only
+    the tail of a long record is loaded.
+
+    Arguments:
+    - filename: string
+    - variables: names of 1D variables along the same dimension
+    - n: number of valid records
+    - chunk_size: number of records read at a time
+
+    Returns:
+    - dictionary of variable name: array of (up to) n values, oldest first
+    """
+    values = {var: np.array([]) for var in variables}
+    with Dataset(filename, "r") as data:
+        end = data[variables[0]].shape[0]
+        while (end > 0) and (len(values[variables[0]]) < n):
+            start = max(0, end - chunk_size)
+            chunk = {
+                var: np.ma.filled(data[var][start:end].astype(float), np.nan)
+                for var in variables
+            }
+            valid = np.all([~np.isnan(chunk[var]) for var in variables], axis=0)
+            values = {
+                var: np.concatenate([chunk[var][valid], values[var]])
+                for var in variables
+            }
+            end = start
+
+    return {var: values[var][-n:] for var in variables}
+
+
+def read_saildrone_latest_position(config: dict, use_cache: bool = True):
+    """
+    Reads the latest position and heading of each saildrone from the tails of
+    the downloaded files. Results are cached by file size and modification
+    time, so files that were not updated are not opened again.
+
+    Arguments:
+    - config: dictionary
+    - use_cache: use the position cache
+
+    Returns:
+    - dictionary of saildrone number: {"lon", "lat", "dir"}
+    """
     datadir = f"{repo_path}{os.sep}{config['download_saildrone_data_path']}"
-    fls = sorted(os.listdir(datadir))
+    fls = sorted([fl for fl in os.listdir(datadir) if fl.endswith(".nc")])
+    cache = read_manifest(filename=saildrone_position_cache) if use_cache else {}
 
     sd_data = {}
 
     for fl in fls:
         sd_number = fl.split("_")[0][2:]
-        data = Dataset(f"{datadir}/{fl}", "r")
-        lat = np.array(data["latitude"])
-        lon = np.array(data["longitude"])
-        data.close()
-        lat = lat[~np.isnan(lat)]
-        lon = lon[~np.isnan(lon)]
+        signature = get_file_signature(filename=f"{datadir}/{fl}", file_hash=False)
+        entry = cache.get(fl, {})
+        if entry.get("signature") == signature:
+            sd_data[sd_number] = entry["position"]
+            continue
+
+        tail = read_netcdf_last_valid(
+            filename=f"{datadir}/{fl}", variables=["latitude", "longitude"], n=2
+        )
+        lat, lon = tail["latitude"], tail["longitude"]
         dlat = lat[-1] - lat[-2]
         dlon = lon[-1] - lon[-2]
         dir = (90 + (360 - (np.rad2deg(np.arctan2(dlat, dlon)) % 360))) % 360
 
         sd_data[sd_number] = {
-            "lon": lon[-1],
-            "lat": lat[-1],
-            "dir": dir,
+            "lon": float(lon[-1]),
+            "lat": float(lat[-1]),
+            "dir": float(dir),
         }
+        cache[fl] = {"signature": signature, "position": sd_data[sd_number]}
+
+    if use_cache:
+        write_manifest(manifest=cache, filename=saildrone_position_cache)
 
     return sd_data
 
 
+ndbc_buoy_column_names = [
+    "wind_direction",
+    "wind_speed",
+    "wind_gust",
+    "significant_wave_height",
+    "dominant_wave_period",
+    "average_wave_period",
+    "dwpd_direction",
+    "sea_level_pressure",
+    "air_temperature",
+    "sea_surface_temperature",
+    "dewpoint_temperature",
+    "visibility",
+    "pressure_tendency",
+    "tide_level",
+]
+
+
 def read_ndbc_buoy_format(filename: str) -> pd.DataFrame:
-    with open(filename, "r") as fl:
-        data = fl.readlines()
-    data = [line.rstrip().split() for line in data]
-
-    header = data[:2]
-    data = data[2:]
-    date = [
-        datetime.strptime(line[0] + line[1] + line[2] + line[3] + line[4], "%Y%m%d%H%M")
-        for line in data
-    ]
-    wdir = [float(line[5]) if line[5] != "MM" else np.nan for line in data]
-    wspd = [float(line[6]) if line[6] != "MM" else np.nan for line in data]
-    gst = [float(line[7]) if line[7] != "MM" else np.nan for line in data]
-    wvht = [float(line[8]) if line[8] != "MM" else np.nan for line in data]
-    dpd = [float(line[9]) if line[9] != "MM" else np.nan for line in data]
-    apd = [float(line[10]) if line[10] != "MM" else np.nan for line in data]
-    mwd = [float(line[11]) if line[11] != "MM" else np.nan for line in data]
-    pres = [float(line[12]) if line[12] != "MM" else np.nan for line in data]
-    atmp = [float(line[13]) if line[13] != "MM" else np.nan for line in data]
-    wtmp = [float(line[14]) if line[14] != "MM" else np.nan for line in data]
-    dewp = [float(line[15]) if line[15] != "MM" else np.nan for line in data]
-    vis = [float(line[16]) if line[16] != "MM" else np.nan for line in data]
-    ptdy = [float(line[17]) if line[17] != "MM" else np.nan for line in data]
-    tide = [float(line[18]) if line[18] != "MM" else np.nan for line in data]
+    """
+    Reads an NDBC realtime2 standard meteorological file (two header lines,
+    date columns YY MM DD hh mm, missing values as MM).
+
+    Arguments:
+    - filename: string
+
+    Returns:
+    - pd.DataFrame
+    """
+    date_columns = ["year", "month", "day", "hour", "minute"]
+    data = pd.read_csv(
+        filename,
+        sep=r"\s+",
+        skiprows=2,
+        header=None,
+        names=date_columns + ndbc_buoy_column_names,
+        usecols=range(len(date_columns) + len(ndbc_buoy_column_names)),
+        na_values="MM",
+        dtype={col: float for col in ndbc_buoy_column_names},
+    )
 
     df = pd.DataFrame([])
-    df["date"] = date
-    df["wind_direction"] = wdir
-    df["wind_speed"] = wspd
-    df["wind_gust"] = gst
-    df["significant_wave_height"] = wvht
-    df["dominant_wave_period"] = dpd
-    df["average_wave_period"] = apd
-    df["dwpd_direction"] = mwd
-    df["sea_level_pressure"] = pres
-    df["air_temperature"] = atmp
-    df["sea_surface_temperature"] = wtmp
-    df["dewpoint_temperature"] = dewp
-    df["visibility"] = vis
-    df["pressure_tendency"] = ptdy
-    df["tide_level"] = tide
+    df["date"] = pd.to_datetime(data[date_columns])
+    df[ndbc_buoy_column_names] = data[ndbc_buoy_column_names]
 
     return df
 
@@ -799,57 +926,149 @@ def read_saildrone_format(filename: str) -> pd.DataFrame:
         .to_dataframe()
         .reset_index(drop=True)
     )
+    data = data.rename(columns=saildrone_column_names)
+
+    return data
+
+
+@functools.lru_cache(maxsize=saildrone_time_cache_size)
+def read_saildrone_time_version(
+    filename: str, mtime_ns: int, size: int
+) -> Tuple[str, np.ndarray]:
+    """
+    Reads the observation dimension and decoded times of one version of a
+    saildrone file (memoized; the file version is part of the key).
+
+    Arguments:
+    - filename: string
+    - mtime_ns: modification time of the file (ns)
+    - size: size of the file (bytes)
+
+    Returns:
+    - observation dimension name, array of np.datetime64
+    """
+    with xr.open_dataset(filename, engine="netcdf4") as data:
+        return data.time.dims[0], data.time.values
+
+
+def get_saildrone_time(filename: str) -> Tuple[str, np.ndarray]:
+    """
+    Reads (once per file version) the observation dimension and decoded times
+    of a saildrone file.
+
+    Arguments:
+    - filename: string
+
+    Returns:
+    - observation dimension name, array of np.datetime64
+    """
+    stat = os.stat(filename)
+
+    return read_saildrone_time_version(
+        filename=filename, mtime_ns=stat.st_mtime_ns, size=stat.st_size
+    )
+
 
-    try:
-        data = data.rename(columns={"time": "date"})
-    except:
-        pass
-
-    try:
-        data = data.rename(columns={"WIND_FROM_MEAN": "wind_direction"})
-    except:
-        pass
-
-    try:
-        data = data.rename(columns={"WIND_SPEED_MEAN": "wind_speed"})
-    except:
-        pass
-
-    try:
-        data = data.rename(columns={"TEMP_AIR_MEAN": "air_temperature"})
-    except:
-        pass
-
-    try:
-        data = data.rename(columns={"RH_MEAN": "relative_humidity"})
-    except:
-        pass
-
-    try:
-        data = data.rename(columns={"BARO_PRES_MEAN": "sea_level_pressure"})
-    except:
-        pass
-
-    try:
-        data = data.rename(columns={"WAVE_DOMINANT_PERIOD": "dominant_wave_period"})
-    except:
-        pass
-
-    try:
-        data = data.rename(
-            columns={"WAVE_SIGNIFICANT_HEIGHT": "significant_wave_height"}
+@functools.lru_cache(maxsize=saildrone_read_cache_size)
+def read_saildrone_variables_version(
+    filename: str,
+    mtime_ns: int,
+    size: int,
+    variables: Tuple[str] = None,
+    start: datetime = None,
+    end: datetime = None,
+) -> pd.DataFrame:
+    """
+    Reads selected variables of one version of a saildrone file within a time
+    range (memoized; the file version is part of the key). The cached data
+    must not be modified; read_saildrone_variables returns copies.
+
+    Arguments:
+    - filename: string
+    - mtime_ns: modification time of the file (ns)
+    - size: size of the file (bytes)
+    - variables: column names; None reads all variables
+    - start: first time (inclusive); None starts at the first record
+    - end: last time (inclusive); None ends at the last record
+
+    Returns:
+    - pd.DataFrame with a date column and the requested variables
+    """
+    dim, time = read_saildrone_time_version(
+        filename=filename, mtime_ns=mtime_ns, size=size
+    )
+    idx_start = 0 if start is None else np.searchsorted(time, np.datetime64(start))
+    idx_end = (
+        len(time)
+        if end is None
+        else np.searchsorted(time, np.datetime64(end), side="right")
+    )
+
+    with xr.open_dataset(
+        filename, drop_variables=["trajectory", "obs", "rowSize"], engine="netcdf4"
+    ) as data:
+        if variables is not None:
+            source_names = {val: key for key, val in saildrone_column_names.items()}
+            names = [source_names.get(var, var) for var in variables if var != "date"]
+            data = data[["time"] + [name for name in names if name != "time"]]
+        data = (
+            data.isel({dim: slice(idx_start, idx_end)})
+            .load()
+            .to_dataframe()
+            .reset_index(drop=True)
         )
-    except:
-        pass
 
-    try:
-        data = data.rename(columns={"TEMP_SBE37_MEAN": "sea_surface_temperature"})
-    except:
-        pass
+    return data.rename(columns=saildrone_column_names)
 
-    try:
-        data = data.rename(columns={"SAL_SBE37_MEAN": "sea_surface_salinity"})
-    except:
-        pass
 
-    return data
+def read_saildrone_variables(
+    filename: str,
+    variables: List[str] = None,
+    start: datetime = None,
+    end: datetime = None,
+) -> pd.DataFrame:
+    """
+    Reads selected variables of a saildrone file within a time range. Only the
+    requested variables are read, and only over the records in the time range;
+    the result is memoized by file version, variables and time range (for the
+    last saildrone_read_cache_size reads).
+
+    Arguments:
+    - filename: string
+    - variables: column names as returned by read_saildrone_format (e.g.,
+      latitude, wind_speed); None reads all variables
+    - start: first time (inclusive); None starts at the first record
+    - end: last time (inclusive); None ends at the last record
+
+    Returns:
+    - pd.DataFrame with a date column and the requested variables
+    """
+    stat = os.stat(filename)
+    data = read_saildrone_variables_version(
+        filename=filename,
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        variables=None if variables is None else tuple(variables),
+        start=start,
+        end=end,
+    )
+
+    return data.copy()
+
+
+def read_saildrone_store_format(sd: str) -> pd.DataFrame:
+    """
+    Reads the incrementally synced data of a saildrone with the same column
+    names as read_saildrone_format.
+
+    Arguments:
+    - sd: saildrone number (e.g., 1031)
+
+    Returns:
+    - pd.DataFrame, or None if the saildrone is not in the store
+    """
+    data = read_saildrone_store(sd=sd)
+    if data is None:
+        return None
+
+    return data.rename(columns=saildrone_column_names)
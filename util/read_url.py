@@ -1,9 +1,13 @@
+import os
 import requests
+import time
 import urllib.error
 import urllib.request
 
 
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict
 
 
 def get_files_at_url(url: str, parse_for: str = "a", verify=True):
@@ -17,10 +21,165 @@ def get_files_at_url(url: str, parse_for: str = "a", verify=True):
 def retrieve_url_file(url: str, destination: str, verify=True):
     if not verify:
         import ssl
+
         ssl._create_default_https_context = ssl._create_unverified_context
-        
+
     try:
         urllib.request.urlretrieve(url, destination)
     except urllib.error.HTTPError:
         print(f"Could not retrieve {url}.")
         pass
+
+
+def get_url_session(pool_size: int = 10, verify=True) -> requests.Session:
+    """
+    Creates a session that keeps connections alive and can be shared by
+    several download threads.
+
+    Arguments:
+    - pool_size: number of pooled connections per host
+    - verify: verify SSL certificates
+
+    Returns:
+    - requests.Session
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.verify = verify
+
+    return session
+
+
+def is_retryable_request_error(err: requests.RequestException) -> bool:
+    """
+    Checks whether a failed request may succeed when repeated: connection
+    errors, timeouts, interrupted transfers, server errors (5xx) and rate
+    limiting (429). Other client errors (e.g., 404) are final.
+
+    Arguments:
+    - err: exception raised by requests
+
+    Returns:
+    - bool
+    """
+    if isinstance(err, requests.HTTPError):
+        status = err.response.status_code if err.response is not None else None
+        return (status is not None) and ((status >= 500) or (status == 429))
+
+    return isinstance(
+        err,
+        (
+            requests.ConnectionError,
+            requests.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+        ),
+    )
+
+
+def download_url_file(
+    url: str,
+    destination: str,
+    session: requests.Session = None,
+    retries: int = 3,
+    backoff: float = 2,
+    timeout: float = 60,
+    chunk_size: int = 1 << 20,
+) -> bool:
+    """
+    Downloads a file to a temporary file next to the destination and renames
+    it once complete, so an interrupted download never replaces a good file.
+    Transient failures (see is_retryable_request_error) are retried after
+    backoff, 2 * backoff, 4 * backoff, ... seconds; other errors, including
+    errors writing the file, fail at once.
+
+    Arguments:
+    - url: string
+    - destination: string
+    - session: requests.Session; a new one is created if not given
+    - retries: number of retries after the first attempt
+    - backoff: seconds to wait before the first retry
+    - timeout: seconds to wait for the server
+    - chunk_size: number of bytes written at a time
+
+    Returns:
+    - bool, whether the file was downloaded
+    """
+    if session is None:
+        session = get_url_session(pool_size=1)
+
+    tmp_destination = f"{destination}.part"
+    for attempt in range(retries + 1):
+        try:
+            with session.get(url, stream=True, timeout=timeout) as response:
+                response.raise_for_status()
+                with open(tmp_destination, "wb") as file:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        file.write(chunk)
+            os.replace(tmp_destination, destination)
+            return True
+        except requests.RequestException as err:
+            if os.path.isfile(tmp_destination):
+                os.remove(tmp_destination)
+            if (not is_retryable_request_error(err)) or (attempt == retries):
+                print(f"Could not retrieve {url}: {err}")
+                return False
+            time.sleep(backoff * 2**attempt)
+        except OSError as err:
+            # local errors (e.g., a full disk or missing directory) are not retried
+            if os.path.isfile(tmp_destination):
+                os.remove(tmp_destination)
+            print(f"Could not write {destination}: {err}")
+            return False
+
+    return False
+
+
+def download_url_files(
+    files: Dict[str, str],
+    workers: int = 6,
+    retries: int = 3,
+    backoff: float = 2,
+    timeout: float = 60,
+    verify=True,
+) -> Dict[str, bool]:
+    """
+    Downloads several files concurrently through one shared keep-alive session.
+
+    Arguments:
+    - files: dictionary of url: destination
+    - workers: maximum number of simultaneous downloads
+    - retries: number of retries per file after the first attempt
+    - backoff: seconds to wait before the first retry of a file
+    - timeout: seconds to wait for the server
+    - verify: verify SSL certificates
+
+    Returns:
+    - dictionary of url: whether the file was downloaded
+    """
+    if len(files) == 0:
+        return {}
+    workers = max(1, min(workers, len(files)))
+
+    status = {}
+    with get_url_session(pool_size=workers, verify=verify) as session:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    download_url_file,
+                    url=url,
+                    destination=destination,
+                    session=session,
+                    retries=retries,
+                    backoff=backoff,
+                    timeout=timeout,
+                ): url
+                for url, destination in files.items()
+            }
+            for future in as_completed(futures):
+                status[futures[future]] = future.result()
+
+    return status
@@ -0,0 +1,289 @@
+import geopandas as gpd
+import hashlib
+import numpy as np
+import os
+import pandas as pd
+import projection
+import shapely
+import shutil
+import time
+import xarray as xr
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from manifest import get_file_hash
+from paths import repo_path
+from typing import Any, Callable, Dict, List, Tuple
+
+figure_cache_datadir = f"{repo_path}{os.sep}data{os.sep}figure_cache{os.sep}"
+# bump when the look of cached figures changes outside the figure source files
+# (e.g., a new matplotlib style)
+figure_style_version = 1
+# code whose changes alter the cached figures (with the basemap layers)
+figure_source_files = [
+    f"{repo_path}{os.sep}util{os.sep}plotting.py",
+    f"{repo_path}{os.sep}util{os.sep}projection.py",
+]
+# in-process cache of file hashes, by file version
+figure_source_hashes = {}
+# arguments that only say where a figure is written
+figure_output_arguments = ["savedir", "filename"]
+
+
+def update_plot_hash(plot_hash: Any, value: Any) -> None:
+    """
+    Adds a plotting function argument to a hash (dataframes, geometries,
+    datasets, dictionaries, times and plain values).
+
+    Arguments:
+    - plot_hash: hashlib object
+    - value: argument value
+    """
+    if isinstance(value, pd.DataFrame):
+        plot_hash.update(repr(list(value.columns)).encode("utf-8"))
+        for col in value.columns:
+            update_plot_hash(plot_hash=plot_hash, value=value[col])
+    elif isinstance(value, gpd.GeoSeries):
+        plot_hash.update(b"".join(shapely.to_wkb(value.to_numpy())))
+    elif isinstance(value, pd.Series):
+        plot_hash.update(pd.util.hash_pandas_object(value).to_numpy().tobytes())
+    elif isinstance(value, xr.Dataset):
+        for name in sorted(value.variables):
+            plot_hash.update(name.encode("utf-8"))
+            plot_hash.update(np.ascontiguousarray(value[name].values).tobytes())
+    elif isinstance(value, shapely.Geometry):
+        plot_hash.update(shapely.to_wkb(value))
+    elif isinstance(value, dict):
+        for key in sorted(value, key=str):
+            plot_hash.update(repr(key).encode("utf-8"))
+            update_plot_hash(plot_hash=plot_hash, value=value[key])
+    elif isinstance(value, (list, tuple)):
+        for val in value:
+            update_plot_hash(plot_hash=plot_hash, value=val)
+    elif isinstance(value, datetime):
+        plot_hash.update(value.isoformat().encode("utf-8"))
+    else:
+        plot_hash.update(repr(value).encode("utf-8"))
+
+    return None
+
+
+def get_figure_source_hash() -> str:
+    """
+    Hashes the plotting code and the basemap layers, so that cached figures
+    are redrawn after either changes. Each file is hashed once per version.
+
+    Arguments:
+    - None
+
+    Returns:
+    - string
+    """
+    fls = list(figure_source_files)
+    if os.path.isdir(projection.basemap_datadir):
+        fls += sorted(
+            [
+                f"{projection.basemap_datadir}{fl}"
+                for fl in os.listdir(projection.basemap_datadir)
+            ]
+        )
+
+    source_hash = hashlib.sha256()
+    for fl in fls:
+        stat = os.stat(fl)
+        key = (fl, stat.st_mtime_ns, stat.st_size)
+        if key not in figure_source_hashes:
+            figure_source_hashes[key] = get_file_hash(filename=fl)
+        source_hash.update(
+            f"{os.path.basename(fl)}:{figure_source_hashes[key]}".encode()
+        )
+
+    return source_hash.hexdigest()
+
+
+def get_figure_cache_key(function: Callable, kwargs: Dict) -> str:
+    """
+    Hashes a plotting function and its inputs (without the output location),
+    together with the plotting code and basemap layers.
+
+    Arguments:
+    - function: plotting function
+    - kwargs: keyword arguments of the plotting function
+
+    Returns:
+    - string
+    """
+    plot_hash = hashlib.sha256()
+    plot_hash.update(f"{function.__name__}:{figure_style_version}".encode("utf-8"))
+    plot_hash.update(get_figure_source_hash().encode("utf-8"))
+    update_plot_hash(
+        plot_hash=plot_hash,
+        value={
+            key: val
+            for key, val in kwargs.items()
+            if key not in figure_output_arguments
+        },
+    )
+
+    return plot_hash.hexdigest()
+
+
+def link_or_copy(source: str, destination: str) -> None:
+    """
+    Hard-links a file, or copies it if it cannot be linked (e.g., across file
+    systems).
+
+    Arguments:
+    - source: string
+    - destination: string
+    """
+    if os.path.isfile(destination):
+        os.remove(destination)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy(source, destination)
+
+    return None
+
+
+def render_figure(function: Callable, kwargs: Dict, outputs: List[str] = None) -> Dict:
+    """
+    Renders one figure (plotting functions save and close their own figures).
+    When the output files are given, the figure cache is used: if the same
+    function was already called with the same inputs, the cached files are
+    linked to the outputs instead of redrawing them. New figures are copied
+    into the cache.
+
+    Arguments:
+    - function: plotting function
+    - kwargs: keyword arguments of the plotting function
+    - outputs: files written by the plotting function
+
+    Returns:
+    - dictionary with the plotting function name, rendering time and whether
+      the figure came from the cache
+    """
+    start = time.perf_counter()
+    if outputs is None:
+        function(**kwargs)
+        return {
+            "function": function.__name__,
+            "time": time.perf_counter() - start,
+            "cached": False,
+        }
+
+    key = get_figure_cache_key(function=function, kwargs=kwargs)
+    cached_fls = [
+        f"{figure_cache_datadir}{key}_{os.path.basename(fl)}" for fl in outputs
+    ]
+    cached = all([os.path.isfile(fl) for fl in cached_fls])
+    if cached:
+        for cached_fl, fl in zip(cached_fls, outputs):
+            link_or_copy(source=cached_fl, destination=fl)
+            os.utime(cached_fl)
+    else:
+        # outputs may be hard links to older cache entries; remove them so that
+        # the plotting function writes new files instead of rewriting the cache
+        for fl in outputs:
+            if os.path.isfile(fl):
+                os.remove(fl)
+        function(**kwargs)
+        os.makedirs(figure_cache_datadir, exist_ok=True)
+        for cached_fl, fl in zip(cached_fls, outputs):
+            if os.path.isfile(fl):
+                shutil.copy(fl, cached_fl)
+
+    return {
+        "function": function.__name__,
+        "time": time.perf_counter() - start,
+        "cached": cached,
+    }
+
+
+def render_figures(
+    jobs: List[Tuple], workers: int = None, verbose: bool = True
+) -> List[Dict]:
+    """
+    Renders independent figures in a process pool and waits until all of them
+    are written. With a single worker the figures are rendered in order in the
+    current process. Failed figures are reported, and a RuntimeError is raised
+    once all jobs have run.
+
+    Arguments:
+    - jobs: list of (plotting function, keyword arguments) or (plotting function,
+      keyword arguments, output files); the latter use the figure cache
+    - workers: number of processes; defaults to the number of cores
+    - verbose: print the total rendering time
+
+    Returns:
+    - list of render_figure outputs, in the order of jobs
+    """
+    if len(jobs) == 0:
+        return []
+    if workers is None or workers < 1:
+        workers = os.cpu_count()
+    workers = min(workers, len(jobs))
+
+    start = time.perf_counter()
+    results = [None] * len(jobs)
+    failed = []
+    if workers == 1:
+        for idx, job in enumerate(jobs):
+            try:
+                results[idx] = render_figure(*job)
+            except Exception as err:
+                print(f"Could not render {job[0].__name__}: {err}")
+                failed.append(job[0].__name__)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(render_figure, *job): idx
+                for idx, job in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                idx = futures[future]
+                try:
+                    results[idx] = future.result()
+                except Exception as err:
+                    print(f"Could not render {jobs[idx][0].__name__}: {err}")
+                    failed.append(jobs[idx][0].__name__)
+
+    if verbose:
+        n_rendered = len([result for result in results if result is not None])
+        n_cached = len([result for result in results if result and result["cached"]])
+        print(
+            f"     Rendered {n_rendered}/{len(jobs)} figures ({n_cached} from cache) "
+            + f"on {workers} cores in {time.perf_counter() - start:.1f} s."
+        )
+    if len(failed) > 0:
+        raise RuntimeError(
+            f"Could not render {len(failed)}/{len(jobs)} figures: "
+            + ", ".join(sorted(set(failed)))
+        )
+
+    return results
+
+
+def prune_figure_cache(max_age_days: float) -> int:
+    """
+    Removes cached figures that have not been used for a given number of days.
+
+    Arguments:
+    - max_age_days: number of days
+
+    Returns:
+    - number of removed files
+    """
+    if not os.path.isdir(figure_cache_datadir):
+        return 0
+
+    oldest = time.time() - max_age_days * 86400
+    fls = [
+        f"{figure_cache_datadir}{fl}"
+        for fl in os.listdir(figure_cache_datadir)
+        if os.path.getmtime(f"{figure_cache_datadir}{fl}") < oldest
+    ]
+    _ = [os.remove(fl) for fl in fls]
+
+    return len(fls)
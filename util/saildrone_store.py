@@ -0,0 +1,418 @@
+import io
+import os
+import pandas as pd
+import requests
+import shutil
+import urllib.parse
+import xarray as xr
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from manifest import read_manifest, write_manifest
+from paths import repo_path, saildrone_archive
+from read_url import get_url_session
+from typing import Dict, List
+
+saildrone_store_datadir = f"{repo_path}{os.sep}data{os.sep}saildrone_store{os.sep}"
+saildrone_store_manifest = f"{saildrone_store_datadir}manifest.json"
+saildrone_dataset_year = 2023
+# body of the ERDDAP 404 response to a query without matching observations
+erddap_no_results_message = "Your query produced no matching results"
+saildrone_fleet_datadir = f"{saildrone_store_datadir}fleet{os.sep}"
+saildrone_fleet_manifest = f"{saildrone_store_datadir}fleet_manifest.json"
+saildrone_fleet_filename = "part-0.parquet"
+# small row groups let time and bbox queries skip most of a partition
+saildrone_fleet_row_group_size = 4096
+
+
+def get_saildrone_dataset_id(sd: str) -> str:
+    """
+    Builds the ERDDAP dataset id of a saildrone.
+
+    Arguments:
+    - sd: saildrone number (e.g., 1031)
+
+    Returns:
+    - string
+    """
+    return f"sd{sd}_hurricane_{saildrone_dataset_year}"
+
+
+def get_saildrone_store_path(sd: str) -> str:
+    """
+    Builds the path of a saildrone in the store.
+
+    Arguments:
+    - sd: saildrone number (e.g., 1031)
+
+    Returns:
+    - string
+    """
+    return f"{saildrone_store_datadir}{get_saildrone_dataset_id(sd=sd)}.parquet"
+
+
+def get_erddap_query_url(
+    sd: str, since: str = None, archive: str = saildrone_archive
+) -> str:
+    """
+    Builds the ERDDAP tabledap request for all variables of a saildrone,
+    optionally restricted to times after a given time.
+
+    Arguments:
+    - sd: saildrone number (e.g., 1031)
+    - since: ISO 8601 time (e.g., 2023-09-01T00:00:00Z); None requests all data
+    - archive: ERDDAP tabledap url
+
+    Returns:
+    - string
+    """
+    url = f"{archive}{get_saildrone_dataset_id(sd=sd)}.csv"
+    if since is not None:
+        url += "?&" + urllib.parse.quote(f"time>{since}")
+
+    return url
+
+
+def parse_erddap_csv(text: str) -> pd.DataFrame:
+    """
+    Parses an ERDDAP tabledap csv response (variable names, then units).
+
+    Arguments:
+    - text: response body
+
+    Returns:
+    - pd.DataFrame with a timezone-naive (UTC) time column
+    """
+    data = pd.read_csv(io.StringIO(text), skiprows=[1])
+    data = data.drop(columns=["trajectory"], errors="ignore")
+    data["time"] = pd.to_datetime(data.time, utc=True).dt.tz_localize(None)
+
+    return data
+
+
+def read_saildrone_store(sd: str, columns: List[str] = None) -> pd.DataFrame:
+    """
+    Reads a saildrone from the store.
+
+    Arguments:
+    - sd: saildrone number (e.g., 1031)
+    - columns: subset of columns to read
+
+    Returns:
+    - pd.DataFrame, or None if the saildrone is not in the store
+    """
+    filename = get_saildrone_store_path(sd=sd)
+    if not os.path.isfile(filename):
+        return None
+
+    return pd.read_parquet(filename, columns=columns)
+
+
+def sync_saildrone_store(
+    sd: str,
+    since: str = None,
+    session: requests.Session = None,
+    archive: str = saildrone_archive,
+    timeout: float = 60,
+) -> Dict:
+    """
+    Requests the observations of a saildrone after a given time and appends
+    them to its store file (deduplicated on time). ERDDAP answers 404 with
+    erddap_no_results_message when no observations match, which is treated as
+    no new data; other errors (including other 404s) are raised.
+
+    Arguments:
+    - sd: saildrone number (e.g., 1031)
+    - since: last synced ISO 8601 time; None requests the full dataset
+    - session: requests.Session; a new one is created if not given
+    - archive: ERDDAP tabledap url
+    - timeout: seconds to wait for the server
+
+    Returns:
+    - dictionary with the number of new observations and the last synced time
+    """
+    if session is None:
+        session = get_url_session(pool_size=1)
+    if not os.path.isfile(get_saildrone_store_path(sd=sd)):
+        since = None
+
+    response = session.get(
+        get_erddap_query_url(sd=sd, since=since, archive=archive), timeout=timeout
+    )
+    if (response.status_code == 404) and (erddap_no_results_message in response.text):
+        return {"new": 0, "last_time": since}
+    response.raise_for_status()
+
+    new_data = parse_erddap_csv(text=response.text)
+    data = read_saildrone_store(sd=sd)
+    n_old = 0
+    if data is not None:
+        n_old = len(data)
+        new_data = pd.concat([data, new_data], ignore_index=True)
+    new_data = (
+        new_data.drop_duplicates(subset="time", keep="last")
+        .sort_values(by="time", kind="stable")
+        .reset_index(drop=True)
+    )
+
+    filename = get_saildrone_store_path(sd=sd)
+    os.makedirs(saildrone_store_datadir, exist_ok=True)
+    new_data.to_parquet(f"{filename}.tmp", index=False)
+    os.replace(f"{filename}.tmp", filename)
+
+    return {
+        "new": len(new_data) - n_old,
+        "last_time": new_data.time.max().strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+
+def write_saildrone_store_netcdf(sd: str, filename: str) -> bool:
+    """
+    Writes the store of a saildrone as a netCDF file with the layout of the
+    ERDDAP files (one obs dimension, source variable names, time in seconds
+    since 1970), so the readers of the downloaded files also see the synced
+    observations.
+
+    Arguments:
+    - sd: saildrone number (e.g., 1031)
+    - filename: netCDF file
+
+    Returns:
+    - True if the file was written, False if the saildrone is not in the store
+    """
+    data = read_saildrone_store(sd=sd)
+    if data is None:
+        return False
+
+    data = xr.Dataset.from_dataframe(data.rename_axis("obs"))
+    data = data.drop_vars("obs")
+    data.to_netcdf(
+        f"{filename}.part",
+        engine="netcdf4",
+        encoding={"time": {"units": "seconds since 1970-01-01", "dtype": "float64"}},
+    )
+    os.replace(f"{filename}.part", filename)
+
+    return True
+
+
+def sync_saildrone_fleet(
+    sds: List[str],
+    workers: int = 6,
+    archive: str = saildrone_archive,
+    timeout: float = 60,
+) -> Dict[str, Dict]:
+    """
+    Syncs several saildrones concurrently from their last synced time (kept in
+    the store manifest). A failed saildrone keeps its previous state and is
+    caught up on the next sync.
+
+    Arguments:
+    - sds: saildrone numbers
+    - workers: maximum number of simultaneous requests
+    - archive: ERDDAP tabledap url
+    - timeout: seconds to wait for the server
+
+    Returns:
+    - dictionary of saildrone number: sync_saildrone_store output
+    """
+    if len(sds) == 0:
+        return {}
+    manifest = read_manifest(filename=saildrone_store_manifest)
+    workers = max(1, min(workers, len(sds)))
+
+    status = {}
+    with get_url_session(pool_size=workers) as session:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    sync_saildrone_store,
+                    sd=sd,
+                    since=manifest.get(sd, {}).get("last_time"),
+                    session=session,
+                    archive=archive,
+                    timeout=timeout,
+                ): sd
+                for sd in sds
+            }
+            for future in as_completed(futures):
+                sd = futures[future]
+                try:
+                    status[sd] = future.result()
+                except (requests.RequestException, ValueError) as err:
+                    print(f"Could not sync SD-{sd}: {err}")
+                    continue
+                if status[sd]["last_time"] is not None:
+                    manifest[sd] = {"last_time": status[sd]["last_time"]}
+
+    os.makedirs(saildrone_store_datadir, exist_ok=True)
+    write_manifest(manifest=manifest, filename=saildrone_store_manifest)
+
+    return status
+
+
+def get_saildrone_fleet_path(sd: str, month: str = None) -> str:
+    """
+    Builds the path of a saildrone (or one of its monthly partitions) in the
+    fleet store. The store is partitioned as: sd=NNNN/month=YYYY-MM.
+
+    Arguments:
+    - sd: saildrone number (e.g., 1031)
+    - month: month (e.g., 2023-08); None for the saildrone directory
+
+    Returns:
+    - string
+    """
+    sd_dir = f"{saildrone_fleet_datadir}sd={sd}"
+    if month is None:
+        return sd_dir
+
+    return f"{sd_dir}{os.sep}month={month}{os.sep}{saildrone_fleet_filename}"
+
+
+def get_saildrone_fleet_drones() -> List[str]:
+    """
+    Finds all saildrones written to the fleet store.
+
+    Arguments:
+    - None
+
+    Returns:
+    - list
+    """
+    if not os.path.isdir(saildrone_fleet_datadir):
+        return []
+
+    return sorted(
+        [
+            sd.split("=")[-1]
+            for sd in os.listdir(saildrone_fleet_datadir)
+            if sd.startswith("sd=")
+        ]
+    )
+
+
+def get_saildrone_fleet_source(sd: str, saildrone_dir: str, mode: str) -> str:
+    """
+    Selects the data a saildrone is loaded into the fleet store from: the
+    incrementally synced store in incremental mode (if synced), otherwise the
+    downloaded netCDF file. The download mode decides, so switching back to
+    full downloads never rebuilds the fleet store from an old synced store.
+
+    Arguments:
+    - sd: saildrone number (e.g., 1031)
+    - saildrone_dir: directory of the downloaded netCDF files
+    - mode: saildrone download mode (full or incremental)
+
+    Returns:
+    - string, or None if there is no data for the saildrone
+    """
+    store_path = get_saildrone_store_path(sd=sd)
+    if mode == "incremental" and os.path.isfile(store_path):
+        return store_path
+
+    filename = f"{saildrone_dir}{os.sep}{get_saildrone_dataset_id(sd=sd)}.nc"
+    if os.path.isfile(filename):
+        return filename
+
+    return None
+
+
+def write_saildrone_fleet_store(sd: str, data: pd.DataFrame) -> List[str]:
+    """
+    Writes the observations of a saildrone into the fleet store, one
+    partition per month, sorted by time. Any previous version of the saildrone
+    is replaced.
+
+    Arguments:
+    - sd: saildrone number (e.g., 1031)
+    - data: observations with a date column (read_saildrone_format names)
+
+    Returns:
+    - list of written files
+    """
+    sd_dir = get_saildrone_fleet_path(sd=sd)
+    if os.path.isdir(sd_dir):
+        shutil.rmtree(sd_dir)
+
+    data = (
+        data.dropna(subset=["date"])
+        .drop_duplicates(subset="date", keep="last")
+        .sort_values(by="date", kind="stable")
+        .reset_index(drop=True)
+    )
+    months = data.date.dt.strftime("%Y-%m")
+
+    fls = []
+    for month, month_data in data.groupby(months, sort=True):
+        filename = get_saildrone_fleet_path(sd=sd, month=month)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        month_data.reset_index(drop=True).to_parquet(
+            filename, index=False, row_group_size=saildrone_fleet_row_group_size
+        )
+        fls.append(filename)
+
+    return fls
+
+
+def query_saildrone_fleet(
+    sds: List[str] = None,
+    variables: List[str] = None,
+    start: datetime = None,
+    end: datetime = None,
+    bbox: List[float] = None,
+) -> pd.DataFrame:
+    """
+    Queries the fleet store. The saildrone and month partitions outside the
+    query are never opened, and within a partition only the row groups whose
+    time and position ranges overlap the query are read.
+
+    Arguments:
+    - sds: saildrone numbers; None queries all saildrones
+    - variables: column names (read_saildrone_format names); None reads all
+    - start: first time (inclusive)
+    - end: last time (inclusive)
+    - bbox: [lon_min, lon_max, lat_min, lat_max]
+
+    Returns:
+    - pd.DataFrame with sd and date columns, sorted by saildrone and time (empty,
+      with the same columns, if none of the saildrones is in the store)
+    """
+    if sds is None:
+        sds = get_saildrone_fleet_drones()
+    sds = [sd for sd in sds if os.path.isdir(get_saildrone_fleet_path(sd=sd))]
+    if len(sds) == 0:
+        columns = ["sd", "date"] + [
+            var for var in (variables or []) if var not in ["sd", "date"]
+        ]
+        data = pd.DataFrame({col: pd.Series(dtype=float) for col in columns})
+        return data.astype({"sd": str, "date": "datetime64[ns]"})
+
+    filters = [("sd", "in", [int(sd) for sd in sds])]
+    if start is not None:
+        start = pd.Timestamp(start)
+        filters += [("month", ">=", start.strftime("%Y-%m")), ("date", ">=", start)]
+    if end is not None:
+        end = pd.Timestamp(end)
+        filters += [("month", "<=", end.strftime("%Y-%m")), ("date", "<=", end)]
+    if bbox is not None:
+        lon_min, lon_max, lat_min, lat_max = bbox
+        filters += [
+            ("longitude", ">=", lon_min),
+            ("longitude", "<=", lon_max),
+            ("latitude", ">=", lat_min),
+            ("latitude", "<=", lat_max),
+        ]
+    columns = None
+    if variables is not None:
+        columns = ["sd", "date"] + [var for var in variables if var != "date"]
+
+    data = pd.read_parquet(saildrone_fleet_datadir, columns=columns, filters=filters)
+    data["sd"] = data.sd.astype(str)
+    data = data.drop(columns=["month"], errors="ignore")
+    data = data[
+        ["sd", "date"] + [col for col in data.columns if col not in ["sd", "date"]]
+    ]
+    data = data.sort_values(by=["sd", "date"], kind="stable").reset_index(drop=True)
+
+    return data